@@ -0,0 +1,229 @@
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+import math
+import time
+
+from starlette.responses import JSONResponse
+
+from .metrics import ADMISSION_REJECTED, IN_FLIGHT
+
+
+# Probes and metrics are never limited, so an overloaded replica still reports its state
+EXEMPT_PATHS = frozenset({"/health", "/ready", "/metrics"})
+
+# Route classes rejected first once the total in flight reaches the shedding threshold
+SHEDDABLE = frozenset({"pdf", "export", "verify_batch"})
+
+
+def route_class(method: str, path: str) -> Optional[str]:
+    """Admission class of a request, or None when it is exempt"""
+    if path in EXEMPT_PATHS:
+        return None
+    if path == "/api/credentials/verify/batch":
+        # Up to VERIFY_BATCH_MAX reads per request, so not as cheap as single verification
+        return "verify_batch"
+    if path.startswith("/api/credentials/verify/") or path == "/api/cohorts/verify":
+        return "verify"
+    if path == "/api/credentials/pdf/export":
+        return "export"
+    if path.endswith("/pdf"):
+        return "pdf"
+    if method not in ("GET", "HEAD"):
+        return "write"
+    return "default"
+
+
+def parse_limits(spec: str) -> Dict[str, int]:
+    """Per-class limits from a comma-separated `class=limit` list"""
+    limits = {}
+    for item in spec.split(","):
+        if not item.strip():
+            continue
+        name, _, value = item.partition("=")
+        limits[name.strip()] = int(value)
+    return limits
+
+
+class TokenBucket:
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+
+    def take(self) -> float:
+        """Take one token; returns 0 when granted, else the seconds until one is available"""
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0.0
+        return (1 - self.tokens) / self.rate
+
+
+class RateLimiter:
+    """
+    Token buckets per client key (IP or issuer address).
+
+    Each key may make `burst` requests at once and `rate` per second after
+    that. Only the `max_keys` most recently seen keys keep a bucket; a key
+    evicted from the LRU starts again with a full bucket. A rate of 0
+    disables the limiter.
+    """
+
+    def __init__(self, rate: float, burst: int, max_keys: int = 10000):
+        self.rate = rate
+        self.burst = burst
+        self.max_keys = max_keys
+        self._buckets: "OrderedDict[str, TokenBucket]" = OrderedDict()
+
+    def acquire(self, key: str) -> float:
+        """Returns 0 when the request may proceed, else the seconds to wait before retrying"""
+        if self.rate <= 0:
+            return 0.0
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = self._buckets[key] = TokenBucket(self.rate, self.burst)
+            while len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+        else:
+            self._buckets.move_to_end(key)
+        return bucket.take()
+
+
+class AdmissionController:
+    """
+    Concurrency limits per route class with priority shedding.
+
+    A class at its limit rejects further requests straight away instead of
+    queueing them. Once the total in flight reaches `shed_threshold`, PDF
+    renders and exports are turned away even below their own limit, which
+    keeps capacity for cheap requests such as verification. A limit of 0
+    means unlimited; classes without a limit use the `default` one.
+    """
+
+    def __init__(
+        self,
+        limits: Dict[str, int],
+        shed_threshold: int,
+        ip_limiter: RateLimiter,
+        issuer_limiter: RateLimiter,
+        retry_after: int = 1
+    ):
+        self.limits = limits
+        self.shed_threshold = shed_threshold
+        self.ip_limiter = ip_limiter
+        self.issuer_limiter = issuer_limiter
+        self.retry_after = retry_after
+        self.in_flight: Dict[str, int] = {}
+        self.total = 0
+        self.rejected: Dict[str, int] = {}
+
+    def try_acquire(self, cls: str) -> Optional[Tuple[str, str]]:
+        """Take a slot for a request; returns (reason, detail) when refused, or None when admitted"""
+        limit = self.limits.get(cls, self.limits.get("default", 0))
+        if limit and self.in_flight.get(cls, 0) >= limit:
+            return "concurrency", f"Too many concurrent {cls} requests"
+        if cls in SHEDDABLE and self.shed_threshold and self.total >= self.shed_threshold:
+            return "shed", f"Server busy, {cls} requests are being shed"
+
+        self.in_flight[cls] = self.in_flight.get(cls, 0) + 1
+        self.total += 1
+        IN_FLIGHT.set(self.in_flight[cls], kind=f"http_{cls}")
+        return None
+
+    def release(self, cls: str):
+        self.in_flight[cls] -= 1
+        self.total -= 1
+        IN_FLIGHT.set(self.in_flight[cls], kind=f"http_{cls}")
+
+    def reject(self, cls: str, reason: str):
+        self.rejected[reason] = self.rejected.get(reason, 0) + 1
+        ADMISSION_REJECTED.inc(route_class=cls, reason=reason)
+
+    def check_issuer(self, issuer_address: str) -> float:
+        """Seconds an issuer must wait before its next write, or 0 when it may go ahead"""
+        retry_after = self.issuer_limiter.acquire(issuer_address.lower())
+        if retry_after:
+            self.reject("write", "issuer_rate")
+        return retry_after
+
+    def stats(self) -> Dict:
+        return {
+            "in_flight": dict(self.in_flight),
+            "limits": dict(self.limits),
+            "shed_threshold": self.shed_threshold,
+            "rejected": dict(self.rejected)
+        }
+
+
+def create_admission_controller(settings) -> AdmissionController:
+    return AdmissionController(
+        parse_limits(settings.admission_limits),
+        settings.admission_shed_threshold,
+        RateLimiter(settings.rate_limit_ip_rate, settings.rate_limit_ip_burst, settings.rate_limit_max_clients),
+        RateLimiter(settings.rate_limit_issuer_rate, settings.rate_limit_issuer_burst, settings.rate_limit_max_clients),
+        retry_after=settings.admission_retry_after
+    )
+
+
+def retry_after_header(seconds: float) -> Dict[str, str]:
+    return {"Retry-After": str(max(1, math.ceil(seconds)))}
+
+
+class AdmissionMiddleware:
+    """
+    ASGI middleware applying per-IP rate limits and concurrency limits.
+
+    Rate-limited clients get 429 and requests refused for capacity get 503,
+    both with Retry-After and without touching the route. A slot is held
+    until the response body has been sent, so streamed exports count for
+    their whole duration.
+    """
+
+    def __init__(self, app, controller: AdmissionController, trust_forwarded: bool = False):
+        self.app = app
+        self.controller = controller
+        self.trust_forwarded = trust_forwarded
+
+    def client_ip(self, scope) -> str:
+        if self.trust_forwarded:
+            for name, value in scope.get("headers", []):
+                if name == b"x-forwarded-for":
+                    return value.decode("latin-1").split(",")[0].strip()
+        client = scope.get("client")
+        return client[0] if client else "unknown"
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        cls = route_class(scope["method"], scope["path"])
+        if cls is None:
+            await self.app(scope, receive, send)
+            return
+
+        retry_after = self.controller.ip_limiter.acquire(self.client_ip(scope))
+        if retry_after:
+            self.controller.reject(cls, "ip_rate")
+            response = JSONResponse(
+                {"detail": "Rate limit exceeded"}, status_code=429, headers=retry_after_header(retry_after)
+            )
+            await response(scope, receive, send)
+            return
+
+        refused = self.controller.try_acquire(cls)
+        if refused is not None:
+            reason, detail = refused
+            self.controller.reject(cls, reason)
+            response = JSONResponse(
+                {"detail": detail}, status_code=503, headers=retry_after_header(self.controller.retry_after)
+            )
+            await response(scope, receive, send)
+            return
+
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.controller.release(cls)
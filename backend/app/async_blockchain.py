@@ -0,0 +1,597 @@
+from web3 import AsyncWeb3, Web3
+from web3.middleware import async_geth_poa_middleware
+import aiohttp
+import asyncio
+import os
+from typing import Dict, List, Optional, Tuple
+
+from .blockchain import (
+    ContractCodec,
+    build_call_batch,
+    chunked,
+    credential_verification,
+    decode_call_batch,
+    format_cohort_verification,
+    function_selectors,
+    load_contract_info,
+)
+from .fees import AsyncFeeStrategy
+from .nonce_manager import NonceManager, SharedNonceManager
+from .providers import AsyncFailoverProvider, create_endpoint_pool, create_retry_policy
+from .singleflight import SingleFlight
+
+
+class AsyncBlockchainService:
+    """
+    Non-blocking counterpart of BlockchainService built on AsyncWeb3.
+    All RPC traffic goes through one pooled aiohttp session, so slow calls
+    only suspend the awaiting request instead of the whole event loop, and
+    through AsyncFailoverProvider, which routes across the configured RPC
+    endpoints and retries idempotent reads.
+    """
+
+    def __init__(self):
+        self.w3 = None
+        self.rpc_url = os.getenv("BLOCKCHAIN_RPC_URL", "http://127.0.0.1:8545")
+        self.contract = None
+        self.contract_address = None
+        self.contract_abi = None
+        self.cache = None
+        self.nonce_manager = None
+        self.fee_strategy = None
+        self.codec = None
+        self.provider = None
+        self.flights = SingleFlight()
+        self._session = None
+
+    async def connect(self):
+        """
+        Open the pooled HTTP session, connect AsyncWeb3 through the failover provider and load contract.
+        Nothing here waits on the RPC, so startup succeeds while every endpoint is down.
+        """
+        from .config import settings
+
+        try:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=settings.rpc_pool_size,
+                    keepalive_timeout=settings.rpc_keepalive_timeout
+                ),
+                timeout=aiohttp.ClientTimeout(total=settings.rpc_timeout)
+            )
+
+            self.provider = AsyncFailoverProvider(
+                create_endpoint_pool(self.rpc_url, settings),
+                self._session,
+                create_retry_policy(settings),
+                read_timeout=settings.rpc_read_timeout,
+                write_timeout=settings.rpc_timeout,
+                health_interval=settings.rpc_health_interval
+            )
+            self.provider.start()
+            self.w3 = AsyncWeb3(self.provider)
+            if settings.shared_state_dir:
+                self.nonce_manager = SharedNonceManager(self.w3, settings.shared_state_dir, settings.nonce_max_drift)
+            else:
+                self.nonce_manager = NonceManager(self.w3)
+            self.fee_strategy = AsyncFeeStrategy(self.w3)
+
+            # Add PoA middleware for some networks
+            self.w3.middleware_onion.inject(async_geth_poa_middleware, layer=0)
+
+            if self.load_contract():
+                print(f"Connected to contract at {self.contract_address}")
+            else:
+                print("Contract not deployed yet. Please deploy the smart contract first.")
+
+        except Exception as e:
+            print(f"Error initializing async blockchain service: {e}")
+            self.w3 = None
+
+    def load_contract(self) -> bool:
+        """Attach the contract written by the deploy script, if not attached yet. Returns whether one is attached."""
+        if self.contract is not None:
+            return True
+        if self.w3 is None:
+            return False
+
+        self.contract_address, self.contract_abi = load_contract_info()
+        if not (self.contract_address and self.contract_abi):
+            return False
+
+        self.codec = ContractCodec(self.contract_abi)
+        self.provider.function_names = function_selectors(self.contract_abi)
+        self.contract = self.w3.eth.contract(
+            address=Web3.to_checksum_address(self.contract_address),
+            abi=self.contract_abi
+        )
+        return True
+
+    async def close(self):
+        """Stop health checks and close the pooled HTTP session"""
+        if self.provider is not None:
+            await self.provider.stop()
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    async def is_connected(self) -> bool:
+        """Check if connected to blockchain"""
+        try:
+            return self.w3 is not None and await self.w3.is_connected()
+        except Exception:
+            return False
+
+    async def _broadcast(
+        self,
+        function_call,
+        sender: str,
+        fees: Optional[Dict] = None,
+        gas: Optional[int] = None
+    ) -> Dict:
+        """
+        Build, sign and broadcast a contract transaction.
+        Gas and fees default to the fee strategy's cached values.
+        Returns the submission: transaction_hash, sender, nonce, gas, fees and function_call.
+        """
+        if fees is None:
+            fees = await self.fee_strategy.fees()
+        if gas is None:
+            gas = await self.fee_strategy.estimate_gas(function_call, sender)
+
+        async with self.nonce_manager.reserve(sender) as nonce:
+            tx_hash = await self._sign_and_send(function_call, sender, nonce, fees, gas)
+
+        return {
+            "transaction_hash": tx_hash,
+            "sender": sender,
+            "nonce": nonce,
+            "gas": gas,
+            "fees": fees,
+            "function_call": function_call
+        }
+
+    async def _sign_and_send(self, function_call, sender: str, nonce: int, fees: Dict, gas: int) -> str:
+        from .config import settings
+        private_key = settings.private_key
+        if not private_key:
+            raise Exception("Private key not configured")
+
+        txn = await function_call.build_transaction({
+            'from': sender,
+            'nonce': nonce,
+            'gas': gas,
+            'chainId': settings.chain_id,
+            **fees
+        })
+        signed_txn = self.w3.eth.account.sign_transaction(txn, private_key)
+        tx_hash = await self.w3.eth.send_raw_transaction(signed_txn.rawTransaction)
+        return tx_hash.hex()
+
+    async def replace_transaction(self, submission: Dict, fees: Dict) -> str:
+        """Re-send a submitted transaction with the same nonce and higher fees"""
+        try:
+            return await self._sign_and_send(
+                submission["function_call"],
+                submission["sender"],
+                submission["nonce"],
+                fees,
+                submission["gas"]
+            )
+
+        except Exception as e:
+            raise Exception(f"Error replacing transaction: {str(e)}")
+
+    async def _send_transaction(self, function_call, sender: str) -> Dict:
+        """
+        Sign and broadcast a transaction without waiting for it to be mined.
+        Returns the submission for receipt tracking.
+        """
+        try:
+            return await self._broadcast(function_call, sender)
+
+        except Exception as e:
+            raise Exception(f"Transaction failed: {str(e)}")
+
+    async def get_receipts(self, tx_hashes: List[str], timeout: float, poll_interval: float = 1.0) -> Dict[str, Dict]:
+        """
+        Poll receipts for many transactions together using batched
+        eth_getTransactionReceipt requests. Transactions still unmined at
+        the deadline are missing from the result.
+        """
+        from .config import settings
+
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        pending = list(dict.fromkeys(tx_hashes))
+        receipts = {}
+
+        while pending:
+            for chunk in chunked(pending, settings.rpc_batch_size):
+                payload = [
+                    {"jsonrpc": "2.0", "id": i, "method": "eth_getTransactionReceipt", "params": [tx_hash]}
+                    for i, tx_hash in enumerate(chunk)
+                ]
+                for reply in await self._post_batch(payload):
+                    if reply.get("result"):
+                        receipts[chunk[reply["id"]]] = reply["result"]
+
+            pending = [tx_hash for tx_hash in pending if tx_hash not in receipts]
+            if not pending or loop.time() >= deadline:
+                break
+            await asyncio.sleep(poll_interval)
+
+        return receipts
+
+    async def issue_credential(
+        self,
+        credential_id: str,
+        recipient_name: str,
+        recipient_email: str,
+        issuer_name: str,
+        credential_type: str,
+        description: str,
+        metadata_uri: str,
+        issuer_address: str
+    ) -> Dict:
+        """Broadcast a new credential; returns the submission to track"""
+        if not self.contract:
+            raise Exception("Smart contract not initialized")
+
+        try:
+            issuer_checksum = Web3.to_checksum_address(issuer_address)
+
+            return await self._send_transaction(
+                self.contract.functions.issueCredential(*self.codec.issue_args({
+                    "credential_id": credential_id,
+                    "recipient_name": recipient_name,
+                    "recipient_email": recipient_email,
+                    "issuer_name": issuer_name,
+                    "credential_type": credential_type,
+                    "description": description,
+                    "metadata_uri": metadata_uri
+                })),
+                issuer_checksum
+            )
+
+        except Exception as e:
+            raise Exception(f"Error issuing credential: {str(e)}")
+
+    async def issue_credentials_bulk(self, credentials: List[Dict], issuer_address: str) -> List[Dict]:
+        """
+        Issue many credentials as separate transactions.
+        All transactions are signed and broadcast back to back with locally
+        managed nonces; receipts are left to the caller (see TransactionJobTracker).
+        Each entry needs the keyword arguments of issue_credential except issuer_address.
+        Returns one entry per credential with its submission, or status "failed"
+        and an error when it could not be broadcast.
+        """
+        if not self.contract:
+            raise Exception("Smart contract not initialized")
+
+        issuer_checksum = Web3.to_checksum_address(issuer_address)
+        fees = await self.fee_strategy.fees()
+        results = []
+
+        for cred in credentials:
+            result = {"credential_id": cred["credential_id"], "submission": None, "status": "pending", "error": None}
+            try:
+                result["submission"] = await self._broadcast(
+                    self.contract.functions.issueCredential(*self.codec.issue_args(cred)),
+                    issuer_checksum,
+                    fees
+                )
+            except Exception as e:
+                result["status"] = "failed"
+                result["error"] = f"Error issuing credential: {str(e)}"
+            results.append(result)
+
+        return results
+
+    async def issue_credentials_batch(self, credentials: List[Dict], issuer_address: str, chunk_size: Optional[int] = None) -> List[Dict]:
+        """
+        Issue many credentials through issueCredentialsBatch.
+        Input is split into chunks of `chunk_size`; a chunk whose gas estimate
+        exceeds the configured share of the block gas limit is halved until it fits.
+        Chunk transactions are broadcast back to back without waiting for receipts.
+        Returns one entry per credential, like issue_credentials_bulk; the
+        credentials of one chunk share its submission.
+        """
+        if not self.contract:
+            raise Exception("Smart contract not initialized")
+
+        from .config import settings
+        if chunk_size is None:
+            chunk_size = settings.issue_batch_chunk_size
+
+        issuer_checksum = Web3.to_checksum_address(issuer_address)
+        latest = await self.w3.eth.get_block("latest")
+        gas_budget = int(latest["gasLimit"] * settings.batch_gas_fraction)
+        fees = await self.fee_strategy.fees()
+
+        results = []
+        pending = list(chunked(credentials, chunk_size))
+        while pending:
+            chunk = pending.pop(0)
+            chunk_results = [
+                {"credential_id": c["credential_id"], "submission": None, "status": "pending", "error": None}
+                for c in chunk
+            ]
+            results.extend(chunk_results)
+
+            try:
+                call = self.contract.functions.issueCredentialsBatch([self.codec.issue_args(c) for c in chunk])
+                gas = await call.estimate_gas({'from': issuer_checksum})
+                if gas > gas_budget and len(chunk) > 1:
+                    del results[-len(chunk):]
+                    half = len(chunk) // 2
+                    pending[0:0] = [chunk[:half], chunk[half:]]
+                    continue
+                if gas > gas_budget:
+                    raise Exception("A single credential exceeds the block gas budget")
+
+                submission = await self._broadcast(
+                    call, issuer_checksum, fees, gas=min(int(gas * settings.gas_margin), gas_budget)
+                )
+                for result in chunk_results:
+                    result["submission"] = submission
+            except Exception as e:
+                for result in chunk_results:
+                    result["status"] = "failed"
+                    result["error"] = f"Error issuing credential batch: {str(e)}"
+
+        return results
+
+    async def verify_credential(self, credential_id: str) -> Dict:
+        """
+        Verify a credential, served from the cache when one is attached
+        Concurrent chain reads for the same ID share one verifyCredential call.
+        """
+        def load():
+            return self.flights.do(
+                ("verify", credential_id), lambda: self._verify_credential(credential_id), kind="verify"
+            )
+
+        if self.cache is not None:
+            return await self.cache.get_or_load("verify", credential_id, load)
+        return await load()
+
+    async def _verify_credential(self, credential_id: str) -> Dict:
+        """Verify a credential on chain"""
+        if not self.contract:
+            raise Exception("Smart contract not initialized")
+
+        try:
+            result = await self.contract.functions.verifyCredential(self.codec.credential_key(credential_id)).call()
+            return self.codec.verification(result)
+
+        except Exception as e:
+            raise Exception(f"Error verifying credential: {str(e)}")
+
+    async def verify_credentials_batch(self, credential_ids: List[str]) -> Tuple[List[Optional[Dict]], int]:
+        """
+        Verify many credentials. Cached results are used where present and
+        the rest are read with batched verifyCredential calls.
+        Returns verifications in input order (None where the call failed)
+        and how many came from the cache.
+        """
+        if self.cache is not None:
+            return await self.cache.get_many_or_load("verify", credential_ids, self._verify_credentials_batch)
+        return await self._verify_credentials_batch(credential_ids), 0
+
+    async def _verify_credentials_batch(self, credential_ids: List[str], batch_size: Optional[int] = None) -> List[Optional[Dict]]:
+        """Verify many credentials on chain in batched RPC requests"""
+        if not self.contract:
+            raise Exception("Smart contract not initialized")
+
+        try:
+            if batch_size is None:
+                from .config import settings
+                batch_size = settings.rpc_batch_size
+
+            results = await self._batch_call(
+                "verifyCredential", [(self.codec.credential_key(cred_id),) for cred_id in credential_ids], batch_size
+            )
+            return self.codec.each(self.codec.verification, results)
+
+        except Exception as e:
+            raise Exception(f"Error verifying credentials: {str(e)}")
+
+    async def get_credential(self, credential_id: str) -> Optional[Dict]:
+        """
+        Get full credential details, served from the cache when one is attached
+        Concurrent chain reads for the same ID share one getCredential call, and
+        a credential loaded from chain also fills the verification cache.
+        """
+        async def load():
+            credential = await self.flights.do(
+                ("credential", credential_id), lambda: self._get_credential(credential_id), kind="credential"
+            )
+            if self.cache is not None and credential:
+                await self.cache.set("verify", credential_id, credential_verification(credential))
+            return credential
+
+        if self.cache is not None:
+            return await self.cache.get_or_load("credential", credential_id, load)
+        return await load()
+
+    async def _get_credential(self, credential_id: str) -> Optional[Dict]:
+        """Get full credential details from chain"""
+        if not self.contract:
+            raise Exception("Smart contract not initialized")
+
+        try:
+            result = await self.contract.functions.getCredential(self.codec.credential_key(credential_id)).call()
+            return self.codec.credential(result)
+
+        except Exception as e:
+            raise Exception(f"Error getting credential: {str(e)}")
+
+    async def _post_batch(self, payload: List[Dict]):
+        """Post one JSON-RPC batch through the failover provider"""
+        return await self.provider.post_json(payload)
+
+    async def _batch_call(self, function_name: str, args_list: List[tuple], batch_size: int) -> List:
+        """
+        Run many read-only calls of one contract function as concurrent JSON-RPC batches.
+        Returns decoded results in input order, with None for calls that reverted.
+        """
+        results = [None] * len(args_list)
+        if not args_list:
+            return results
+
+        payload, output_types = build_call_batch(self.contract, function_name, args_list)
+        replies = await asyncio.gather(*(self._post_batch(chunk) for chunk in chunked(payload, batch_size)))
+
+        for reply in replies:
+            for index, value in decode_call_batch(self.w3.codec, output_types, reply):
+                results[index] = value
+
+        return results
+
+    async def get_credentials_batch(self, credential_ids: List[str], batch_size: Optional[int] = None) -> List[Optional[Dict]]:
+        """Get full credential details for many IDs in batched RPC requests"""
+        if not self.contract:
+            raise Exception("Smart contract not initialized")
+
+        try:
+            if batch_size is None:
+                from .config import settings
+                batch_size = settings.rpc_batch_size
+
+            results = await self._batch_call(
+                "getCredential", [(self.codec.credential_key(cred_id),) for cred_id in credential_ids], batch_size
+            )
+            return self.codec.each(self.codec.credential, results)
+
+        except Exception as e:
+            raise Exception(f"Error getting credentials: {str(e)}")
+
+    async def _credential_ids(self, keys: List) -> List[str]:
+        """Plain credential IDs for contract keys; slim ID hashes are resolved through their payloads"""
+        if not self.codec.slim:
+            return keys
+
+        from .config import settings
+        results = await self._batch_call("getCredential", [(key,) for key in keys], settings.rpc_batch_size)
+        return [
+            cred["credentialId"]
+            for cred in self.codec.each(self.codec.credential, results)
+            if cred and cred["credentialId"]
+        ]
+
+    async def revoke_credential(self, credential_id: str, issuer_address: str) -> Dict:
+        """Broadcast a revocation; returns the submission to track"""
+        if not self.contract:
+            raise Exception("Smart contract not initialized")
+
+        try:
+            issuer_checksum = Web3.to_checksum_address(issuer_address)
+
+            return await self._send_transaction(
+                self.contract.functions.revokeCredential(self.codec.credential_key(credential_id)),
+                issuer_checksum
+            )
+
+        except Exception as e:
+            raise Exception(f"Error revoking credential: {str(e)}")
+
+    async def authorize_issuer(self, issuer_address: str, owner_address: str) -> Dict:
+        """Broadcast an issuer authorization; returns the submission to track"""
+        if not self.contract:
+            raise Exception("Smart contract not initialized")
+
+        try:
+            issuer_checksum = Web3.to_checksum_address(issuer_address)
+            owner_checksum = Web3.to_checksum_address(owner_address)
+
+            return await self._send_transaction(
+                self.contract.functions.authorizeIssuer(issuer_checksum),
+                owner_checksum
+            )
+
+        except Exception as e:
+            raise Exception(f"Error authorizing issuer: {str(e)}")
+
+    async def get_issuer_credentials(self, issuer_address: str) -> List[str]:
+        """Get all credentials issued by an address"""
+        if not self.contract:
+            raise Exception("Smart contract not initialized")
+
+        try:
+            issuer_checksum = Web3.to_checksum_address(issuer_address)
+            return await self._credential_ids(
+                await self.contract.functions.getIssuerCredentials(issuer_checksum).call()
+            )
+
+        except Exception as e:
+            raise Exception(f"Error getting issuer credentials: {str(e)}")
+
+    async def get_recipient_credentials(self, email: str) -> List[str]:
+        """Get all credentials for a recipient"""
+        if not self.contract:
+            raise Exception("Smart contract not initialized")
+
+        try:
+            return await self._credential_ids(
+                await self.contract.functions.getRecipientCredentials(self.codec.recipient_key(email)).call()
+            )
+
+        except Exception as e:
+            raise Exception(f"Error getting recipient credentials: {str(e)}")
+
+    async def is_authorized_issuer(self, issuer_address: str) -> bool:
+        """Check if an address is an authorized issuer"""
+        if not self.contract:
+            raise Exception("Smart contract not initialized")
+
+        try:
+            issuer_checksum = Web3.to_checksum_address(issuer_address)
+            return await self.contract.functions.isAuthorizedIssuer(issuer_checksum).call()
+
+        except Exception as e:
+            raise Exception(f"Error checking issuer authorization: {str(e)}")
+
+    async def anchor_cohort(self, root: bytes, size: int, metadata_uri: str, issuer_address: str) -> Dict:
+        """Broadcast a cohort Merkle root; returns the submission to track"""
+        if not self.contract:
+            raise Exception("Smart contract not initialized")
+
+        try:
+            issuer_checksum = Web3.to_checksum_address(issuer_address)
+
+            return await self._send_transaction(
+                self.contract.functions.anchorCohort(root, size, metadata_uri),
+                issuer_checksum
+            )
+
+        except Exception as e:
+            raise Exception(f"Error anchoring cohort: {str(e)}")
+
+    async def revoke_cohort_leaf(self, root: bytes, leaf: bytes, issuer_address: str) -> Dict:
+        """Broadcast the revocation of one cohort credential; returns the submission to track"""
+        if not self.contract:
+            raise Exception("Smart contract not initialized")
+
+        try:
+            issuer_checksum = Web3.to_checksum_address(issuer_address)
+
+            return await self._send_transaction(
+                self.contract.functions.revokeCohortLeaf(root, leaf),
+                issuer_checksum
+            )
+
+        except Exception as e:
+            raise Exception(f"Error revoking cohort credential: {str(e)}")
+
+    async def verify_cohort_credential(self, root: bytes, leaf: bytes, proof: List[bytes]) -> Dict:
+        """Check a cohort inclusion proof and the leaf's revocation state against the anchored root"""
+        if not self.contract:
+            raise Exception("Smart contract not initialized")
+
+        try:
+            result = await self.contract.functions.verifyCohortCredential(root, leaf, proof).call()
+            return format_cohort_verification(result)
+
+        except Exception as e:
+            raise Exception(f"Error verifying cohort credential: {str(e)}")
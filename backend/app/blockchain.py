@@ -3,24 +3,283 @@ from web3.middleware import geth_poa_middleware
 import json
 import os
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 from datetime import datetime
 from eth_account import Account
+from hexbytes import HexBytes
+from web3._utils.abi import get_abi_output_types, map_abi_data
+from web3._utils.normalizers import BASE_RETURN_NORMALIZERS
+from eth_utils import function_abi_to_4byte_selector
+
+from .providers import FailoverHTTPProvider, create_endpoint_pool, create_retry_policy
+from .payloads import (
+    PayloadStore,
+    credential_id_hash,
+    credential_payload,
+    recipient_hash,
+)
+
+
+def format_credential(result) -> Dict:
+    """Map a raw getCredential tuple to a credential dict"""
+    return {
+        "credentialId": result[0],
+        "recipientName": result[1],
+        "recipientEmail": result[2],
+        "issuerName": result[3],
+        "credentialType": result[4],
+        "description": result[5],
+        "issueDate": result[6],
+        "issuer": result[7],
+        "isValid": result[8],
+        "metadataURI": result[9]
+    }
+
+
+def format_verification(result) -> Dict:
+    """Map a raw verifyCredential tuple to a verification dict"""
+    return {
+        "exists": result[0],
+        "is_valid": result[1],
+        "recipient_name": result[2],
+        "issuer_name": result[3],
+        "credential_type": result[4],
+        "issue_date": datetime.fromtimestamp(result[5]).isoformat() if result[5] > 0 else None
+    }
+
+
+def credential_verification(credential: Dict) -> Dict:
+    """Verification dict for a credential dict; getCredential returns every field verifyCredential does"""
+    return format_verification((
+        credential["credentialId"] != "",
+        credential["isValid"],
+        credential["recipientName"],
+        credential["issuerName"],
+        credential["credentialType"],
+        credential["issueDate"]
+    ))
+
+
+def format_cohort_verification(result) -> Dict:
+    """Map a raw verifyCohortCredential tuple to a dict"""
+    return {
+        "anchored": result[0],
+        "included": result[1],
+        "revoked": result[2],
+        "issuer": result[3],
+        "anchored_at": result[4]
+    }
+
+
+def load_contract_info() -> Tuple[Optional[str], Optional[List]]:
+    """Load contract address and ABI written by the deploy script"""
+    address = None
+    abi = None
+    try:
+        base_path = Path(__file__).parent
+        
+        # Load contract address
+        address_file = base_path / "contract-address.json"
+        if address_file.exists():
+            with open(address_file, 'r') as f:
+                address = json.load(f).get("address")
+        
+        # Load contract ABI
+        abi_file = base_path / "contract-abi.json"
+        if abi_file.exists():
+            with open(abi_file, 'r') as f:
+                abi = json.load(f)
+                
+    except Exception as e:
+        print(f"Error loading contract info: {e}")
+
+    return address, abi
+
+
+def build_call_batch(contract, function_name: str, args_list: List[tuple], block_identifier="latest") -> Tuple[List[Dict], List[str]]:
+    """Build JSON-RPC eth_call payloads for one contract function, with its output types"""
+    if isinstance(block_identifier, int):
+        block_identifier = hex(block_identifier)
+    calls = [getattr(contract.functions, function_name)(*args) for args in args_list]
+    output_types = get_abi_output_types(calls[0].abi)
+    payload = [
+        {
+            "jsonrpc": "2.0",
+            "id": i,
+            "method": "eth_call",
+            "params": [{"to": contract.address, "data": call._encode_transaction_data()}, block_identifier]
+        }
+        for i, call in enumerate(calls)
+    ]
+    return payload, output_types
+
+
+def decode_call_batch(codec, output_types: List[str], replies) -> List[Tuple[int, object]]:
+    """Decode a JSON-RPC batch reply into (request id, value) pairs, skipping reverted calls"""
+    if isinstance(replies, dict):
+        # Nodes answer with a single error object when batching is unsupported
+        raise Exception(replies.get("error", {}).get("message", "Batch request rejected"))
+
+    decoded = []
+    for reply in replies:
+        if "result" not in reply:
+            continue
+        value = codec.decode(output_types, HexBytes(reply["result"]))
+        value = map_abi_data(BASE_RETURN_NORMALIZERS, output_types, value)
+        decoded.append((reply["id"], value[0] if len(output_types) == 1 else value))
+    return decoded
+
+
+def credential_input(cred: Dict) -> tuple:
+    """CredentialInput tuple for issueCredentialsBatch from issue_credential keyword arguments"""
+    return (
+        cred["credential_id"],
+        cred["recipient_name"],
+        cred["recipient_email"],
+        cred["issuer_name"],
+        cred["credential_type"],
+        cred["description"],
+        cred["metadata_uri"]
+    )
+
+
+def function_selectors(abi: List) -> Dict[str, str]:
+    """Contract function names by 0x-prefixed 4-byte selector, for labelling RPC metrics"""
+    return {
+        "0x" + function_abi_to_4byte_selector(item).hex(): item["name"]
+        for item in abi
+        if item.get("type") == "function"
+    }
+
+
+def is_slim_contract(abi: Optional[List]) -> bool:
+    """Whether an ABI is CredentialVerificationV2, which keys credentials by bytes32 hashes"""
+    for item in abi or []:
+        if item.get("type") == "function" and item.get("name") == "verifyCredential":
+            return item["inputs"][0]["type"] == "bytes32"
+    return False
+
+
+class ContractCodec:
+    """
+    Call arguments and result formats of the deployed contract.
+
+    The full contract takes plain credential IDs and emails and returns
+    every field. The slim contract (CredentialVerificationV2) takes their
+    keccak hashes and returns only a content hash, issuer, issue date and
+    validity; the payload is written to the PayloadStore at issue time and
+    resolved (and checked against the hash) on read, so both produce the
+    same credential and verification dicts.
+    """
+
+    def __init__(self, abi: Optional[List]):
+        self.slim = is_slim_contract(abi)
+        self.payload_store = None
+        if self.slim:
+            from .config import settings
+            self.payload_store = PayloadStore(settings.payload_store_dir)
+
+    def credential_key(self, credential_id: str):
+        return credential_id_hash(credential_id) if self.slim else credential_id
+
+    def recipient_key(self, email: str):
+        return recipient_hash(email) if self.slim else email
+
+    def issue_args(self, cred: Dict) -> tuple:
+        """issueCredential arguments / CredentialInput tuple; stores the payload for the slim contract"""
+        if not self.slim:
+            return credential_input(cred)
+        digest = self.payload_store.put(credential_payload(cred))
+        return (credential_id_hash(cred["credential_id"]), digest, recipient_hash(cred["recipient_email"]))
+
+    def _payload(self, digest: bytes) -> Dict:
+        payload = self.payload_store.get(digest)
+        if payload is None:
+            raise Exception(f"Payload 0x{digest.hex()} is not in the payload store")
+        return payload
+
+    def credential(self, result) -> Dict:
+        """Credential dict for a getCredential result"""
+        if not self.slim:
+            return format_credential(result)
+
+        content, issuer, issue_date, is_valid = result
+        if issue_date == 0:
+            return format_credential(("", "", "", "", "", "", 0, issuer, False, ""))
+        payload = self._payload(content)
+        return format_credential((
+            payload["credentialId"],
+            payload["recipientName"],
+            payload["recipientEmail"],
+            payload["issuerName"],
+            payload["credentialType"],
+            payload["description"],
+            issue_date,
+            issuer,
+            is_valid,
+            payload["metadataURI"]
+        ))
+
+    def verification(self, result) -> Dict:
+        """Verification dict for a verifyCredential result"""
+        if not self.slim:
+            return format_verification(result)
+
+        exists, is_valid, content, _, issue_date = result
+        if not exists:
+            return format_verification((False, False, "", "", "", 0))
+        payload = self._payload(content)
+        return format_verification((
+            True, is_valid, payload["recipientName"], payload["issuerName"], payload["credentialType"], issue_date
+        ))
+
+    def each(self, formatter, results: List) -> List[Optional[Dict]]:
+        """Format batched call results, with None for failed calls and unresolvable payloads"""
+        formatted = []
+        for result in results:
+            try:
+                formatted.append(formatter(result) if result is not None else None)
+            except Exception:
+                formatted.append(None)
+        return formatted
+
+
+def chunked(items: List, size: int):
+    """Yield successive chunks of at most `size` items"""
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
 
 class BlockchainService:
+    """
+    Synchronous, read-only access to the contract for the indexer.
+    Transactions are sent through AsyncBlockchainService.
+    """
+
     def __init__(self):
         self.w3 = None
+        self.rpc_url = None
         self.contract = None
         self.contract_address = None
         self.contract_abi = None
+        self.codec = None
+        self.provider = None
         self._initialize()
 
     def _initialize(self):
         """Initialize Web3 connection and load contract"""
         try:
             # Connect to local blockchain (Hardhat)
-            rpc_url = os.getenv("BLOCKCHAIN_RPC_URL", "http://127.0.0.1:8545")
-            self.w3 = Web3(Web3.HTTPProvider(rpc_url))
+            from .config import settings
+            self.rpc_url = os.getenv("BLOCKCHAIN_RPC_URL", "http://127.0.0.1:8545")
+            self.provider = FailoverHTTPProvider(
+                create_endpoint_pool(self.rpc_url, settings),
+                create_retry_policy(settings),
+                pool_size=settings.rpc_pool_size,
+                read_timeout=settings.rpc_read_timeout,
+                write_timeout=settings.rpc_timeout
+            )
+            self.w3 = Web3(self.provider)
             
             # Add PoA middleware for some networks
             self.w3.middleware_onion.inject(geth_poa_middleware, layer=0)
@@ -33,6 +292,8 @@ class BlockchainService:
                     address=Web3.to_checksum_address(self.contract_address),
                     abi=self.contract_abi
                 )
+                self.codec = ContractCodec(self.contract_abi)
+                self.provider.function_names = function_selectors(self.contract_abi)
                 print(f"Connected to contract at {self.contract_address}")
             else:
                 print("Contract not deployed yet. Please deploy the smart contract first.")
@@ -43,24 +304,7 @@ class BlockchainService:
 
     def _load_contract_info(self):
         """Load contract address and ABI from files"""
-        try:
-            base_path = Path(__file__).parent
-            
-            # Load contract address
-            address_file = base_path / "contract-address.json"
-            if address_file.exists():
-                with open(address_file, 'r') as f:
-                    data = json.load(f)
-                    self.contract_address = data.get("address")
-            
-            # Load contract ABI
-            abi_file = base_path / "contract-abi.json"
-            if abi_file.exists():
-                with open(abi_file, 'r') as f:
-                    self.contract_abi = json.load(f)
-                    
-        except Exception as e:
-            print(f"Error loading contract info: {e}")
+        self.contract_address, self.contract_abi = load_contract_info()
 
     def is_connected(self) -> bool:
         """Check if connected to blockchain"""
@@ -69,88 +313,15 @@ class BlockchainService:
         except:
             return False
 
-    def _send_transaction(self, txn_dict: Dict) -> str:
-        """Sign and send a transaction"""
-        try:
-            # Load private key from settings
-            from .config import settings
-            private_key = settings.private_key
-            if not private_key:
-                raise Exception("Private key not configured")
-
-            # Sign transaction
-            signed_txn = self.w3.eth.account.sign_transaction(txn_dict, private_key)
-            
-            # Send transaction
-            tx_hash = self.w3.eth.send_raw_transaction(signed_txn.rawTransaction)
-            
-            # Wait for receipt
-            receipt = self.w3.eth.wait_for_transaction_receipt(tx_hash)
-            
-            if receipt['status'] == 1:
-                return tx_hash.hex()
-            else:
-                raise Exception("Transaction failed")
-                
-        except Exception as e:
-            raise Exception(f"Transaction failed: {str(e)}")
-
-    def issue_credential(
-        self,
-        credential_id: str,
-        recipient_name: str,
-        recipient_email: str,
-        issuer_name: str,
-        credential_type: str,
-        description: str,
-        metadata_uri: str,
-        issuer_address: str
-    ) -> str:
-        """Issue a new credential on the blockchain"""
-        if not self.contract:
-            raise Exception("Smart contract not initialized")
-
-        try:
-            # Convert address to checksum format
-            issuer_checksum = Web3.to_checksum_address(issuer_address)
-            
-            # Build transaction
-            txn = self.contract.functions.issueCredential(
-                credential_id,
-                recipient_name,
-                recipient_email,
-                issuer_name,
-                credential_type,
-                description,
-                metadata_uri
-            ).build_transaction({
-                'from': issuer_checksum,
-                'nonce': self.w3.eth.get_transaction_count(issuer_checksum),
-                'gas': 2000000,
-                'gasPrice': self.w3.eth.gas_price
-            })
-            
-            return self._send_transaction(txn)
-            
-        except Exception as e:
-            raise Exception(f"Error issuing credential: {str(e)}")
-
     def verify_credential(self, credential_id: str) -> Dict:
         """Verify a credential"""
         if not self.contract:
             raise Exception("Smart contract not initialized")
 
         try:
-            result = self.contract.functions.verifyCredential(credential_id).call()
+            result = self.contract.functions.verifyCredential(self.codec.credential_key(credential_id)).call()
             
-            return {
-                "exists": result[0],
-                "is_valid": result[1],
-                "recipient_name": result[2],
-                "issuer_name": result[3],
-                "credential_type": result[4],
-                "issue_date": datetime.fromtimestamp(result[5]).isoformat() if result[5] > 0 else None
-            }
+            return self.codec.verification(result)
             
         except Exception as e:
             raise Exception(f"Error verifying credential: {str(e)}")
@@ -161,68 +332,71 @@ class BlockchainService:
             raise Exception("Smart contract not initialized")
 
         try:
-            result = self.contract.functions.getCredential(credential_id).call()
+            result = self.contract.functions.getCredential(self.codec.credential_key(credential_id)).call()
             
-            return {
-                "credentialId": result[0],
-                "recipientName": result[1],
-                "recipientEmail": result[2],
-                "issuerName": result[3],
-                "credentialType": result[4],
-                "description": result[5],
-                "issueDate": result[6],
-                "issuer": result[7],
-                "isValid": result[8],
-                "metadataURI": result[9]
-            }
+            return self.codec.credential(result)
             
         except Exception as e:
             raise Exception(f"Error getting credential: {str(e)}")
 
-    def revoke_credential(self, credential_id: str, issuer_address: str) -> str:
-        """Revoke a credential"""
-        if not self.contract:
-            raise Exception("Smart contract not initialized")
+    def _batch_call(self, function_name: str, args_list: List[tuple], batch_size: int, block_identifier="latest") -> List:
+        """
+        Run many read-only calls of one contract function as JSON-RPC batches.
+        Returns decoded results in input order, with None for calls that reverted.
+        """
+        results = [None] * len(args_list)
+        if not args_list:
+            return results
 
-        try:
-            issuer_checksum = Web3.to_checksum_address(issuer_address)
-            
-            txn = self.contract.functions.revokeCredential(
-                credential_id
-            ).build_transaction({
-                'from': issuer_checksum,
-                'nonce': self.w3.eth.get_transaction_count(issuer_checksum),
-                'gas': 2000000,
-                'gasPrice': self.w3.eth.gas_price
-            })
-            
-            return self._send_transaction(txn)
-            
-        except Exception as e:
-            raise Exception(f"Error revoking credential: {str(e)}")
+        payload, output_types = build_call_batch(self.contract, function_name, args_list, block_identifier)
+
+        for chunk in chunked(payload, batch_size):
+            for index, value in decode_call_batch(self.w3.codec, output_types, self.provider.post_json(chunk)):
+                results[index] = value
 
-    def authorize_issuer(self, issuer_address: str, owner_address: str) -> str:
-        """Authorize a new issuer"""
+        return results
+
+    def get_credentials_batch(
+        self,
+        credential_ids: List[str],
+        batch_size: Optional[int] = None,
+        block_identifier="latest"
+    ) -> List[Optional[Dict]]:
+        """Get full credential details for many IDs in batched RPC requests"""
         if not self.contract:
             raise Exception("Smart contract not initialized")
 
         try:
-            issuer_checksum = Web3.to_checksum_address(issuer_address)
-            owner_checksum = Web3.to_checksum_address(owner_address)
-            
-            txn = self.contract.functions.authorizeIssuer(
-                issuer_checksum
-            ).build_transaction({
-                'from': owner_checksum,
-                'nonce': self.w3.eth.get_transaction_count(owner_checksum),
-                'gas': 2000000,
-                'gasPrice': self.w3.eth.gas_price
-            })
-            
-            return self._send_transaction(txn)
-            
+            if batch_size is None:
+                from .config import settings
+                batch_size = settings.rpc_batch_size
+
+            return self.get_credentials_by_key(
+                [self.codec.credential_key(cred_id) for cred_id in credential_ids], batch_size, block_identifier
+            )
+
         except Exception as e:
-            raise Exception(f"Error authorizing issuer: {str(e)}")
+            raise Exception(f"Error getting credentials: {str(e)}")
+
+    def get_credentials_by_key(
+        self,
+        keys: List,
+        batch_size: Optional[int] = None,
+        block_identifier="latest"
+    ) -> List[Optional[Dict]]:
+        """Get full credential details by contract key: plain IDs, or ID hashes for the slim contract"""
+        if batch_size is None:
+            from .config import settings
+            batch_size = settings.rpc_batch_size
+
+        results = self._batch_call("getCredential", [(key,) for key in keys], batch_size, block_identifier)
+        return self.codec.each(self.codec.credential, results)
+
+    def _credential_ids(self, keys: List) -> List[str]:
+        """Plain credential IDs for contract keys; slim ID hashes are resolved through their payloads"""
+        if not self.codec.slim:
+            return keys
+        return [cred["credentialId"] for cred in self.get_credentials_by_key(keys) if cred and cred["credentialId"]]
 
     def get_issuer_credentials(self, issuer_address: str) -> List[str]:
         """Get all credentials issued by an address"""
@@ -231,7 +405,7 @@ class BlockchainService:
 
         try:
             issuer_checksum = Web3.to_checksum_address(issuer_address)
-            return self.contract.functions.getIssuerCredentials(issuer_checksum).call()
+            return self._credential_ids(self.contract.functions.getIssuerCredentials(issuer_checksum).call())
             
         except Exception as e:
             raise Exception(f"Error getting issuer credentials: {str(e)}")
@@ -242,7 +416,9 @@ class BlockchainService:
             raise Exception("Smart contract not initialized")
 
         try:
-            return self.contract.functions.getRecipientCredentials(email).call()
+            return self._credential_ids(
+                self.contract.functions.getRecipientCredentials(self.codec.recipient_key(email)).call()
+            )
             
         except Exception as e:
             raise Exception(f"Error getting recipient credentials: {str(e)}")
@@ -257,4 +433,4 @@ class BlockchainService:
             return self.contract.functions.isAuthorizedIssuer(issuer_checksum).call()
             
         except Exception as e:
-            raise Exception(f"Error checking issuer authorization: {str(e)}")
\ No newline at end of file
+            raise Exception(f"Error checking issuer authorization: {str(e)}")
@@ -0,0 +1,266 @@
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+import asyncio
+import json
+import sqlite3
+import threading
+import time
+
+from web3 import Web3
+
+from .metrics import CACHE_REQUESTS
+
+
+def credential_key(credential_id: str) -> str:
+    """
+    Cache key for a credential ID.
+    Uses the keccak hash so entries can be matched against the indexed
+    `credentialId` topic of CredentialIssued / CredentialRevoked logs.
+    """
+    return Web3.keccak(text=credential_id).hex()
+
+
+class MemoryCache:
+    """In-process LRU cache with a per-entry TTL"""
+
+    def __init__(self, max_entries: int = 10000, ttl: float = 300.0):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+
+    async def get(self, key: str) -> Optional[Any]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            return None
+
+        self._entries.move_to_end(key)
+        return value
+
+    async def get_many(self, keys: List[str]) -> List[Optional[Any]]:
+        return [await self.get(key) for key in keys]
+
+    async def set(self, key: str, value: Any, ttl: Optional[float] = None):
+        self._entries[key] = (time.monotonic() + (ttl or self.ttl), value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def delete(self, *keys: str):
+        for key in keys:
+            self._entries.pop(key, None)
+
+    async def close(self):
+        self._entries.clear()
+
+
+class RedisCache:
+    """Cache backed by a local Redis-compatible server (requires the `redis` package)"""
+
+    def __init__(self, url: str, ttl: float = 300.0, prefix: str = "credcache:"):
+        try:
+            import redis.asyncio as redis
+        except ImportError:
+            raise Exception("Redis cache backend requires the 'redis' package")
+
+        self.ttl = ttl
+        self.prefix = prefix
+        self._client = redis.from_url(url)
+
+    async def get(self, key: str) -> Optional[Any]:
+        raw = await self._client.get(self.prefix + key)
+        return json.loads(raw) if raw is not None else None
+
+    async def get_many(self, keys: List[str]) -> List[Optional[Any]]:
+        if not keys:
+            return []
+        raws = await self._client.mget([self.prefix + key for key in keys])
+        return [json.loads(raw) if raw is not None else None for raw in raws]
+
+    async def set(self, key: str, value: Any, ttl: Optional[float] = None):
+        await self._client.set(self.prefix + key, json.dumps(value), px=int((ttl or self.ttl) * 1000))
+
+    async def delete(self, *keys: str):
+        if keys:
+            await self._client.delete(*(self.prefix + key for key in keys))
+
+    async def close(self):
+        await self._client.aclose()
+
+
+class SqliteCache:
+    """
+    Cache in a local SQLite file, shared by every worker process on the host.
+
+    Reads and writes run in a thread so the event loop never waits on the
+    file. Expired entries are removed, and the table trimmed back to
+    `max_entries` (soonest to expire first), every PRUNE_EVERY writes.
+    """
+
+    PRUNE_EVERY = 1000
+
+    # Keys per SELECT, below SQLite's bound on query parameters
+    QUERY_CHUNK = 500
+
+    def __init__(self, path: str, max_entries: int = 100000, ttl: float = 300.0):
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=5.0)
+        self._lock = threading.Lock()
+        self._writes = 0
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS cache_expires_at ON cache (expires_at)")
+
+    def _get_many(self, keys: List[str]) -> List[Optional[Any]]:
+        found = {}
+        now = time.time()
+        with self._lock:
+            for start in range(0, len(keys), self.QUERY_CHUNK):
+                chunk = keys[start:start + self.QUERY_CHUNK]
+                rows = self._conn.execute(
+                    f"SELECT key, value FROM cache WHERE key IN ({','.join('?' * len(chunk))}) AND expires_at > ?",
+                    (*chunk, now)
+                ).fetchall()
+                found.update(rows)
+        return [json.loads(found[key]) if key in found else None for key in keys]
+
+    def _set(self, key: str, value: Any, ttl: float):
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cache (key, value, expires_at) VALUES (?, ?, ?)",
+                (key, json.dumps(value), time.time() + ttl)
+            )
+            self._writes += 1
+            if self._writes % self.PRUNE_EVERY == 0:
+                self._conn.execute("DELETE FROM cache WHERE expires_at <= ?", (time.time(),))
+                self._conn.execute(
+                    "DELETE FROM cache WHERE key IN (SELECT key FROM cache ORDER BY expires_at LIMIT "
+                    "max((SELECT count(*) FROM cache) - ?, 0))",
+                    (self.max_entries,)
+                )
+
+    def _delete(self, keys: Tuple[str, ...]):
+        with self._lock, self._conn:
+            self._conn.executemany("DELETE FROM cache WHERE key = ?", [(key,) for key in keys])
+
+    async def get(self, key: str) -> Optional[Any]:
+        return (await self.get_many([key]))[0]
+
+    async def get_many(self, keys: List[str]) -> List[Optional[Any]]:
+        if not keys:
+            return []
+        return await asyncio.to_thread(self._get_many, keys)
+
+    async def set(self, key: str, value: Any, ttl: Optional[float] = None):
+        await asyncio.to_thread(self._set, key, value, ttl or self.ttl)
+
+    async def delete(self, *keys: str):
+        if keys:
+            await asyncio.to_thread(self._delete, keys)
+
+    async def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+def create_cache_backend(settings):
+    """Build the cache backend selected by CACHE_BACKEND"""
+    if settings.cache_backend == "redis":
+        return RedisCache(settings.cache_redis_url, ttl=settings.cache_ttl)
+    if settings.cache_backend == "sqlite":
+        return SqliteCache(settings.cache_sqlite_path, max_entries=settings.cache_max_entries, ttl=settings.cache_ttl)
+    if settings.cache_backend == "memory":
+        return MemoryCache(max_entries=settings.cache_max_entries, ttl=settings.cache_ttl)
+    raise Exception(f"Unknown cache backend: {settings.cache_backend}")
+
+
+class CredentialCache:
+    """
+    Read-through cache for credential reads.
+    Entries are grouped per credential so one eviction drops both the
+    verification result and the full credential details.
+    """
+
+    KINDS = ("verify", "credential")
+
+    def __init__(self, backend):
+        self.backend = backend
+        self.hits = 0
+        self.misses = 0
+
+    async def get_or_load(self, kind: str, credential_id: str, loader: Callable[[], Awaitable[Dict]]) -> Dict:
+        """Return the cached value for a credential read, loading it from chain on a miss"""
+        key = f"{kind}:{credential_key(credential_id)}"
+
+        value = await self.backend.get(key)
+        if value is not None:
+            self.hits += 1
+            CACHE_REQUESTS.inc(cache=kind, result="hit")
+            return value
+
+        self.misses += 1
+        CACHE_REQUESTS.inc(cache=kind, result="miss")
+        value = await loader()
+        await self.backend.set(key, value)
+        return value
+
+    async def get_many_or_load(
+        self,
+        kind: str,
+        credential_ids: List[str],
+        loader: Callable[[List[str]], Awaitable[List[Optional[Dict]]]]
+    ) -> Tuple[List[Optional[Dict]], int]:
+        """
+        Cached values for many credential reads, loading all misses with one
+        `loader(missing_ids)` call. Values the loader returns as None are not
+        cached. Returns the values in input order and the number of cache hits.
+        """
+        keys = [f"{kind}:{credential_key(credential_id)}" for credential_id in credential_ids]
+        values = await self.backend.get_many(keys)
+
+        missing = [i for i, value in enumerate(values) if value is None]
+        hits = len(values) - len(missing)
+        self.hits += hits
+        self.misses += len(missing)
+        CACHE_REQUESTS.inc(hits, cache=kind, result="hit")
+        CACHE_REQUESTS.inc(len(missing), cache=kind, result="miss")
+
+        if missing:
+            loaded = await loader([credential_ids[i] for i in missing])
+            for i, value in zip(missing, loaded):
+                values[i] = value
+                if value is not None:
+                    await self.backend.set(keys[i], value)
+
+        return values, hits
+
+    async def set(self, kind: str, credential_id: str, value: Dict):
+        """Store a read obtained some other way, e.g. a verification derived from full details"""
+        await self.backend.set(f"{kind}:{credential_key(credential_id)}", value)
+
+    async def invalidate(self, credential_id: str):
+        """Drop all cached reads for a credential ID"""
+        await self.invalidate_hash(credential_key(credential_id))
+
+    async def invalidate_hash(self, id_hash: str):
+        """Drop all cached reads for a credential ID hash (as found in event topics)"""
+        await self.backend.delete(*(f"{kind}:{id_hash}" for kind in self.KINDS))
+
+    def stats(self) -> Dict:
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / total if total else 0.0
+        }
@@ -0,0 +1,92 @@
+from pathlib import Path
+from typing import Dict, List, Optional
+import json
+import sqlite3
+import threading
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS cohorts (
+    root TEXT PRIMARY KEY,
+    issuer TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    metadata_uri TEXT NOT NULL,
+    tx_hash TEXT NOT NULL,
+    created_at INTEGER NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS cohort_credentials (
+    credential_id TEXT PRIMARY KEY,
+    root TEXT NOT NULL REFERENCES cohorts (root),
+    position INTEGER NOT NULL,
+    leaf TEXT NOT NULL,
+    proof TEXT NOT NULL,
+    payload TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_cohort_credentials_root ON cohort_credentials (root, position);
+"""
+
+
+class CohortStore:
+    """
+    SQLite store of issued cohorts: each credential's payload, leaf and
+    inclusion proof, so recipients can fetch their document again and
+    /verify can check cohort credentials by ID.
+    """
+
+    def __init__(self, db_path: str):
+        Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(SCHEMA)
+
+    def add_cohort(
+        self,
+        root: str,
+        issuer: str,
+        metadata_uri: str,
+        tx_hash: str,
+        created_at: int,
+        entries: List[Dict]
+    ):
+        """Store a cohort; entries hold `credential` (payload), `leaf` and `proof` (hex strings)"""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO cohorts (root, issuer, size, metadata_uri, tx_hash, created_at) VALUES (?, ?, ?, ?, ?, ?)",
+                (root, issuer, len(entries), metadata_uri, tx_hash, created_at)
+            )
+            self._conn.executemany(
+                """
+                INSERT INTO cohort_credentials (credential_id, root, position, leaf, proof, payload)
+                VALUES (?, ?, ?, ?, ?, ?)
+                """,
+                [
+                    (
+                        entry["credential"]["credentialId"], root, position, entry["leaf"],
+                        json.dumps(entry["proof"]), json.dumps(entry["credential"])
+                    )
+                    for position, entry in enumerate(entries)
+                ]
+            )
+
+    def get_credential(self, credential_id: str) -> Optional[Dict]:
+        """A cohort credential document: credential payload, root, leaf and proof"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT * FROM cohort_credentials WHERE credential_id = ?", (credential_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        return {
+            "credential": json.loads(row["payload"]),
+            "root": row["root"],
+            "leaf": row["leaf"],
+            "proof": json.loads(row["proof"])
+        }
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -1,10 +1,166 @@
+from typing import Optional
+
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
+
+# Chain IDs of local development nodes (Hardhat, Ganache), which mine a block per transaction
+LOCAL_CHAIN_IDS = (1337, 31337)
+
 class Settings(BaseSettings):
     # Blockchain
     blockchain_rpc_url: str
     chain_id: int
 
+    # Number of contract reads packed into one JSON-RPC batch request
+    rpc_batch_size: int = 100
+
+    # Pooled HTTP session used by the async Web3 client
+    rpc_pool_size: int = 100
+    rpc_keepalive_timeout: float = 30.0
+    rpc_timeout: float = 30.0
+
+    # RPC provider: comma-separated fallback endpoints, per-call read timeout,
+    # retries with backoff for idempotent reads and endpoint health checks
+    rpc_fallback_urls: str = ""
+    rpc_read_timeout: float = 10.0
+    rpc_max_retries: int = 3
+    rpc_backoff_base: float = 0.1
+    rpc_backoff_max: float = 2.0
+    rpc_health_interval: float = 5.0
+    rpc_unhealthy_cooldown: float = 10.0
+    rpc_max_block_lag: int = 5
+
+    # Credential read cache: "memory" (in-process LRU), "sqlite" (a file shared by
+    # every worker on the host) or "redis"
+    cache_backend: str = "memory"
+    cache_ttl: float = 300.0
+    cache_max_entries: int = 10000
+    cache_redis_url: str = "redis://localhost:6379/0"
+    cache_sqlite_path: str = "data/cache.sqlite3"
+
+    # Multi-worker mode: directory for state coordinated between worker processes
+    # on one host (nonce counters, indexer leadership); empty for a single process
+    shared_state_dir: str = ""
+    # How far the node's pending transaction count may trail the shared nonce
+    # counter before the counter is reset to it
+    nonce_max_drift: int = 8
+
+    # Seconds between polls for CredentialIssued / CredentialRevoked events
+    event_poll_interval: float = 2.0
+
+    # Off-chain event indexer (SQLite mirror used by the listing endpoints)
+    indexer_enabled: bool = False
+    indexer_db_path: str = "data/credential-index.sqlite3"
+    # Blocks a log must be buried under before it is indexed; unset means 0 on
+    # local chains (LOCAL_CHAIN_IDS) and 6 elsewhere
+    indexer_confirmations: Optional[int] = None
+    indexer_start_block: int = 0
+    indexer_max_block_range: int = 2000
+    indexer_poll_interval: float = 5.0
+
+    # Largest page size accepted by the listing endpoints
+    listing_max_limit: int = 1000
+
+    # Largest number of credentials accepted by /api/credentials/issue/batch
+    issue_batch_max: int = 10000
+
+    # Contract-level batch issuance: credentials per issueCredentialsBatch call,
+    # and the share of the block gas limit a single batch may use
+    issue_batch_chunk_size: int = 100
+    batch_gas_fraction: float = 0.5
+
+    # Transaction jobs: receipt poll interval and how long finished jobs stay queryable (seconds)
+    job_poll_interval: float = 2.0
+    job_retention: float = 3600.0
+    # Multi-worker mode: seconds after a worker stops polling before its pending jobs are adopted
+    job_adopt_after: float = 30.0
+
+    # Gas: cached estimates per function signature and calldata size bucket (bytes), padded by a margin
+    gas_margin: float = 1.2
+    gas_estimate_bucket: int = 256
+
+    # EIP-1559 fees from eth_feeHistory, refreshed at most every fee_refresh_interval seconds.
+    # maxFeePerGas = base fee * fee_base_multiplier + tip (median of the percentile rewards)
+    fee_history_blocks: int = 10
+    fee_priority_percentile: float = 50.0
+    fee_min_priority: int = 1000000000
+    fee_base_multiplier: float = 2.0
+    fee_refresh_interval: float = 15.0
+
+    # Stuck transactions are re-sent with the same nonce and fees raised by tx_fee_bump
+    tx_stuck_after: float = 60.0
+    tx_fee_bump: float = 1.125
+    tx_max_replacements: int = 3
+
+    # PDF rendering: worker processes and the most renders queued or running at once
+    pdf_workers: int = 2
+    pdf_max_pending: int = 32
+
+    # Rendered PDFs cached on local disk by content hash, evicted LRU above the size bound
+    pdf_cache_enabled: bool = True
+    pdf_cache_dir: str = "data/pdf-cache"
+    pdf_cache_max_bytes: int = 512 * 1024 * 1024
+
+    # QR codes memoized per credential and format
+    qr_cache_max_entries: int = 10000
+
+    # ZIP export: most credential IDs per request and renders in flight per export
+    pdf_export_max_ids: int = 10000
+    pdf_export_concurrency: int = 4
+
+    # Batch verification: most credential IDs per request
+    verify_batch_max: int = 1000
+
+    # Merkle-anchored cohorts
+    cohort_db_path: str = "data/cohorts.sqlite3"
+    cohort_max_size: int = 100000
+
+    # Slim contract (CredentialVerificationV2): off-chain payloads and recipient hashing
+    payload_store_dir: str = "data/payloads"
+    recipient_hash_salt: str = ""
+
+    # Signed credential documents (EIP-712), signed at issuance or uploaded by issuers
+    document_db_path: str = "data/documents.sqlite3"
+
+    # Signed credential documents are checked against a local copy of
+    # revocations and issuer authorizations, kept in SQLite, replayed from this block
+    # for a new file and then polled (confirmed blocks only, as for the indexer)
+    revocation_registry_enabled: bool = True
+    revocation_db_path: str = "data/revocations.sqlite3"
+    revocation_start_block: int = 0
+    revocation_poll_interval: float = 2.0
+    revocation_max_block_range: int = 2000
+
+    # Per-issuer revocation status lists: minimum list size in bits (lists grow in
+    # steps of this) and the Cache-Control max-age (seconds) they are served with
+    status_list_min_bits: int = 131072
+    status_list_max_age: int = 60
+
+    # Observability: an OpenTelemetry span per request stage (needs opentelemetry-api)
+    tracing_enabled: bool = False
+
+    # Admission control: concurrent requests per route class (verify, verify_batch, pdf,
+    # export, write, default; 0 = unlimited), total in flight above which PDF renders,
+    # exports and batch verifications are shed first, and Retry-After (seconds) for
+    # requests refused for capacity
+    admission_enabled: bool = True
+    admission_limits: str = "verify=512,verify_batch=16,pdf=16,export=2,write=64,default=256"
+    admission_shed_threshold: int = 384
+    admission_retry_after: int = 1
+
+    # Token-bucket rate limits per client IP and per issuer address (writes only):
+    # sustained requests per second and burst size; a rate of 0 disables the limit.
+    # X-Forwarded-For is only used for the client IP behind a trusted proxy.
+    rate_limit_ip_rate: float = 50.0
+    rate_limit_ip_burst: int = 100
+    rate_limit_issuer_rate: float = 10.0
+    rate_limit_issuer_burst: int = 50
+    rate_limit_max_clients: int = 100000
+    rate_limit_trust_forwarded: bool = False
+
+    # Seconds /ready waits for an RPC endpoint to answer
+    ready_timeout: float = 2.0
+
     # Frontend
     frontend_url: str
 
@@ -21,4 +177,10 @@ class Settings(BaseSettings):
         extra="forbid"   # strict & safe
     )
 
+    def confirmation_depth(self) -> int:
+        """Confirmations required before chain logs are mirrored off-chain"""
+        if self.indexer_confirmations is not None:
+            return self.indexer_confirmations
+        return 0 if self.chain_id in LOCAL_CHAIN_IDS else 6
+
 settings = Settings()
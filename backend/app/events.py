@@ -0,0 +1,103 @@
+from typing import Awaitable, Callable, Dict, List
+import asyncio
+
+from web3 import Web3
+
+
+EVENT_SIGNATURES = {
+    "CredentialIssued": "CredentialIssued(string,address,string,uint256)",
+    "CredentialRevoked": "CredentialRevoked(string,address)",
+    "IssuerAuthorized": "IssuerAuthorized(address)",
+    "IssuerRevoked": "IssuerRevoked(address)",
+}
+
+# CredentialVerificationV2 emits the same credential events keyed by bytes32 ID hashes.
+# topics[1] is keccak256(credentialId) for both contracts.
+SLIM_EVENT_SIGNATURES = {
+    "CredentialIssued": "CredentialIssued(bytes32,address,bytes32,uint256)",
+    "CredentialRevoked": "CredentialRevoked(bytes32,address)",
+}
+
+EVENT_TOPICS = {
+    Web3.keccak(text=signature).hex(): name
+    for signatures in (EVENT_SIGNATURES, SLIM_EVENT_SIGNATURES)
+    for name, signature in signatures.items()
+}
+
+
+def topics_for(*event_names: str) -> List[str]:
+    """topic0 values matching any of the given contract events"""
+    return [topic for topic, name in EVENT_TOPICS.items() if name in event_names]
+
+
+class CredentialEventSubscriber:
+    """
+    Polls the contract for CredentialIssued / CredentialRevoked logs and
+    hands each one to the registered listeners.
+    Listeners are called as `await listener(event_name, log)`.
+    With a `leader` HostLock, only the process holding it polls.
+    """
+
+    def __init__(self, blockchain_service, poll_interval: float = 2.0):
+        self.blockchain_service = blockchain_service
+        self.poll_interval = poll_interval
+        self.last_block = None
+        self._listeners: List[Callable[[str, Dict], Awaitable[None]]] = []
+        self._task = None
+        self.leader = None
+
+    def add_listener(self, listener: Callable[[str, Dict], Awaitable[None]]):
+        self._listeners.append(listener)
+
+    def start(self):
+        if self._task is None and self.blockchain_service.contract is not None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self):
+        while True:
+            if self.leader is None or self.leader.acquire():
+                try:
+                    await self.poll()
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    print(f"Error polling credential events: {e}")
+            await asyncio.sleep(self.poll_interval)
+
+    async def poll(self):
+        """Fetch logs emitted since the last poll and dispatch them"""
+        w3 = self.blockchain_service.w3
+        latest = await w3.eth.block_number
+
+        if self.last_block is None:
+            # Only changes after startup matter; cached entries start empty
+            self.last_block = latest
+            return
+        if latest <= self.last_block:
+            return
+
+        logs = await w3.eth.get_logs({
+            "address": self.blockchain_service.contract.address,
+            "fromBlock": self.last_block + 1,
+            "toBlock": latest,
+            "topics": [topics_for("CredentialIssued", "CredentialRevoked")]
+        })
+
+        for log in logs:
+            event_name = EVENT_TOPICS.get(log["topics"][0].hex())
+            for listener in self._listeners:
+                try:
+                    await listener(event_name, log)
+                except Exception as e:
+                    print(f"Error handling {event_name} event: {e}")
+
+        self.last_block = latest
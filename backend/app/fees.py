@@ -0,0 +1,109 @@
+from typing import Dict, Optional, Tuple
+import asyncio
+import statistics
+import time
+
+from web3._utils.abi import abi_to_signature
+
+
+def gas_cache_key(function_call) -> Tuple[str, int]:
+    """
+    Cache key for a gas estimate: the function signature plus the calldata
+    size rounded up to a bucket. Storage cost grows with string lengths,
+    so calls with much longer arguments get their own estimate.
+    """
+    from .config import settings
+
+    bucket = settings.gas_estimate_bucket
+    size = len(function_call._encode_transaction_data()) // 2
+    return abi_to_signature(function_call.abi), -(-size // bucket) * bucket
+
+
+def fees_from_history(history: Dict, gas_price: Optional[int] = None) -> Dict:
+    """
+    EIP-1559 fee fields from an eth_feeHistory result.
+    The tip is the median of the sampled percentile rewards; the fee cap
+    leaves room for the base fee to rise for a few full blocks.
+    Falls back to a legacy gasPrice on chains without a base fee.
+    """
+    from .config import settings
+
+    base_fees = history.get("baseFeePerGas") or []
+    if not base_fees or not base_fees[-1]:
+        return {"gasPrice": gas_price}
+
+    rewards = [block[0] for block in history.get("reward") or [] if block]
+    priority_fee = int(statistics.median(rewards)) if rewards else settings.fee_min_priority
+    priority_fee = max(priority_fee, settings.fee_min_priority)
+    return {
+        "maxPriorityFeePerGas": priority_fee,
+        "maxFeePerGas": int(base_fees[-1] * settings.fee_base_multiplier) + priority_fee
+    }
+
+
+def bump_fees(fees: Dict, current: Optional[Dict] = None) -> Dict:
+    """
+    Fees for a replacement transaction: the old fees raised by the bump
+    factor (nodes require at least +10%), or the current fees if higher.
+    """
+    from .config import settings
+
+    bumped = {name: int(value * settings.tx_fee_bump) + 1 for name, value in fees.items()}
+    if current is not None and current.keys() == bumped.keys():
+        bumped = {name: max(value, current[name]) for name, value in bumped.items()}
+    return bumped
+
+
+class AsyncFeeStrategy:
+    """
+    Gas limits and fees for AsyncBlockchainService transactions.
+
+    Gas estimates are cached per function signature and calldata size and
+    padded by a safety margin; fees come from eth_feeHistory refreshed at
+    most every `fee_refresh_interval` seconds, and concurrent refreshes
+    share one request. A transaction therefore normally costs no RPC calls
+    besides its broadcast.
+    """
+
+    def __init__(self, w3):
+        self.w3 = w3
+        self._gas: Dict[Tuple[str, int], int] = {}
+        self._fees: Optional[Dict] = None
+        self._fees_at = 0.0
+        self._lock = asyncio.Lock()
+
+    def _fees_stale(self) -> bool:
+        from .config import settings
+        return self._fees is None or time.monotonic() - self._fees_at >= settings.fee_refresh_interval
+
+    def _store_fees(self, fees: Dict) -> Dict:
+        self._fees, self._fees_at = fees, time.monotonic()
+        return fees
+
+    def _padded(self, estimate: int) -> int:
+        from .config import settings
+        return int(estimate * settings.gas_margin)
+
+    async def estimate_gas(self, function_call, sender: str) -> int:
+        """Gas limit for a call, estimated once per signature and size bucket"""
+        key = gas_cache_key(function_call)
+        if key not in self._gas:
+            self._gas[key] = await function_call.estimate_gas({"from": sender})
+        return self._padded(self._gas[key])
+
+    async def fees(self) -> Dict:
+        """Fee fields for a new transaction"""
+        from .config import settings
+
+        async with self._lock:
+            if self._fees_stale():
+                history = await self.w3.eth.fee_history(
+                    settings.fee_history_blocks, "latest", [settings.fee_priority_percentile]
+                )
+                gas_price = None if history.get("baseFeePerGas") else await self.w3.eth.gas_price
+                self._store_fees(fees_from_history(history, gas_price))
+        return dict(self._fees)
+
+    def forget(self, function_call):
+        """Drop the cached estimate for a call whose transaction ran out of gas"""
+        self._gas.pop(gas_cache_key(function_call), None)
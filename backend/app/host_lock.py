@@ -0,0 +1,46 @@
+from pathlib import Path
+
+
+class HostLock:
+    """
+    Leadership among the worker processes of one host, as a non-blocking
+    flock on `path`.
+
+    `acquire()` takes the lock if it is free and keeps it until `release()`
+    or until the process exits, so another worker's next `acquire()` takes
+    over from a leader that died. flock locks belong to the open file, so
+    share one HostLock per path within a process. Requires a Unix host.
+    """
+
+    def __init__(self, path: str):
+        try:
+            import fcntl
+        except ImportError:
+            raise Exception("Leader election requires fcntl (a Unix host)")
+        self._fcntl = fcntl
+        self.path = path
+        self._handle = None
+
+    def acquire(self) -> bool:
+        """Whether this process holds the lock; takes it if it is free"""
+        if self._handle is not None:
+            return True
+
+        Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        handle = open(self.path, "a")
+        try:
+            self._fcntl.flock(handle, self._fcntl.LOCK_EX | self._fcntl.LOCK_NB)
+        except BlockingIOError:
+            handle.close()
+            return False
+        self._handle = handle
+        return True
+
+    def held(self) -> bool:
+        return self._handle is not None
+
+    def release(self):
+        if self._handle is not None:
+            # Closing the file releases the lock
+            self._handle.close()
+            self._handle = None
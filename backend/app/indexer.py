@@ -0,0 +1,402 @@
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+import sqlite3
+import threading
+
+from web3 import Web3
+
+from .blockchain import BlockchainService
+from .events import EVENT_TOPICS, topics_for
+from .host_lock import HostLock
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS credentials (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    credential_id TEXT NOT NULL UNIQUE,
+    id_hash TEXT NOT NULL UNIQUE,
+    recipient_name TEXT NOT NULL,
+    recipient_email TEXT NOT NULL,
+    issuer_name TEXT NOT NULL,
+    credential_type TEXT NOT NULL,
+    description TEXT NOT NULL,
+    issue_date INTEGER NOT NULL,
+    issuer TEXT NOT NULL,
+    is_valid INTEGER NOT NULL,
+    metadata_uri TEXT NOT NULL,
+    block_number INTEGER NOT NULL,
+    tx_hash TEXT NOT NULL,
+    revoked_block INTEGER
+);
+CREATE INDEX IF NOT EXISTS idx_credentials_issuer ON credentials (issuer, seq);
+CREATE INDEX IF NOT EXISTS idx_credentials_recipient ON credentials (recipient_email, seq);
+CREATE INDEX IF NOT EXISTS idx_credentials_type ON credentials (credential_type, seq);
+CREATE INDEX IF NOT EXISTS idx_credentials_issue_date ON credentials (issue_date);
+
+CREATE TABLE IF NOT EXISTS issuers (
+    address TEXT PRIMARY KEY,
+    is_authorized INTEGER NOT NULL,
+    updated_block INTEGER NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS cursors (
+    name TEXT PRIMARY KEY,
+    block_number INTEGER NOT NULL
+);
+"""
+
+
+def row_to_credential(row: sqlite3.Row) -> Dict:
+    """Map an index row to the dict shape returned by BlockchainService.get_credential"""
+    return {
+        "credentialId": row["credential_id"],
+        "recipientName": row["recipient_name"],
+        "recipientEmail": row["recipient_email"],
+        "issuerName": row["issuer_name"],
+        "credentialType": row["credential_type"],
+        "description": row["description"],
+        "issueDate": row["issue_date"],
+        "issuer": row["issuer"],
+        "isValid": bool(row["is_valid"]),
+        "metadataURI": row["metadata_uri"],
+        "seq": row["seq"]
+    }
+
+
+def credential_ids_in(args) -> List[str]:
+    """Credential IDs passed to issueCredential (`_credentialId`) or issueCredentialsBatch (`credentialId` per item)"""
+    found = []
+    if isinstance(args, dict):
+        for name, value in args.items():
+            if name in ("_credentialId", "credentialId") and isinstance(value, str):
+                found.append(value)
+            else:
+                found.extend(credential_ids_in(value))
+    elif isinstance(args, (list, tuple)):
+        for item in args:
+            found.extend(credential_ids_in(item))
+    return found
+
+
+class CredentialIndexStore:
+    """SQLite mirror of contract state, written only by CredentialIndexer"""
+
+    CURSOR = "events"
+
+    # Latest chain head seen by the indexing process, for processes that do not index
+    HEAD = "head"
+
+    def __init__(self, db_path: str):
+        Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(SCHEMA)
+
+    def get_cursor(self, name: str = CURSOR) -> Optional[int]:
+        """Last block whose events are fully applied"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT block_number FROM cursors WHERE name = ?", (name,)
+            ).fetchone()
+        return row["block_number"] if row else None
+
+    def get_head(self) -> Optional[int]:
+        return self.get_cursor(self.HEAD)
+
+    def set_head(self, block_number: int):
+        with self._lock, self._conn:
+            self._conn.execute(
+                """
+                INSERT INTO cursors (name, block_number) VALUES (?, ?)
+                ON CONFLICT (name) DO UPDATE SET block_number = excluded.block_number
+                """,
+                (self.HEAD, block_number)
+            )
+
+    def apply(
+        self,
+        to_block: int,
+        issued: Iterable[Dict],
+        revoked: Iterable[Dict],
+        issuer_updates: Iterable[Dict]
+    ):
+        """Apply one range of events and advance the cursor in a single transaction"""
+        with self._lock, self._conn:
+            for cred in issued:
+                self._conn.execute(
+                    """
+                    INSERT OR IGNORE INTO credentials (
+                        credential_id, id_hash, recipient_name, recipient_email, issuer_name,
+                        credential_type, description, issue_date, issuer, is_valid, metadata_uri,
+                        block_number, tx_hash
+                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    """,
+                    (
+                        cred["credentialId"], cred["idHash"], cred["recipientName"], cred["recipientEmail"],
+                        cred["issuerName"], cred["credentialType"], cred["description"], cred["issueDate"],
+                        cred["issuer"], int(cred["isValid"]), cred["metadataURI"],
+                        cred["blockNumber"], cred["txHash"]
+                    )
+                )
+            for revocation in revoked:
+                self._conn.execute(
+                    "UPDATE credentials SET is_valid = 0, revoked_block = ? WHERE id_hash = ?",
+                    (revocation["blockNumber"], revocation["idHash"])
+                )
+            for update in issuer_updates:
+                self._conn.execute(
+                    """
+                    INSERT INTO issuers (address, is_authorized, updated_block) VALUES (?, ?, ?)
+                    ON CONFLICT (address) DO UPDATE SET
+                        is_authorized = excluded.is_authorized, updated_block = excluded.updated_block
+                    """,
+                    (update["address"], int(update["isAuthorized"]), update["blockNumber"])
+                )
+            self._conn.execute(
+                """
+                INSERT INTO cursors (name, block_number) VALUES (?, ?)
+                ON CONFLICT (name) DO UPDATE SET block_number = excluded.block_number
+                """,
+                (self.CURSOR, to_block)
+            )
+
+    def _where(
+        self,
+        issuer: Optional[str] = None,
+        recipient_email: Optional[str] = None,
+        credential_type: Optional[str] = None,
+        is_valid: Optional[bool] = None,
+        issued_after: Optional[int] = None,
+        issued_before: Optional[int] = None
+    ):
+        clauses, params = [], []
+        if issuer is not None:
+            clauses.append("issuer = ?")
+            params.append(Web3.to_checksum_address(issuer))
+        if recipient_email is not None:
+            clauses.append("recipient_email = ?")
+            params.append(recipient_email)
+        if credential_type is not None:
+            clauses.append("credential_type = ?")
+            params.append(credential_type)
+        if is_valid is not None:
+            clauses.append("is_valid = ?")
+            params.append(int(is_valid))
+        if issued_after is not None:
+            clauses.append("issue_date >= ?")
+            params.append(issued_after)
+        if issued_before is not None:
+            clauses.append("issue_date < ?")
+            params.append(issued_before)
+        return clauses, params
+
+    def query_credentials(self, after_seq: Optional[int] = None, limit: Optional[int] = None, **filters) -> List[Dict]:
+        """Credentials matching the filters, in issuance order, starting after `after_seq`"""
+        clauses, params = self._where(**filters)
+        if after_seq is not None:
+            clauses.append("seq > ?")
+            params.append(after_seq)
+
+        sql = "SELECT * FROM credentials"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY seq"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        return [row_to_credential(row) for row in rows]
+
+    def count_credentials(self, **filters) -> int:
+        """Number of credentials matching the filters"""
+        clauses, params = self._where(**filters)
+        sql = "SELECT COUNT(*) FROM credentials"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+
+        with self._lock:
+            return self._conn.execute(sql, params).fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class CredentialIndexer:
+    """
+    Background thread that mirrors contract events into a CredentialIndexStore.
+
+    Only blocks at least `confirmations` deep are indexed, so shallow reorgs
+    never reach the store; the cursor is advanced in the same SQLite
+    transaction as the rows, so a restart resumes exactly where it stopped.
+
+    When several worker processes share the store, give each the same
+    `lock_path`: whichever takes the file lock first indexes, and the others
+    only read, taking over if that process exits.
+    """
+
+    def __init__(
+        self,
+        store: CredentialIndexStore,
+        confirmations: int = 6,
+        start_block: int = 0,
+        max_block_range: int = 2000,
+        poll_interval: float = 5.0,
+        lock_path: Optional[str] = None
+    ):
+        self.store = store
+        self.confirmations = confirmations
+        self.start_block = start_block
+        self.max_block_range = max_block_range
+        self.poll_interval = poll_interval
+        self.lock_path = lock_path
+        self.head_block = None
+        self.blockchain_service = None
+        self._stop = threading.Event()
+        self._thread = None
+        self._leader = HostLock(lock_path) if lock_path is not None else None
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="credential-indexer", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.poll_interval + 5)
+            self._thread = None
+        if self._leader is not None:
+            self._leader.release()
+
+    def is_leader(self) -> bool:
+        """Whether this process indexes; takes the file lock if it is free"""
+        return self._leader is None or self._leader.acquire()
+
+    def is_synced(self) -> bool:
+        """True once the store has caught up with the confirmed chain head"""
+        cursor = self.store.get_cursor()
+        head_block = self.head_block if self.head_block is not None else self.store.get_head()
+        return (
+            cursor is not None
+            and head_block is not None
+            and cursor >= head_block - self.confirmations
+        )
+
+    def _run(self):
+        while not self._stop.is_set():
+            if not self.is_leader():
+                self._stop.wait(self.poll_interval)
+                continue
+            if self.blockchain_service is None:
+                self.blockchain_service = BlockchainService()
+            try:
+                caught_up = self.sync_once()
+            except Exception as e:
+                print(f"Error indexing credential events: {e}")
+                caught_up = True
+            if caught_up:
+                self._stop.wait(self.poll_interval)
+
+    def sync_once(self) -> bool:
+        """Index the next confirmed block range. Returns True when caught up."""
+        service = self.blockchain_service
+        if not service.contract:
+            return True
+
+        self.head_block = service.w3.eth.block_number
+        if self.lock_path is not None:
+            self.store.set_head(self.head_block)
+        safe_block = self.head_block - self.confirmations
+
+        cursor = self.store.get_cursor()
+        from_block = self.start_block if cursor is None else cursor + 1
+        if from_block > safe_block:
+            return True
+        to_block = min(safe_block, from_block + self.max_block_range - 1)
+
+        logs = service.w3.eth.get_logs({
+            "address": service.contract.address,
+            "fromBlock": from_block,
+            "toBlock": to_block,
+            "topics": [topics_for("CredentialIssued", "CredentialRevoked", "IssuerAuthorized", "IssuerRevoked")]
+        })
+
+        issued_logs, revoked, issuer_updates = [], [], []
+        for log in logs:
+            event_name = EVENT_TOPICS.get(log["topics"][0].hex())
+            if event_name == "CredentialIssued":
+                issued_logs.append(log)
+            elif event_name == "CredentialRevoked":
+                revoked.append({"idHash": log["topics"][1].hex(), "blockNumber": log["blockNumber"]})
+            else:
+                issuer_updates.append({
+                    "address": Web3.to_checksum_address(log["topics"][1][-20:]),
+                    "isAuthorized": event_name == "IssuerAuthorized",
+                    "blockNumber": log["blockNumber"]
+                })
+
+        issued = self._resolve_issued(issued_logs, to_block)
+        self.store.apply(to_block, issued, revoked, issuer_updates)
+        return to_block >= safe_block
+
+    def _resolve_issued(self, logs: List[Dict], to_block: int) -> List[Dict]:
+        """
+        Recover plain credential IDs for CredentialIssued logs and load their details.
+        The event only carries keccak(credentialId), so IDs are taken from the
+        issuing transaction's calldata and matched against the indexed topic.
+        The slim contract is read by that hash directly and IDs come from the
+        stored payloads; credentials whose payload is not stored are skipped.
+        Logs whose ID cannot be recovered, e.g. credentials issued through a
+        forwarder or multisig whose calldata is not an issue call, are skipped
+        too, so one such transaction never stalls the index.
+        """
+        service = self.blockchain_service
+        if not logs:
+            return []
+
+        ordered = sorted(logs, key=lambda log: (log["blockNumber"], log["logIndex"]))
+        if service.codec.slim:
+            details = service.get_credentials_by_key(
+                [bytes(log["topics"][1]) for log in ordered], block_identifier=to_block
+            )
+        else:
+            ids_by_hash = {}
+            for tx_hash in {log["transactionHash"] for log in logs}:
+                tx = service.w3.eth.get_transaction(tx_hash)
+                try:
+                    _, args = service.contract.decode_function_input(tx["input"])
+                except ValueError:
+                    continue
+                for credential_id in credential_ids_in(args):
+                    ids_by_hash[Web3.keccak(text=credential_id).hex()] = credential_id
+
+            resolvable = []
+            for log in ordered:
+                if log["topics"][1].hex() in ids_by_hash:
+                    resolvable.append(log)
+                else:
+                    print(
+                        f"Skipping credential {log['topics'][1].hex()} issued in {log['transactionHash'].hex()}: "
+                        "its ID is not in the transaction calldata"
+                    )
+            ordered = resolvable
+            credential_ids = [ids_by_hash[log["topics"][1].hex()] for log in ordered]
+            details = service.get_credentials_batch(credential_ids, block_identifier=to_block)
+
+        issued = []
+        for log, cred in zip(ordered, details):
+            if not cred or cred["credentialId"] == "":
+                continue
+            issued.append(dict(
+                cred,
+                idHash=log["topics"][1].hex(),
+                blockNumber=log["blockNumber"],
+                txHash=log["transactionHash"].hex()
+            ))
+        return issued
@@ -0,0 +1,317 @@
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, List, Optional
+import asyncio
+import json
+import sqlite3
+import threading
+import time
+import uuid
+
+from .fees import bump_fees
+from .metrics import TX_CONFIRMATION_SECONDS
+
+
+JOB_STATUSES = ("pending", "mined", "failed", "replaced")
+
+
+class SharedJobStore:
+    """
+    Pending jobs of every worker process on a host, in one SQLite file.
+
+    Each job records the worker polling it and when that worker last
+    checked in. A worker that stops (a crash, a restart, a scale-down)
+    stops checking in, and its jobs are handed to whichever worker calls
+    `adopt` first once they are `stale_after` seconds old.
+    """
+
+    def __init__(self, db_path: str):
+        Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        self.worker_id = uuid.uuid4().hex
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS jobs (
+                    job_id TEXT PRIMARY KEY,
+                    owner TEXT NOT NULL,
+                    heartbeat REAL NOT NULL,
+                    job TEXT NOT NULL
+                )
+                """
+            )
+
+    def put(self, job: Dict):
+        with self._lock, self._conn:
+            self._conn.execute(
+                """
+                INSERT INTO jobs (job_id, owner, heartbeat, job) VALUES (?, ?, ?, ?)
+                ON CONFLICT (job_id) DO UPDATE SET
+                    owner = excluded.owner, heartbeat = excluded.heartbeat, job = excluded.job
+                """,
+                (job["job_id"], self.worker_id, time.time(), json.dumps(job))
+            )
+
+    def remove(self, job_id: str):
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM jobs WHERE job_id = ?", (job_id,))
+
+    def heartbeat(self):
+        """Mark every job of this worker as still polled"""
+        with self._lock, self._conn:
+            self._conn.execute("UPDATE jobs SET heartbeat = ? WHERE owner = ?", (time.time(), self.worker_id))
+
+    def adopt(self, stale_after: float) -> List[Dict]:
+        """Take over the jobs of workers that have not checked in for `stale_after` seconds"""
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute("BEGIN IMMEDIATE")
+            rows = self._conn.execute(
+                "SELECT job_id, job FROM jobs WHERE owner != ? AND heartbeat < ?",
+                (self.worker_id, now - stale_after)
+            ).fetchall()
+            self._conn.executemany(
+                "UPDATE jobs SET owner = ?, heartbeat = ? WHERE job_id = ?",
+                [(self.worker_id, now, job_id) for job_id, _ in rows]
+            )
+        return [json.loads(job) for _, job in rows]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class TransactionJobTracker:
+    """
+    Tracks broadcast transactions as jobs and polls their receipts in the background.
+
+    A job starts as `pending` and ends as `mined` (receipt status 1),
+    `failed` (reverted) or `replaced` (another transaction from the same
+    sender was mined with its nonce). A job still pending `stuck_after`
+    seconds after its last broadcast is re-sent with the same nonce and
+    bumped fees, up to `max_replacements` times; a receipt for any of its
+    hashes settles it. Finished jobs are kept for `retention` seconds so
+    clients can still look them up.
+
+    With a `shared` cache backend, every job change is also published there,
+    so a job can be looked up from any worker process, not only the one
+    polling it. With a SharedJobStore as `store`, pending jobs are recorded
+    there too, and jobs of a worker that stopped are adopted after
+    `adopt_after` seconds. Adopted jobs are settled by receipt or nonce only:
+    the transaction to re-send and the on-mined callback stayed with the
+    stopped worker.
+    """
+
+    def __init__(
+        self,
+        blockchain_service,
+        poll_interval: float = 2.0,
+        retention: float = 3600.0,
+        stuck_after: float = 60.0,
+        max_replacements: int = 3,
+        adopt_after: float = 30.0
+    ):
+        self.blockchain_service = blockchain_service
+        self.poll_interval = poll_interval
+        self.retention = retention
+        self.stuck_after = stuck_after
+        self.max_replacements = max_replacements
+        self.adopt_after = adopt_after
+        self._jobs: Dict[str, Dict] = {}
+        self._submissions: Dict[str, Dict] = {}
+        self._on_mined: Dict[str, Callable[[], Awaitable[None]]] = {}
+        self._task = None
+        self.shared = None
+        self.store = None
+        self._publishing = set()
+
+    def track(
+        self,
+        kind: str,
+        submission: Dict,
+        details: Optional[Dict] = None,
+        on_mined: Optional[Callable[[], Awaitable[None]]] = None
+    ) -> Dict:
+        """Register a broadcast transaction (as returned by _send_transaction) and return its job"""
+        now = time.time()
+        job = {
+            "job_id": uuid.uuid4().hex,
+            "kind": kind,
+            "status": "pending",
+            "transaction_hash": submission["transaction_hash"],
+            "sender": submission["sender"],
+            "nonce": submission["nonce"],
+            "previous_hashes": [],
+            "block_number": None,
+            "error": None,
+            "details": details or {},
+            "created_at": now,
+            "updated_at": now
+        }
+        self._jobs[job["job_id"]] = job
+        self._submissions[job["job_id"]] = dict(submission, broadcast_at=now)
+        if on_mined is not None:
+            self._on_mined[job["job_id"]] = on_mined
+        if self.shared is not None or self.store is not None:
+            task = asyncio.ensure_future(self._publish(job))
+            self._publishing.add(task)
+            task.add_done_callback(self._publishing.discard)
+        return job
+
+    def get(self, job_id: str) -> Optional[Dict]:
+        return self._jobs.get(job_id)
+
+    async def lookup(self, job_id: str) -> Optional[Dict]:
+        """A job tracked by this process or, with a shared backend, by any other"""
+        job = self._jobs.get(job_id)
+        if job is None and self.shared is not None:
+            try:
+                job = await self.shared.get(f"job:{job_id}")
+            except Exception as e:
+                print(f"Error reading shared job: {e}")
+        return job
+
+    async def _publish(self, job: Dict):
+        if self.shared is not None:
+            try:
+                await self.shared.set(f"job:{job['job_id']}", job, ttl=self.retention)
+            except Exception as e:
+                print(f"Error publishing job: {e}")
+        if self.store is not None:
+            try:
+                if job["status"] == "pending":
+                    await asyncio.to_thread(self.store.put, job)
+                else:
+                    await asyncio.to_thread(self.store.remove, job["job_id"])
+            except Exception as e:
+                print(f"Error recording shared job: {e}")
+
+    async def _adopt(self):
+        """Check in this worker's jobs and take over those of stopped workers"""
+        await asyncio.to_thread(self.store.heartbeat)
+        for job in await asyncio.to_thread(self.store.adopt, self.adopt_after):
+            if job["job_id"] not in self._jobs:
+                self._jobs[job["job_id"]] = job
+                print(f"Adopted pending {job['kind']} job {job['job_id']} from a stopped worker")
+
+    def pending(self) -> List[Dict]:
+        return [job for job in self._jobs.values() if job["status"] == "pending"]
+
+    def start(self):
+        if self._task is None and self.blockchain_service.contract is not None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self):
+        while True:
+            try:
+                await self.poll()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"Error polling transaction jobs: {e}")
+            await asyncio.sleep(self.poll_interval)
+
+    async def poll(self):
+        """Update pending jobs from their receipts and drop expired finished ones"""
+        self._prune()
+        if self.store is not None:
+            await self._adopt()
+        jobs = self.pending()
+        if not jobs:
+            return
+
+        w3 = self.blockchain_service.w3
+
+        # Mined nonces are read before receipts: a nonce that is already used
+        # while our receipt is still missing means another transaction took it
+        mined_nonces = {}
+        for sender in {job["sender"] for job in jobs}:
+            mined_nonces[sender] = await w3.eth.get_transaction_count(sender, "latest")
+
+        receipts = await self.blockchain_service.get_receipts(
+            [tx_hash for job in jobs for tx_hash in [job["transaction_hash"], *job["previous_hashes"]]],
+            timeout=0
+        )
+
+        for job in jobs:
+            receipt = next(
+                (receipts[tx_hash] for tx_hash in [job["transaction_hash"], *job["previous_hashes"]] if tx_hash in receipts),
+                None
+            )
+            if receipt is not None:
+                await self._settle(job, receipt)
+            elif mined_nonces[job["sender"]] > job["nonce"]:
+                await self._finish(job, "replaced", "Another transaction was mined with the same nonce")
+            elif (
+                job["job_id"] in self._submissions
+                and time.time() - self._submissions[job["job_id"]]["broadcast_at"] >= self.stuck_after
+            ):
+                await self._replace(job)
+
+    async def _settle(self, job: Dict, receipt: Dict):
+        submission = self._submissions.get(job["job_id"])
+        if receipt["transactionHash"] != job["transaction_hash"]:
+            # An earlier broadcast was mined before its replacement
+            job["previous_hashes"].append(job["transaction_hash"])
+            job["previous_hashes"].remove(receipt["transactionHash"])
+            job["transaction_hash"] = receipt["transactionHash"]
+        job["block_number"] = int(receipt["blockNumber"], 16)
+
+        if int(receipt["status"], 16) == 1:
+            await self._finish(job, "mined")
+            return
+
+        if submission is not None and int(receipt["gasUsed"], 16) >= submission["gas"]:
+            # Ran out of gas: the cached estimate is too low for this call
+            self.blockchain_service.fee_strategy.forget(submission["function_call"])
+        await self._finish(job, "failed", "Transaction reverted")
+
+    async def _replace(self, job: Dict):
+        """Re-broadcast a stuck transaction with the same nonce and bumped fees"""
+        submission = self._submissions[job["job_id"]]
+        if len(job["previous_hashes"]) >= self.max_replacements:
+            return
+
+        try:
+            fees = bump_fees(submission["fees"], await self.blockchain_service.fee_strategy.fees())
+            tx_hash = await self.blockchain_service.replace_transaction(submission, fees)
+        except Exception as e:
+            print(f"Error replacing stuck {job['kind']} job: {e}")
+            return
+
+        job["previous_hashes"].append(job["transaction_hash"])
+        job["transaction_hash"] = tx_hash
+        job["updated_at"] = time.time()
+        submission.update(fees=fees, broadcast_at=time.time())
+        await self._publish(job)
+
+    async def _finish(self, job: Dict, status: str, error: Optional[str] = None):
+        job["status"] = status
+        job["error"] = error
+        job["updated_at"] = time.time()
+        self._submissions.pop(job["job_id"], None)
+        TX_CONFIRMATION_SECONDS.observe(job["updated_at"] - job["created_at"], kind=job["kind"], status=status)
+        await self._publish(job)
+
+        on_mined = self._on_mined.pop(job["job_id"], None)
+        if on_mined is not None and status == "mined":
+            try:
+                await on_mined()
+            except Exception as e:
+                print(f"Error handling mined {job['kind']} job: {e}")
+
+    def _prune(self):
+        cutoff = time.time() - self.retention
+        for job_id, job in list(self._jobs.items()):
+            if job["status"] != "pending" and job["updated_at"] < cutoff:
+                del self._jobs[job_id]
@@ -0,0 +1,90 @@
+from typing import AsyncIterator, Dict, Optional, Tuple
+import base64
+import json
+
+from starlette.concurrency import run_in_threadpool
+
+from .blockchain import chunked
+
+
+def encode_cursor(source: str, position: int) -> str:
+    """Opaque pagination cursor pointing just past `position`"""
+    raw = json.dumps({"s": source, "p": position}, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[str, int]:
+    """Decode a cursor produced by encode_cursor into (source, position)"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        data = json.loads(raw)
+        return data["s"], int(data["p"])
+    except Exception:
+        raise ValueError("Invalid cursor")
+
+
+def matches_filters(
+    cred: Dict,
+    credential_type: Optional[str] = None,
+    is_valid: Optional[bool] = None,
+    issued_after: Optional[int] = None,
+    issued_before: Optional[int] = None
+) -> bool:
+    """Apply listing filters to a resolved credential (chain path only; the index filters in SQL)"""
+    if credential_type is not None and cred["credentialType"] != credential_type:
+        return False
+    if is_valid is not None and cred["isValid"] != is_valid:
+        return False
+    if issued_after is not None and cred["issueDate"] < issued_after:
+        return False
+    if issued_before is not None and cred["issueDate"] >= issued_before:
+        return False
+    return True
+
+
+async def iter_credentials(
+    blockchain_service,
+    index_store,
+    owner: Dict,
+    filters: Dict,
+    cursor: Optional[str] = None,
+    batch_size: int = 100
+) -> AsyncIterator[Tuple[Dict, str]]:
+    """
+    Yield (credential, cursor) pairs for an issuer or recipient listing.
+
+    `owner` is either {"issuer": address} or {"recipient_email": email}.
+    Each yielded cursor resumes the listing right after that credential.
+    The off-chain index is used when `index_store` is given; otherwise IDs
+    come from the contract and are resolved in batches of `batch_size`,
+    so callers can stop early without resolving the remainder.
+    """
+    source, position = decode_cursor(cursor) if cursor else (None, None)
+    if source is None:
+        source = "index" if index_store is not None else "chain"
+    if source == "index" and index_store is None:
+        raise ValueError("Cursor refers to the credential index, which is not available")
+
+    if source == "index":
+        after_seq = position
+        while True:
+            rows = await run_in_threadpool(
+                index_store.query_credentials, after_seq=after_seq, limit=batch_size, **owner, **filters
+            )
+            for cred in rows:
+                after_seq = cred["seq"]
+                yield cred, encode_cursor("index", after_seq)
+            if len(rows) < batch_size:
+                return
+
+    if "issuer" in owner:
+        credential_ids = await blockchain_service.get_issuer_credentials(owner["issuer"])
+    else:
+        credential_ids = await blockchain_service.get_recipient_credentials(owner["recipient_email"])
+
+    offset = position or 0
+    for chunk in chunked(credential_ids[offset:], batch_size):
+        for cred in await blockchain_service.get_credentials_batch(chunk):
+            offset += 1
+            if cred and cred["credentialId"] != "" and matches_filters(cred, **filters):
+                yield cred, encode_cursor("chain", offset)
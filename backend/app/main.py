@@ -1,30 +1,310 @@
-from fastapi import FastAPI, HTTPException, Depends
+from fastapi import FastAPI, HTTPException, Depends, Query, Request
 from fastapi.middleware.cors import CORSMiddleware
-from typing import List, Optional
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+from starlette.concurrency import run_in_threadpool
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from pydantic import ValidationError
+from web3 import Web3
+import asyncio
+import csv
 import json
+import time
 from datetime import datetime
 import hashlib
-import qrcode
 import io
 import base64
 
 from .models import (
     CredentialCreate,
+    CredentialBatchCreate,
+    BatchIssueResponse,
     CredentialResponse,
+    CohortCreate,
+    CohortCredentialDocument,
+    CohortIssueResponse,
+    CohortVerifyResponse,
+    CredentialStatusResponse,
     VerifyCredentialResponse,
+    VerifyBatchRequest,
+    VerifyBatchResponse,
+    VerifyBatchResult,
     IssuerAuthorization,
-    QRCodeResponse
+    JobStatusResponse,
+    PdfExportRequest,
+    QRCodeResponse,
+    SignedCredentialDocument,
+    SignedDocumentVerifyResponse
 )
-from .blockchain import BlockchainService
+from .admission import AdmissionMiddleware, create_admission_controller, retry_after_header
+from .async_blockchain import AsyncBlockchainService
+from .cache import CredentialCache, SqliteCache, create_cache_backend, credential_key
+from .events import CredentialEventSubscriber
+from .host_lock import HostLock
+from .indexer import CredentialIndexer, CredentialIndexStore
+from .jobs import SharedJobStore, TransactionJobTracker
+from .listings import decode_cursor, iter_credentials
 from .config import settings
-from .pdf_utils import create_certificate_pdf
+from .blockchain import chunked
+from .cohorts import CohortStore
+from .merkle import build_cohort, leaf_hash
+from .metrics import (
+    HTTP_IN_FLIGHT,
+    HTTP_REQUESTS,
+    HTTP_REQUEST_SECONDS,
+    IN_FLIGHT,
+    enable_tracing,
+    render_metrics,
+    span,
+    stage,
+    update_cache_ratios
+)
+from .pdf_cache import PdfCache, pdf_digest
+from .pdf_export import zip_certificates
+from .pdf_utils import PdfRenderPool, RenderQueueFull
+from .qr import QRCodeService
+from .revocations import RevocationRegistry, RevocationStore
+from .signed_documents import DocumentVerifier, SignedDocumentStore, document_mismatch, sign_credential
+
+# Initialize blockchain service
+blockchain_service = AsyncBlockchainService()
+event_subscriber = CredentialEventSubscriber(blockchain_service, settings.event_poll_interval)
+job_tracker = TransactionJobTracker(
+    blockchain_service,
+    poll_interval=settings.job_poll_interval,
+    retention=settings.job_retention,
+    stuck_after=settings.tx_stuck_after,
+    max_replacements=settings.tx_max_replacements,
+    adopt_after=settings.job_adopt_after
+)
+credential_indexer = None
+pdf_pool = PdfRenderPool(settings.pdf_workers, settings.pdf_max_pending)
+pdf_cache = None
+cohort_store = None
+qr_service = QRCodeService(settings.frontend_url, settings.qr_cache_max_entries)
+admission = create_admission_controller(settings)
+revocation_registry = None
+document_verifier = None
+leader_lock = None
+document_store = None
+
+
+async def evict_cached_credential(event_name: str, log):
+    """Drop cached reads for a credential when it is issued or revoked"""
+    await blockchain_service.cache.invalidate_hash(log["topics"][1].hex())
+
+
+async def evict_cached_pdf(event_name: str, log):
+    """Drop stored certificate PDFs of a revoked credential"""
+    if event_name == "CredentialRevoked" and pdf_cache is not None:
+        await run_in_threadpool(pdf_cache.invalidate_hash, log["topics"][1].hex())
+
+
+async def credential_revoked(credential_id: str):
+    """Evict everything cached for a credential once its revocation is mined"""
+    await blockchain_service.cache.invalidate(credential_id)
+    if pdf_cache is not None:
+        await run_in_threadpool(pdf_cache.invalidate, credential_id)
+
+
+async def open_pdf_cache():
+    """Open the PDF cache off the event loop; it indexes every file in its directory"""
+    global pdf_cache
+    pdf_cache = await run_in_threadpool(PdfCache, settings.pdf_cache_dir, settings.pdf_cache_max_bytes)
+
+
+def start_contract_tasks():
+    """Start the event subscriber, job tracker and revocation registry; each only starts once a contract is loaded"""
+    event_subscriber.start()
+    job_tracker.start()
+    if revocation_registry is not None:
+        revocation_registry.start()
+
+
+def revocations_ready() -> bool:
+    """Whether the revocation state has been replayed"""
+    return revocation_registry is not None and revocation_registry.is_ready()
+
+
+async def sign_and_store_document(credential_id: str) -> Optional[Dict]:
+    """
+    Sign a credential's document with the backend key and store it.
+    None when the credential was issued by another key, which has to upload its own.
+    """
+    credential = await blockchain_service.get_credential(credential_id)
+    if not credential or credential["credentialId"] == "":
+        return None
+    try:
+        document = await run_in_threadpool(
+            sign_credential, credential, settings.private_key, settings.chain_id, blockchain_service.contract_address
+        )
+    except Exception:
+        return None
+    await run_in_threadpool(document_store.put, credential_id, document)
+    return document
+
+
+async def credential_issued(credential_id: str):
+    """Sign and store the document of a credential once its issuance is mined"""
+    # A read made before the transaction was mined may have cached an empty credential
+    await blockchain_service.cache.invalidate(credential_id)
+    await sign_and_store_document(credential_id)
+
+
+async def credentials_issued(credential_ids: List[str]):
+    """Sign and store the documents of credentials issued together once their transaction is mined"""
+    for credential_id in credential_ids:
+        await credential_issued(credential_id)
+
+
+def status_list_entry(credential_id: str) -> Optional[Dict]:
+    """Status list index and URL of a credential, once its issuance has been replayed"""
+    if not revocations_ready():
+        return None
+    entry = revocation_registry.status_entry(credential_key(credential_id))
+    if entry is None:
+        return None
+    issuer = Web3.to_checksum_address(entry[0])
+    return {"status_list_index": entry[1], "status_list_url": f"/api/issuers/{issuer}/status-list"}
+
+
+def get_document_verifier() -> Optional[DocumentVerifier]:
+    """Verifier for signed documents, once the contract is loaded and its revocations replayed"""
+    global document_verifier
+    if not revocations_ready():
+        return None
+    if document_verifier is None:
+        document_verifier = DocumentVerifier(
+            revocation_registry, settings.chain_id, blockchain_service.contract_address
+        )
+    return document_verifier
+
+
+def limit_issuer(issuer_address: str):
+    """Reject a write with 429 once its issuer has used up its rate limit"""
+    if not settings.admission_enabled:
+        return
+    retry_after = admission.check_issuer(issuer_address)
+    if retry_after:
+        raise HTTPException(
+            status_code=429,
+            detail="Issuer rate limit exceeded",
+            headers=retry_after_header(retry_after)
+        )
+
+
+def warm_up():
+    """
+    One-time host setup for multi-worker deployments, called by the process
+    manager before it forks workers (see gunicorn.conf.py). Workers inherit
+    the imported modules and find the shared stores already created.
+    """
+    import qrcode
+    import qrcode.image.svg  # noqa: F401
+
+    Path(settings.pdf_cache_dir).mkdir(parents=True, exist_ok=True)
+    if settings.shared_state_dir:
+        Path(settings.shared_state_dir).mkdir(parents=True, exist_ok=True)
+    if settings.cache_backend == "sqlite":
+        asyncio.run(SqliteCache(settings.cache_sqlite_path).close())
+    if settings.indexer_enabled:
+        CredentialIndexStore(settings.indexer_db_path).close()
+    CohortStore(settings.cohort_db_path).close()
+
+
+def index_ready() -> bool:
+    """Whether listings can be served from the off-chain index"""
+    return credential_indexer is not None and credential_indexer.is_synced()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    global credential_indexer, cohort_store, revocation_registry, leader_lock, document_store
+
+    if settings.tracing_enabled:
+        enable_tracing()
+    await blockchain_service.connect()
+    pdf_pool.start()
+    blockchain_service.cache = CredentialCache(create_cache_backend(settings))
+    if settings.cache_backend != "memory":
+        # Job status can then be read from any worker
+        job_tracker.shared = blockchain_service.cache.backend
+    event_subscriber.add_listener(evict_cached_credential)
+    pdf_cache_task = None
+    if settings.pdf_cache_enabled:
+        # PDFs are rendered uncached until the cache has been opened in the background
+        pdf_cache_task = asyncio.create_task(open_pdf_cache())
+        event_subscriber.add_listener(evict_cached_pdf)
+    cohort_store = CohortStore(settings.cohort_db_path)
+    document_store = SignedDocumentStore(settings.document_db_path)
+    if settings.revocation_registry_enabled:
+        revocation_registry = RevocationRegistry(
+            blockchain_service,
+            RevocationStore(settings.revocation_db_path, settings.status_list_min_bits),
+            poll_interval=settings.revocation_poll_interval,
+            start_block=settings.revocation_start_block,
+            max_block_range=settings.revocation_max_block_range,
+            confirmations=settings.confirmation_depth()
+        )
+    if settings.shared_state_dir:
+        # One worker polls events and revocations for the host; the others read
+        # what it writes (caches only when they are shared) and take over if it exits
+        leader_lock = HostLock(str(Path(settings.shared_state_dir) / "leader.lock"))
+        if settings.cache_backend != "memory":
+            event_subscriber.leader = leader_lock
+        if revocation_registry is not None:
+            revocation_registry.leader = leader_lock
+        job_tracker.store = SharedJobStore(str(Path(settings.shared_state_dir) / "jobs.sqlite3"))
+    start_contract_tasks()
+    if settings.indexer_enabled:
+        credential_indexer = CredentialIndexer(
+            CredentialIndexStore(settings.indexer_db_path),
+            confirmations=settings.confirmation_depth(),
+            start_block=settings.indexer_start_block,
+            max_block_range=settings.indexer_max_block_range,
+            poll_interval=settings.indexer_poll_interval,
+            lock_path=str(Path(settings.shared_state_dir) / "indexer.lock") if settings.shared_state_dir else None
+        )
+        credential_indexer.start()
+    yield
+    if pdf_cache_task is not None:
+        pdf_cache_task.cancel()
+    if credential_indexer is not None:
+        credential_indexer.stop()
+        credential_indexer.store.close()
+    await job_tracker.stop()
+    await event_subscriber.stop()
+    if revocation_registry is not None:
+        await revocation_registry.stop()
+        revocation_registry.store.close()
+    if job_tracker.store is not None:
+        job_tracker.store.close()
+    if leader_lock is not None:
+        leader_lock.release()
+    cohort_store.close()
+    document_store.close()
+    await blockchain_service.cache.backend.close()
+    await blockchain_service.close()
+    # Waits for running renders; keep the loop free meanwhile
+    await run_in_threadpool(pdf_pool.stop)
+
 
 app = FastAPI(
     title="Credential Verification API",
     description="Blockchain-based credential verification system",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
+# Admission control sits inside CORS so rejections still carry CORS headers
+if settings.admission_enabled:
+    app.add_middleware(
+        AdmissionMiddleware,
+        controller=admission,
+        trust_forwarded=settings.rate_limit_trust_forwarded
+    )
+
 # CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -34,9 +314,24 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Initialize blockchain service
-blockchain_service = BlockchainService()
 
+@app.middleware("http")
+async def record_request_metrics(request: Request, call_next):
+    """Count and time every request by its route template"""
+    HTTP_IN_FLIGHT.inc()
+    started = time.perf_counter()
+    status = 500
+    try:
+        with span(f"{request.method} {request.url.path}"):
+            response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        HTTP_IN_FLIGHT.dec()
+        route = request.scope.get("route")
+        route = route.path if route is not None else "unmatched"
+        HTTP_REQUEST_SECONDS.observe(time.perf_counter() - started, method=request.method, route=route)
+        HTTP_REQUESTS.inc(method=request.method, route=route, status=status)
 
 @app.get("/")
 async def root():
@@ -45,13 +340,19 @@ async def root():
         "version": "1.0.0",
         "endpoints": {
             "health": "/health",
+            "ready": "/ready",
             "contract_info": "/api/contract/info",
             "issue_credential": "/api/credentials/issue",
             "verify_credential": "/api/credentials/verify/{credential_id}",
             "get_credential": "/api/credentials/{credential_id}",
+            "signed_document": "/api/credentials/{credential_id}/document",
+            "verify_document": "/api/credentials/verify/document",
+            "credential_status": "/api/credentials/{credential_id}/status",
+            "status_list": "/api/issuers/{issuer_address}/status-list",
             "revoke_credential": "/api/credentials/revoke/{credential_id}",
             "issuer_credentials": "/api/issuers/{issuer_address}/credentials",
-            "recipient_credentials": "/api/recipients/{email}/credentials"
+            "recipient_credentials": "/api/recipients/{email}/credentials",
+            "job_status": "/api/jobs/{job_id}"
         }
     }
 
@@ -61,8 +362,51 @@ async def health_check():
     return {
         "status": "healthy",
         "timestamp": datetime.now().isoformat(),
-        "blockchain_connected": blockchain_service.is_connected()
+        "blockchain_connected": await blockchain_service.is_connected(),
+        "rpc_endpoints": blockchain_service.provider.pool.stats() if blockchain_service.provider else None,
+        "pdf_pool": pdf_pool.stats(),
+        "pdf_cache": pdf_cache.stats() if pdf_cache is not None else None,
+        "qr_cache": qr_service.stats(),
+        "singleflight": blockchain_service.flights.stats(),
+        "admission": admission.stats() if settings.admission_enabled else None,
+        "revocations": revocation_registry.stats() if revocation_registry is not None else None
+    }
+
+
+@app.get("/ready")
+async def readiness_check():
+    """
+    Readiness probe, separate from /health (liveness)
+    Returns 503 until the contract is loaded and an RPC endpoint answers within READY_TIMEOUT.
+    A contract deployed after startup is picked up here.
+    """
+    if blockchain_service.contract is None and blockchain_service.load_contract():
+        print(f"Connected to contract at {blockchain_service.contract_address}")
+        start_contract_tasks()
+
+    try:
+        rpc_reachable = await asyncio.wait_for(blockchain_service.is_connected(), settings.ready_timeout)
+    except asyncio.TimeoutError:
+        rpc_reachable = False
+
+    checks = {
+        "contract_loaded": blockchain_service.contract is not None,
+        "rpc_reachable": rpc_reachable
     }
+    ready = all(checks.values())
+    return JSONResponse(
+        {"status": "ready" if ready else "not_ready", "checks": checks},
+        status_code=200 if ready else 503
+    )
+
+
+@app.get("/metrics")
+async def metrics():
+    """Prometheus metrics"""
+    IN_FLIGHT.set(pdf_pool.pending, kind="pdf_render")
+    IN_FLIGHT.set(len(job_tracker.pending()), kind="transaction")
+    update_cache_ratios()
+    return Response(render_metrics(), media_type="text/plain; version=0.0.4")
 
 
 @app.get("/api/contract/info")
@@ -75,12 +419,14 @@ async def get_contract_info():
     }
 
 
-@app.post("/api/credentials/issue", response_model=CredentialResponse)
+@app.post("/api/credentials/issue", response_model=CredentialResponse, status_code=202)
 async def issue_credential(credential: CredentialCreate):
     """
     Issue a new credential on the blockchain
     Requires the issuer to be authorized
+    Returns once the transaction is broadcast; poll /api/jobs/{job_id} for the outcome
     """
+    limit_issuer(credential.issuer_address)
     try:
         # Generate unique credential ID
         credential_id = generate_credential_id(
@@ -90,7 +436,7 @@ async def issue_credential(credential: CredentialCreate):
         )
         
         # Issue credential on blockchain
-        tx_hash = blockchain_service.issue_credential(
+        submission = await blockchain_service.issue_credential(
             credential_id=credential_id,
             recipient_name=credential.recipient_name,
             recipient_email=credential.recipient_email,
@@ -100,12 +446,19 @@ async def issue_credential(credential: CredentialCreate):
             metadata_uri=credential.metadata_uri or "",
             issuer_address=credential.issuer_address
         )
+        job = job_tracker.track(
+            "issue_credential",
+            submission,
+            {"credential_id": credential_id},
+            on_mined=lambda: credential_issued(credential_id)
+        )
         
         return CredentialResponse(
             credential_id=credential_id,
-            transaction_hash=tx_hash,
-            status="success",
-            message="Credential issued successfully",
+            transaction_hash=job["transaction_hash"],
+            job_id=job["job_id"],
+            status=job["status"],
+            message="Credential submitted",
             issue_date=datetime.now().isoformat()
         )
         
@@ -113,6 +466,137 @@ async def issue_credential(credential: CredentialCreate):
         raise HTTPException(status_code=400, detail=str(e))
 
 
+async def parse_credential_batch(request: Request) -> List[CredentialCreate]:
+    """
+    Read a batch of credentials from a JSON body ({"credentials": [...]}),
+    a text/csv body, or a multipart upload with a `file` field holding CSV.
+    CSV columns use the CredentialCreate field names.
+    """
+    content_type = request.headers.get("content-type", "")
+
+    if content_type.startswith("multipart/form-data"):
+        form = await request.form()
+        upload = form.get("file")
+        if upload is None:
+            raise HTTPException(status_code=400, detail="Missing 'file' field")
+        text = (await upload.read()).decode("utf-8-sig")
+    elif content_type.startswith("text/csv"):
+        text = (await request.body()).decode("utf-8-sig")
+    else:
+        try:
+            return CredentialBatchCreate.model_validate_json(await request.body()).credentials
+        except ValidationError as e:
+            raise HTTPException(status_code=422, detail=e.errors(include_url=False))
+
+    credentials = []
+    for line, row in enumerate(csv.DictReader(io.StringIO(text)), start=2):
+        try:
+            credentials.append(CredentialCreate(**{key: value for key, value in row.items() if value}))
+        except ValidationError as e:
+            raise HTTPException(status_code=422, detail=f"Invalid CSV row {line}: {e.errors(include_url=False)}")
+    return credentials
+
+
+@app.post("/api/credentials/issue/batch", response_model=BatchIssueResponse, status_code=202)
+async def issue_credentials_batch(
+    request: Request,
+    mode: str = Query("pipelined", pattern="^(pipelined|contract)$")
+):
+    """
+    Issue many credentials at once from JSON or CSV
+    mode=pipelined sends one transaction per credential, pipelined per issuer;
+    mode=contract packs them into gas-bounded issueCredentialsBatch calls.
+    Returns once every transaction is broadcast, with a job per transaction; poll /api/jobs/{job_id} for the outcome
+    """
+    credentials = await parse_credential_batch(request)
+    if not credentials:
+        raise HTTPException(status_code=400, detail="No credentials supplied")
+    if len(credentials) > settings.issue_batch_max:
+        raise HTTPException(status_code=400, detail=f"At most {settings.issue_batch_max} credentials per batch")
+    for issuer_address in {credential.issuer_address for credential in credentials}:
+        limit_issuer(issuer_address)
+
+    try:
+        by_issuer: Dict[str, List[Dict]] = {}
+        for index, credential in enumerate(credentials):
+            by_issuer.setdefault(credential.issuer_address, []).append({
+                "credential_id": generate_credential_id(
+                    credential.recipient_email,
+                    credential.credential_type,
+                    credential.issuer_name,
+                    salt=str(index)
+                ),
+                "recipient_name": credential.recipient_name,
+                "recipient_email": credential.recipient_email,
+                "issuer_name": credential.issuer_name,
+                "credential_type": credential.credential_type,
+                "description": credential.description,
+                "metadata_uri": credential.metadata_uri or ""
+            })
+
+        results = []
+        for issuer_address, entries in by_issuer.items():
+            if mode == "contract":
+                outcomes = await blockchain_service.issue_credentials_batch(entries, issuer_address)
+            else:
+                outcomes = await blockchain_service.issue_credentials_bulk(entries, issuer_address)
+
+            # One job per transaction: a contract batch covers several credentials
+            by_transaction: Dict[str, Tuple[Dict, List[Dict]]] = {}
+            for entry, outcome in zip(entries, outcomes):
+                result = {
+                    "credential_id": outcome["credential_id"],
+                    "recipient_email": entry["recipient_email"],
+                    "transaction_hash": None,
+                    "job_id": None,
+                    "status": outcome["status"],
+                    "error": outcome["error"]
+                }
+                submission = outcome["submission"]
+                if submission is not None:
+                    result["transaction_hash"] = submission["transaction_hash"]
+                    by_transaction.setdefault(submission["transaction_hash"], (submission, []))[1].append(result)
+                results.append(result)
+
+            for submission, tx_results in by_transaction.values():
+                credential_ids = [result["credential_id"] for result in tx_results]
+                if len(credential_ids) == 1:
+                    kind, details = "issue_credential", {"credential_id": credential_ids[0]}
+                else:
+                    kind, details = "issue_credentials_batch", {"credential_ids": credential_ids}
+                job = job_tracker.track(
+                    kind, submission, details, on_mined=lambda ids=credential_ids: credentials_issued(ids)
+                )
+                for result in tx_results:
+                    result["job_id"] = job["job_id"]
+
+        return BatchIssueResponse(
+            total=len(results),
+            failed=sum(1 for result in results if result["status"] == "failed"),
+            pending=sum(1 for result in results if result["status"] == "pending"),
+            results=results
+        )
+
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+def verification_fields(verification: Dict) -> Dict:
+    """VerifyCredentialResponse fields for a verifyCredential result"""
+    if not verification["exists"]:
+        return {"exists": False, "is_valid": False, "message": "Credential not found"}
+
+    return {
+        "exists": True,
+        "is_valid": verification["is_valid"],
+        "recipient_name": verification["recipient_name"],
+        "issuer_name": verification["issuer_name"],
+        "credential_type": verification["credential_type"],
+        "issue_date": verification["issue_date"],
+        "message": "Credential verified" if verification["is_valid"] else "Credential has been revoked"
+    }
+
+
 @app.get("/api/credentials/verify/{credential_id}", response_model=VerifyCredentialResponse)
 async def verify_credential(credential_id: str):
     """
@@ -120,25 +604,81 @@ async def verify_credential(credential_id: str):
     Returns credential details if valid
     """
     try:
-        verification = blockchain_service.verify_credential(credential_id)
-        
+        verification = await blockchain_service.verify_credential(credential_id)
         if not verification["exists"]:
-            return VerifyCredentialResponse(
-                exists=False,
-                is_valid=False,
-                message="Credential not found"
-            )
+            document = await run_in_threadpool(cohort_store.get_credential, credential_id)
+            if document is not None:
+                verification = await verify_cohort_document(document)
+        return VerifyCredentialResponse(**verification_fields(verification))
         
-        return VerifyCredentialResponse(
-            exists=True,
-            is_valid=verification["is_valid"],
-            recipient_name=verification["recipient_name"],
-            issuer_name=verification["issuer_name"],
-            credential_type=verification["credential_type"],
-            issue_date=verification["issue_date"],
-            message="Credential verified" if verification["is_valid"] else "Credential has been revoked"
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+async def verify_cohort_document(document: Dict) -> Dict:
+    """
+    Verification dict for a cohort credential document
+    The leaf is recomputed from the payload and the proof checked against the anchored root
+    """
+    credential = document["credential"]
+    result = await blockchain_service.verify_cohort_credential(
+        bytes.fromhex(document["root"][2:]),
+        leaf_hash(credential),
+        [bytes.fromhex(sibling[2:]) for sibling in document["proof"]]
+    )
+    exists = (
+        result["anchored"]
+        and result["included"]
+        and result["issuer"].lower() == credential["issuer"].lower()
+    )
+
+    return {
+        "exists": exists,
+        "is_valid": exists and not result["revoked"],
+        "included": result["included"],
+        "revoked": result["revoked"],
+        "recipient_name": credential["recipientName"],
+        "issuer_name": credential["issuerName"],
+        "credential_type": credential["credentialType"],
+        "issue_date": datetime.fromtimestamp(credential["issueDate"]).isoformat()
+    }
+
+
+@app.post("/api/credentials/verify/batch", response_model=VerifyBatchResponse)
+async def verify_credentials_batch(batch: VerifyBatchRequest):
+    """
+    Verify many credentials at once
+    Cached results are reused and the rest are read in batched RPC calls
+    """
+    if len(batch.credential_ids) > settings.verify_batch_max:
+        raise HTTPException(status_code=400, detail=f"At most {settings.verify_batch_max} credentials per batch")
+
+    try:
+        unique_ids = list(dict.fromkeys(batch.credential_ids))
+        verifications, from_cache = await blockchain_service.verify_credentials_batch(unique_ids)
+        by_id = dict(zip(unique_ids, verifications))
+
+        results = []
+        for credential_id in batch.credential_ids:
+            verification = by_id[credential_id]
+            if verification is None:
+                results.append(VerifyBatchResult(
+                    credential_id=credential_id,
+                    exists=False,
+                    is_valid=False,
+                    message="Verification failed",
+                    error="verifyCredential call failed"
+                ))
+            else:
+                results.append(VerifyBatchResult(credential_id=credential_id, **verification_fields(verification)))
+
+        return VerifyBatchResponse(
+            total=len(results),
+            from_cache=from_cache,
+            from_chain=len(unique_ids) - from_cache,
+            results=results
         )
-        
+
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
@@ -147,7 +687,7 @@ async def verify_credential(credential_id: str):
 async def get_credential(credential_id: str):
     """Get full credential details"""
     try:
-        credential = blockchain_service.get_credential(credential_id)
+        credential = await blockchain_service.get_credential(credential_id)
         
         if not credential or credential["credentialId"] == "":
             raise HTTPException(status_code=404, detail="Credential not found")
@@ -162,7 +702,8 @@ async def get_credential(credential_id: str):
             "issue_date": datetime.fromtimestamp(credential["issueDate"]).isoformat(),
             "issuer_address": credential["issuer"],
             "is_valid": credential["isValid"],
-            "metadata_uri": credential["metadataURI"]
+            "metadata_uri": credential["metadataURI"],
+            "credential_status": status_list_entry(credential_id)
         }
         
     except HTTPException:
@@ -171,146 +712,553 @@ async def get_credential(credential_id: str):
         raise HTTPException(status_code=400, detail=str(e))
 
 
-@app.post("/api/credentials/revoke/{credential_id}")
+@app.get("/api/credentials/{credential_id}/document", response_model=SignedCredentialDocument)
+async def get_signed_document(credential_id: str):
+    """
+    Get a signed credential document: the credential fields with an EIP-712 signature by its issuer
+    Holders can have it checked offline by POST /api/credentials/verify/document or app.signed_documents
+    Documents are signed when the backend's key issues a credential; other issuers upload theirs with PUT
+    """
+    try:
+        credential = await blockchain_service.get_credential(credential_id)
+        if not credential or credential["credentialId"] == "":
+            raise HTTPException(status_code=404, detail="Credential not found")
+
+        document = await run_in_threadpool(document_store.get, credential_id)
+        if document is None:
+            document = await sign_and_store_document(credential_id)
+        if document is None:
+            raise HTTPException(
+                status_code=404,
+                detail="No signed document for this credential; its issuer can upload one with PUT"
+            )
+        return dict(document, credential_status=status_list_entry(credential_id))
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@app.put("/api/credentials/{credential_id}/document", response_model=SignedCredentialDocument)
+async def put_signed_document(credential_id: str, document: SignedCredentialDocument):
+    """
+    Upload a signed document for a credential whose issuer signs with its own key
+    The fields must match the credential on chain and the signature must recover to its issuer
+    """
+    limit_issuer(str(document.credential.get("issuer", "")))
+    try:
+        credential = await blockchain_service.get_credential(credential_id)
+        if not credential or credential["credentialId"] == "":
+            raise HTTPException(status_code=404, detail="Credential not found")
+
+        document = {"credential": document.credential, "domain": document.domain, "signature": document.signature}
+        try:
+            reason = await run_in_threadpool(
+                document_mismatch, document, credential, settings.chain_id, blockchain_service.contract_address
+            )
+        except (KeyError, TypeError, AttributeError):
+            reason = "Malformed document"
+        if reason is not None:
+            raise HTTPException(status_code=400, detail=reason)
+
+        await run_in_threadpool(document_store.put, credential_id, document)
+        return dict(document, credential_status=status_list_entry(credential_id))
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@app.post("/api/credentials/verify/document", response_model=SignedDocumentVerifyResponse)
+async def verify_signed_document(document: SignedCredentialDocument):
+    """
+    Verify a signed credential document without an RPC call
+    The signature is checked locally and revocation read from the replayed revocation state
+    """
+    verifier = get_document_verifier()
+    if verifier is None:
+        raise HTTPException(status_code=503, detail="Revocation state is not loaded yet")
+
+    try:
+        result = await run_in_threadpool(verifier.verify, document.model_dump())
+        credential = document.credential
+        return SignedDocumentVerifyResponse(
+            credential_id=credential.get("credentialId", ""),
+            exists=result["signature_valid"],
+            is_valid=result["is_valid"],
+            recipient_name=credential.get("recipientName"),
+            issuer_name=credential.get("issuerName"),
+            credential_type=credential.get("credentialType"),
+            issue_date=datetime.fromtimestamp(credential["issueDate"]).isoformat() if result["signature_valid"] else None,
+            message="Credential verified" if result["is_valid"] else result["reason"],
+            signature_valid=result["signature_valid"],
+            issuer_authorized=result["issuer_authorized"],
+            revoked=result["revoked"],
+            signer=result["signer"],
+            revocations_synced_block=revocation_registry.synced_block
+        )
+
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@app.get("/api/credentials/{credential_id}/status", response_model=CredentialStatusResponse)
+async def get_credential_status(credential_id: str):
+    """
+    Get where a credential's revocation bit lives: its issuer's status list and its index there
+    Verifiers keep the index and check the bit in the downloaded list
+    """
+    if not revocations_ready():
+        raise HTTPException(status_code=503, detail="Revocation state is not loaded yet")
+
+    entry = revocation_registry.status_entry(credential_key(credential_id))
+    if entry is None:
+        raise HTTPException(status_code=404, detail="Credential not found")
+
+    issuer, index = entry
+    issuer = Web3.to_checksum_address(issuer)
+    return CredentialStatusResponse(
+        credential_id=credential_id,
+        issuer=issuer,
+        status_list_index=index,
+        status_list_url=f"/api/issuers/{issuer}/status-list",
+        revoked=revocation_registry.is_revoked(credential_key(credential_id))
+    )
+
+
+@app.post("/api/credentials/revoke/{credential_id}", status_code=202)
 async def revoke_credential(credential_id: str, issuer_address: str):
     """
     Revoke a credential
     Only the original issuer can revoke
+    Returns once the transaction is broadcast; poll /api/jobs/{job_id} for the outcome
     """
+    limit_issuer(issuer_address)
     try:
-        tx_hash = blockchain_service.revoke_credential(credential_id, issuer_address)
+        submission = await blockchain_service.revoke_credential(credential_id, issuer_address)
+        job = job_tracker.track(
+            "revoke_credential",
+            submission,
+            {"credential_id": credential_id},
+            on_mined=lambda: credential_revoked(credential_id)
+        )
         
         return {
-            "status": "success",
-            "message": "Credential revoked successfully",
+            "status": job["status"],
+            "message": "Revocation submitted",
             "credential_id": credential_id,
-            "transaction_hash": tx_hash
+            "transaction_hash": job["transaction_hash"],
+            "job_id": job["job_id"]
         }
         
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
 
-@app.post("/api/issuers/authorize")
+@app.post("/api/issuers/authorize", status_code=202)
 async def authorize_issuer(auth: IssuerAuthorization):
     """
     Authorize a new issuer
     Only contract owner can do this
+    Returns once the transaction is broadcast; poll /api/jobs/{job_id} for the outcome
     """
     try:
-        tx_hash = blockchain_service.authorize_issuer(
+        submission = await blockchain_service.authorize_issuer(
             auth.issuer_address,
             auth.owner_address
         )
+        job = job_tracker.track("authorize_issuer", submission, {"issuer_address": auth.issuer_address})
         
         return {
-            "status": "success",
-            "message": "Issuer authorized successfully",
+            "status": job["status"],
+            "message": "Issuer authorization submitted",
             "issuer_address": auth.issuer_address,
-            "transaction_hash": tx_hash
+            "transaction_hash": job["transaction_hash"],
+            "job_id": job["job_id"]
         }
         
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
 
+@app.get("/api/jobs/{job_id}", response_model=JobStatusResponse)
+async def get_job_status(job_id: str):
+    """
+    Get the status of a submitted transaction
+    Status is pending, mined, failed or replaced
+    """
+    job = await job_tracker.lookup(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    return JobStatusResponse(
+        job_id=job["job_id"],
+        kind=job["kind"],
+        status=job["status"],
+        transaction_hash=job["transaction_hash"],
+        previous_hashes=job["previous_hashes"],
+        block_number=job["block_number"],
+        error=job["error"],
+        details=job["details"],
+        created_at=datetime.fromtimestamp(job["created_at"]).isoformat(),
+        updated_at=datetime.fromtimestamp(job["updated_at"]).isoformat()
+    )
+
+
+@app.post("/api/cohorts/issue", response_model=CohortIssueResponse, status_code=202)
+async def issue_cohort(cohort: CohortCreate):
+    """
+    Issue a cohort of credentials by anchoring the Merkle root of their hashes
+    One transaction regardless of cohort size; each recipient gets an inclusion proof
+    Returns once the transaction is broadcast; poll /api/jobs/{job_id} for the outcome
+    """
+    if not cohort.credentials:
+        raise HTTPException(status_code=400, detail="No credentials supplied")
+    if len(cohort.credentials) > settings.cohort_max_size:
+        raise HTTPException(status_code=400, detail=f"At most {settings.cohort_max_size} credentials per cohort")
+    if len({credential.issuer_address.lower() for credential in cohort.credentials}) > 1:
+        raise HTTPException(status_code=400, detail="A cohort must have a single issuer")
+    limit_issuer(cohort.credentials[0].issuer_address)
+
+    try:
+        issuer_address = Web3.to_checksum_address(cohort.credentials[0].issuer_address)
+        issue_date = int(datetime.now().timestamp())
+        documents = [
+            {
+                "credentialId": generate_credential_id(
+                    credential.recipient_email,
+                    credential.credential_type,
+                    credential.issuer_name,
+                    salt=str(index)
+                ),
+                "recipientName": credential.recipient_name,
+                "recipientEmail": credential.recipient_email,
+                "issuerName": credential.issuer_name,
+                "credentialType": credential.credential_type,
+                "description": credential.description,
+                "issueDate": issue_date,
+                "issuer": issuer_address,
+                "metadataURI": credential.metadata_uri or ""
+            }
+            for index, credential in enumerate(cohort.credentials)
+        ]
+        root, entries = await run_in_threadpool(build_cohort, documents)
+        root_hex = "0x" + root.hex()
+
+        submission = await blockchain_service.anchor_cohort(
+            root, len(entries), cohort.metadata_uri or "", issuer_address
+        )
+        await run_in_threadpool(
+            cohort_store.add_cohort,
+            root_hex,
+            issuer_address,
+            cohort.metadata_uri or "",
+            submission["transaction_hash"],
+            issue_date,
+            entries
+        )
+        job = job_tracker.track("anchor_cohort", submission, {"root": root_hex, "size": len(entries)})
+
+        return CohortIssueResponse(
+            root=root_hex,
+            size=len(entries),
+            transaction_hash=job["transaction_hash"],
+            job_id=job["job_id"],
+            status=job["status"],
+            credentials=[
+                {
+                    "credential_id": entry["credential"]["credentialId"],
+                    "recipient_email": entry["credential"]["recipientEmail"],
+                    "leaf": entry["leaf"],
+                    "proof": entry["proof"]
+                }
+                for entry in entries
+            ]
+        )
+
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@app.get("/api/cohorts/credentials/{credential_id}", response_model=CohortCredentialDocument)
+async def get_cohort_credential(credential_id: str):
+    """
+    Get a cohort credential document: its payload, root and inclusion proof
+    """
+    document = await run_in_threadpool(cohort_store.get_credential, credential_id)
+    if document is None:
+        raise HTTPException(status_code=404, detail="Cohort credential not found")
+    return CohortCredentialDocument(**document)
+
+
+@app.post("/api/cohorts/verify", response_model=CohortVerifyResponse)
+async def verify_cohort_credential(document: CohortCredentialDocument):
+    """
+    Verify a cohort credential document held by its recipient
+    Needs no server-side record: the leaf is recomputed from the payload
+    """
+    try:
+        verification = await verify_cohort_document(document.model_dump())
+        fields = verification_fields(verification)
+        if verification["included"] and not verification["exists"]:
+            fields["message"] = "Credential issuer does not match the cohort issuer"
+
+        return CohortVerifyResponse(
+            credential_id=document.credential.get("credentialId", ""),
+            root=document.root,
+            included=verification["included"],
+            revoked=verification["revoked"],
+            **fields
+        )
+
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@app.post("/api/cohorts/revoke/{credential_id}", status_code=202)
+async def revoke_cohort_credential(credential_id: str, issuer_address: str):
+    """
+    Revoke one credential of a cohort
+    Only the cohort's issuer can revoke
+    Returns once the transaction is broadcast; poll /api/jobs/{job_id} for the outcome
+    """
+    limit_issuer(issuer_address)
+    document = await run_in_threadpool(cohort_store.get_credential, credential_id)
+    if document is None:
+        raise HTTPException(status_code=404, detail="Cohort credential not found")
+
+    try:
+        submission = await blockchain_service.revoke_cohort_leaf(
+            bytes.fromhex(document["root"][2:]),
+            bytes.fromhex(document["leaf"][2:]),
+            issuer_address
+        )
+        job = job_tracker.track(
+            "revoke_cohort_credential",
+            submission,
+            {"credential_id": credential_id, "root": document["root"]}
+        )
+
+        return {
+            "status": job["status"],
+            "message": "Revocation submitted",
+            "credential_id": credential_id,
+            "transaction_hash": job["transaction_hash"],
+            "job_id": job["job_id"]
+        }
+
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+def issuer_listing_item(cred: Dict) -> Dict:
+    return {
+        "credential_id": cred["credentialId"],
+        "recipient_name": cred["recipientName"],
+        "recipient_email": cred["recipientEmail"],
+        "credential_type": cred["credentialType"],
+        "issue_date": datetime.fromtimestamp(cred["issueDate"]).isoformat(),
+        "is_valid": cred["isValid"]
+    }
+
+
+def recipient_listing_item(cred: Dict) -> Dict:
+    return {
+        "credential_id": cred["credentialId"],
+        "issuer_name": cred["issuerName"],
+        "credential_type": cred["credentialType"],
+        "description": cred["description"],
+        "issue_date": datetime.fromtimestamp(cred["issueDate"]).isoformat(),
+        "is_valid": cred["isValid"]
+    }
+
+
+def listing_filters(
+    credential_type: Optional[str],
+    is_valid: Optional[bool],
+    issued_after: Optional[datetime],
+    issued_before: Optional[datetime]
+) -> Dict:
+    """Normalize listing query parameters; issue dates are compared as unix timestamps"""
+    return {
+        "credential_type": credential_type,
+        "is_valid": is_valid,
+        "issued_after": int(issued_after.timestamp()) if issued_after else None,
+        "issued_before": int(issued_before.timestamp()) if issued_before else None
+    }
+
+
+async def list_credentials(owner: Dict, filters: Dict, limit: Optional[int], cursor: Optional[str], to_item) -> Tuple[List[Dict], Optional[str], int]:
+    """
+    Collect one page of a listing; without a limit the whole listing is returned.
+    The total is the number of matching credentials across all pages when the
+    index is in use, and the number returned otherwise.
+    """
+    credentials = []
+    next_cursor = None
+    index_store = credential_indexer.store if index_ready() else None
+
+    async for cred, position in iter_credentials(
+        blockchain_service, index_store, owner, filters, cursor, settings.rpc_batch_size
+    ):
+        credentials.append(to_item(cred))
+        if limit is not None and len(credentials) >= limit:
+            next_cursor = position
+            break
+
+    total = len(credentials)
+    if index_store is not None:
+        total = await run_in_threadpool(index_store.count_credentials, **owner, **filters)
+    return credentials, next_cursor, total
+
+
+def stream_credentials(owner: Dict, filters: Dict, cursor: Optional[str], to_item) -> StreamingResponse:
+    """Stream a listing as NDJSON, one credential per line as soon as it is resolved"""
+    if cursor:
+        decode_cursor(cursor)
+    index_store = credential_indexer.store if index_ready() else None
+
+    async def lines():
+        async for cred, _ in iter_credentials(
+            blockchain_service, index_store, owner, filters, cursor, settings.rpc_batch_size
+        ):
+            yield json.dumps(to_item(cred)) + "\n"
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+
 @app.get("/api/issuers/{issuer_address}/credentials")
-async def get_issuer_credentials(issuer_address: str):
-    """Get all credentials issued by a specific issuer"""
+async def get_issuer_credentials(
+    issuer_address: str,
+    limit: Optional[int] = Query(None, ge=1, le=settings.listing_max_limit),
+    cursor: Optional[str] = None,
+    credential_type: Optional[str] = None,
+    is_valid: Optional[bool] = None,
+    issued_after: Optional[datetime] = None,
+    issued_before: Optional[datetime] = None
+):
+    """
+    Get credentials issued by a specific issuer
+    Pass `limit` to paginate; follow `next_cursor` for the next page
+    """
     try:
-        credential_ids = blockchain_service.get_issuer_credentials(issuer_address)
-        
-        credentials = []
-        for cred_id in credential_ids:
-            try:
-                cred = blockchain_service.get_credential(cred_id)
-                if cred and cred["credentialId"] != "":
-                    credentials.append({
-                        "credential_id": cred["credentialId"],
-                        "recipient_name": cred["recipientName"],
-                        "recipient_email": cred["recipientEmail"],
-                        "credential_type": cred["credentialType"],
-                        "issue_date": datetime.fromtimestamp(cred["issueDate"]).isoformat(),
-                        "is_valid": cred["isValid"]
-                    })
-            except:
-                continue
+        credentials, next_cursor, total = await list_credentials(
+            {"issuer": issuer_address},
+            listing_filters(credential_type, is_valid, issued_after, issued_before),
+            limit,
+            cursor,
+            issuer_listing_item
+        )
         
         return {
             "issuer_address": issuer_address,
             "credentials": credentials,
-            "total": len(credentials)
+            "total": total,
+            "next_cursor": next_cursor
         }
         
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
 
-@app.get("/api/recipients/{email}/credentials")
-async def get_recipient_credentials(email: str):
-    """Get all credentials for a specific recipient"""
+@app.get("/api/issuers/{issuer_address}/credentials/stream")
+async def stream_issuer_credentials(
+    issuer_address: str,
+    cursor: Optional[str] = None,
+    credential_type: Optional[str] = None,
+    is_valid: Optional[bool] = None,
+    issued_after: Optional[datetime] = None,
+    issued_before: Optional[datetime] = None
+):
+    """Stream credentials issued by a specific issuer as NDJSON"""
     try:
-        credential_ids = blockchain_service.get_recipient_credentials(email)
+        return stream_credentials(
+            {"issuer": issuer_address},
+            listing_filters(credential_type, is_valid, issued_after, issued_before),
+            cursor,
+            issuer_listing_item
+        )
         
-        credentials = []
-        for cred_id in credential_ids:
-            try:
-                cred = blockchain_service.get_credential(cred_id)
-                if cred and cred["credentialId"] != "":
-                    credentials.append({
-                        "credential_id": cred["credentialId"],
-                        "issuer_name": cred["issuerName"],
-                        "credential_type": cred["credentialType"],
-                        "description": cred["description"],
-                        "issue_date": datetime.fromtimestamp(cred["issueDate"]).isoformat(),
-                        "is_valid": cred["isValid"]
-                    })
-            except:
-                continue
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@app.get("/api/recipients/{email}/credentials")
+async def get_recipient_credentials(
+    email: str,
+    limit: Optional[int] = Query(None, ge=1, le=settings.listing_max_limit),
+    cursor: Optional[str] = None,
+    credential_type: Optional[str] = None,
+    is_valid: Optional[bool] = None,
+    issued_after: Optional[datetime] = None,
+    issued_before: Optional[datetime] = None
+):
+    """
+    Get credentials for a specific recipient
+    Pass `limit` to paginate; follow `next_cursor` for the next page
+    """
+    try:
+        credentials, next_cursor, total = await list_credentials(
+            {"recipient_email": email},
+            listing_filters(credential_type, is_valid, issued_after, issued_before),
+            limit,
+            cursor,
+            recipient_listing_item
+        )
         
         return {
             "recipient_email": email,
             "credentials": credentials,
-            "total": len(credentials)
+            "total": total,
+            "next_cursor": next_cursor
         }
         
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
 
+@app.get("/api/recipients/{email}/credentials/stream")
+async def stream_recipient_credentials(
+    email: str,
+    cursor: Optional[str] = None,
+    credential_type: Optional[str] = None,
+    is_valid: Optional[bool] = None,
+    issued_after: Optional[datetime] = None,
+    issued_before: Optional[datetime] = None
+):
+    """Stream credentials for a specific recipient as NDJSON"""
+    try:
+        return stream_credentials(
+            {"recipient_email": email},
+            listing_filters(credential_type, is_valid, issued_after, issued_before),
+            cursor,
+            recipient_listing_item
+        )
+        
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
 @app.get("/api/credentials/{credential_id}/qr", response_model=QRCodeResponse)
-async def generate_qr_code(credential_id: str):
-    """Generate QR code for credential verification"""
+async def generate_qr_code(credential_id: str, format: str = Query("png", pattern="^(png|svg)$")):
+    """Generate QR code for credential verification, as a PNG or SVG data URI"""
     try:
         # Verify credential exists
-        verification = blockchain_service.verify_credential(credential_id)
+        with stage("verify"):
+            verification = await blockchain_service.verify_credential(credential_id)
         if not verification["exists"]:
             raise HTTPException(status_code=404, detail="Credential not found")
         
-        # Generate verification URL
-        verification_url = f"{settings.frontend_url}/verify/{credential_id}"
-        
-        # Create QR code
-        qr = qrcode.QRCode(
-            version=1,
-            error_correction=qrcode.constants.ERROR_CORRECT_L,
-            box_size=10,
-            border=4,
-        )
-        qr.add_data(verification_url)
-        qr.make(fit=True)
-        
-        img = qr.make_image(fill_color="black", back_color="white")
-        
-        # Convert to base64
-        buffer = io.BytesIO()
-        img.save(buffer, format="PNG")
-        img_str = base64.b64encode(buffer.getvalue()).decode()
+        with stage("qr"):
+            image = qr_service.render(credential_id, format)
+        media_type = "image/svg+xml" if format == "svg" else "image/png"
         
         return QRCodeResponse(
             credential_id=credential_id,
-            qr_code=f"data:image/png;base64,{img_str}",
-            verification_url=verification_url
+            qr_code=f"data:{media_type};base64,{base64.b64encode(image).decode()}",
+            verification_url=qr_service.verification_url(credential_id)
         )
         
     except HTTPException:
@@ -319,11 +1267,38 @@ async def generate_qr_code(credential_id: str):
         raise HTTPException(status_code=400, detail=str(e))
 
 
+@app.get("/api/issuers/{issuer_address}/status-list")
+async def get_status_list(issuer_address: str, request: Request):
+    """
+    Get an issuer's revocation status list as a gzip-compressed bitstring
+    Bit N, counting from the most significant bit of the first byte, is set once the
+    credential with status index N is revoked. Served with an ETag for conditional requests.
+    """
+    if not revocations_ready():
+        raise HTTPException(status_code=503, detail="Revocation state is not loaded yet")
+    if not Web3.is_address(issuer_address):
+        raise HTTPException(status_code=400, detail="Invalid issuer address")
+
+    status_list = await run_in_threadpool(revocation_registry.status_list, issuer_address)
+    if status_list is None:
+        raise HTTPException(status_code=404, detail="Issuer has no credentials")
+
+    headers = {
+        "ETag": f'"{issuer_address.lower()}-{status_list.version}"',
+        "Cache-Control": f"public, max-age={settings.status_list_max_age}",
+        "X-Status-List-Size": str(status_list.size),
+        "X-Synced-Block": str(revocation_registry.synced_block)
+    }
+    if request.headers.get("if-none-match") == headers["ETag"]:
+        return Response(status_code=304, headers=headers)
+    return Response(status_list.compressed(), media_type="application/gzip", headers=headers)
+
+
 @app.get("/api/issuers/{issuer_address}/authorized")
 async def check_issuer_authorization(issuer_address: str):
     """Check if an address is an authorized issuer"""
     try:
-        is_authorized = blockchain_service.is_authorized_issuer(issuer_address)
+        is_authorized = await blockchain_service.is_authorized_issuer(issuer_address)
         
         return {
             "issuer_address": issuer_address,
@@ -334,75 +1309,174 @@ async def check_issuer_authorization(issuer_address: str):
         raise HTTPException(status_code=400, detail=str(e))
 
 
+def byte_range(range_header: Optional[str], size: int) -> Optional[Tuple[int, int]]:
+    """
+    Parse a single `bytes=` range into inclusive (start, end).
+    Returns None for a missing, malformed or multi-part range, which is served in full.
+    """
+    if not range_header or not range_header.startswith("bytes=") or "," in range_header:
+        return None
+    start, _, end = range_header[len("bytes="):].strip().partition("-")
+    try:
+        if start == "":
+            length = int(end)
+            if length <= 0:
+                return None
+            return max(size - length, 0), size - 1
+        first = int(start)
+        last = min(int(end), size - 1) if end else size - 1
+    except ValueError:
+        return None
+    if first > last:
+        raise HTTPException(status_code=416, headers={"Content-Range": f"bytes */{size}"})
+    return first, last
+
+
+def pdf_response(request: Request, pdf: bytes, etag: str, filename: str) -> Response:
+    """Serve PDF bytes with an ETag and single-range support"""
+    headers = {
+        'Content-Disposition': f'attachment; filename="{filename}"',
+        'ETag': etag,
+        'Accept-Ranges': 'bytes'
+    }
+
+    requested = byte_range(request.headers.get("range"), len(pdf))
+    if requested is None or request.headers.get("if-range", etag) != etag:
+        return Response(pdf, media_type="application/pdf", headers=headers)
+
+    first, last = requested
+    headers['Content-Range'] = f"bytes {first}-{last}/{len(pdf)}"
+    return Response(pdf[first:last + 1], status_code=206, media_type="application/pdf", headers=headers)
+
+
+async def certificate_pdf(credential: Dict, digest: str) -> bytes:
+    """Certificate PDF for a resolved credential, from the disk cache or rendered in the worker pool"""
+    credential_id = credential["credentialId"]
+    if pdf_cache is not None:
+        with stage("pdf_cache"):
+            pdf = await run_in_threadpool(pdf_cache.get, credential_id, digest)
+        if pdf is not None:
+            return pdf
+    
+    # Render in the worker pool with the memoized SVG QR code
+    with stage("qr"):
+        qr_svg = qr_service.render(credential_id, "svg")
+    with stage("pdf_render"):
+        pdf = await pdf_pool.render({
+            "recipientName": credential["recipientName"],
+            "recipientEmail": credential["recipientEmail"],
+            "credentialType": credential["credentialType"],
+            "description": credential["description"],
+            "issuerName": credential["issuerName"],
+            "issuer": credential["issuer"],
+            "issueDate": credential["issueDate"],
+            "credentialId": credential_id
+        }, qr_service.verification_url(credential_id), qr_svg)
+
+    if pdf_cache is not None:
+        await run_in_threadpool(pdf_cache.put, credential_id, digest, pdf)
+    return pdf
+
+
 @app.get("/api/credentials/{credential_id}/pdf")
-async def download_credential_pdf(credential_id: str):
-    """Generate and download PDF for a credential"""
+async def download_credential_pdf(credential_id: str, request: Request):
+    """
+    Generate and download PDF for a credential
+    Rendered PDFs are cached on disk by content; repeat downloads are served
+    from the cache and honour If-None-Match and Range
+    """
     try:
-        from fastapi.responses import StreamingResponse
-        import tempfile
-        import os
-        
-        # Verify credential exists
-        verification = blockchain_service.verify_credential(credential_id)
-        if not verification["exists"] or not verification["is_valid"]:
+        # One read resolves the credential; getCredential carries its validity too
+        with stage("credential"):
+            credential = await blockchain_service.get_credential(credential_id)
+        if not credential or credential["credentialId"] == "" or not credential["isValid"]:
              raise HTTPException(status_code=404, detail="Credential not found or invalid")
-
-        # Get full details
-        credential = blockchain_service.get_credential(credential_id)
         
         # Generate verification URL
-        verification_url = f"{settings.frontend_url}/verify/{credential_id}"
-        
-        # Generate QR code and save to temporary file
-        qr = qrcode.QRCode(
-            version=1,
-            error_correction=qrcode.constants.ERROR_CORRECT_L,
-            box_size=10,
-            border=4,
-        )
-        qr.add_data(verification_url)
-        qr.make(fit=True)
-        qr_img = qr.make_image(fill_color="black", back_color="white")
-        
-        # Create temporary file for QR code
-        with tempfile.NamedTemporaryFile(mode='wb', suffix='.png', delete=False) as qr_temp:
-            qr_img.save(qr_temp, format='PNG')
-            qr_temp_path = qr_temp.name
-        
-        try:
-            # Generate PDF with QR code file path
-            pdf_buffer = create_certificate_pdf({
-                "recipientName": credential["recipientName"],
-                "recipientEmail": credential["recipientEmail"],
-                "credentialType": credential["credentialType"],
-                "description": credential["description"],
-                "issuerName": credential["issuerName"],
-                "issuer": credential["issuer"],
-                "issueDate": credential["issueDate"], 
-                "credentialId": credential["credentialId"]
-            }, verification_url, qr_temp_path)
-        finally:
-            # Clean up temporary QR code file
-            if os.path.exists(qr_temp_path):
-                os.unlink(qr_temp_path)
-        
-        headers = {
-            'Content-Disposition': f'attachment; filename="credential-{credential_id}.pdf"'
-        }
-        
-        return StreamingResponse(pdf_buffer, media_type="application/pdf", headers=headers)
+        verification_url = qr_service.verification_url(credential_id)
+
+        digest = pdf_digest(credential, verification_url)
+        etag = f'"{digest}"'
+        filename = f"credential-{credential_id}.pdf"
+        if etag in [tag.strip() for tag in request.headers.get("if-none-match", "").split(",")]:
+            return Response(status_code=304, headers={'ETag': etag})
+
+        pdf = await certificate_pdf(credential, digest)
+        return pdf_response(request, pdf, etag, filename)
 
     except HTTPException:
         raise
+    except RenderQueueFull as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "1"})
     except Exception as e:
         print(f"Error generating PDF: {e}")
         raise HTTPException(status_code=400, detail=str(e))
 
 
-def generate_credential_id(email: str, credential_type: str, issuer: str) -> str:
+async def export_pdf(credential_id: str, credential: Optional[Dict]) -> bytes:
+    """Render one ZIP export entry, waiting for room in the render pool instead of failing"""
+    if not credential or credential["credentialId"] == "" or not credential["isValid"]:
+        raise Exception("Credential not found or invalid")
+
+    digest = pdf_digest(credential, qr_service.verification_url(credential_id))
+    while True:
+        try:
+            return await certificate_pdf(credential, digest)
+        except RenderQueueFull:
+            await asyncio.sleep(0.2)
+
+
+async def resolve_export_ids(credential_ids: List[str]):
+    """Resolve explicitly requested credentials in batches, yielding (id, credential or None)"""
+    for chunk in chunked(credential_ids, settings.rpc_batch_size):
+        for credential_id, cred in zip(chunk, await blockchain_service.get_credentials_batch(chunk)):
+            yield credential_id, cred
+
+
+async def resolve_export_issuer(issuer_address: str):
+    """Resolve every valid credential of an issuer, yielding (id, credential)"""
+    index_store = credential_indexer.store if index_ready() else None
+    async for cred, _ in iter_credentials(
+        blockchain_service,
+        index_store,
+        {"issuer": issuer_address},
+        listing_filters(None, True, None, None),
+        None,
+        settings.rpc_batch_size
+    ):
+        yield cred["credentialId"], cred
+
+
+@app.post("/api/credentials/pdf/export")
+async def export_credential_pdfs(export: PdfExportRequest):
+    """
+    Download certificates as a ZIP, for every valid credential of an issuer
+    or for a list of credential IDs
+    PDFs are rendered in parallel and streamed into the archive as they finish
+    """
+    if (export.issuer_address is None) == (export.credential_ids is None):
+        raise HTTPException(status_code=400, detail="Provide either issuer_address or credential_ids")
+
+    if export.credential_ids is not None:
+        if len(export.credential_ids) > settings.pdf_export_max_ids:
+            raise HTTPException(status_code=400, detail=f"At most {settings.pdf_export_max_ids} credentials per export")
+        credentials = resolve_export_ids(list(dict.fromkeys(export.credential_ids)))
+        filename = "credentials.zip"
+    else:
+        credentials = resolve_export_issuer(export.issuer_address)
+        filename = f"credentials-{export.issuer_address}.zip"
+
+    return StreamingResponse(
+        zip_certificates(credentials, export_pdf, settings.pdf_export_concurrency),
+        media_type="application/zip",
+        headers={'Content-Disposition': f'attachment; filename="{filename}"'}
+    )
+
+
+def generate_credential_id(email: str, credential_type: str, issuer: str, salt: str = "") -> str:
     """Generate a unique credential ID"""
     timestamp = datetime.now().isoformat()
-    data = f"{email}{credential_type}{issuer}{timestamp}"
+    data = f"{email}{credential_type}{issuer}{timestamp}{salt}"
     return hashlib.sha256(data.encode()).hexdigest()[:32]
 
 
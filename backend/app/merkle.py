@@ -0,0 +1,85 @@
+from typing import Dict, List, Tuple
+import json
+
+from web3 import Web3
+
+
+# Credential fields committed to by a cohort leaf
+LEAF_FIELDS = (
+    "credentialId",
+    "recipientName",
+    "recipientEmail",
+    "issuerName",
+    "credentialType",
+    "description",
+    "issueDate",
+    "issuer",
+    "metadataURI",
+)
+
+
+def leaf_hash(credential: Dict) -> bytes:
+    """
+    Leaf of a cohort credential: keccak256 of keccak256 of its canonical JSON.
+    Hashing twice keeps leaves distinct from the 64-byte inner nodes.
+    """
+    payload = json.dumps(
+        {field: credential[field] for field in LEAF_FIELDS},
+        sort_keys=True,
+        separators=(",", ":"),
+        ensure_ascii=False
+    )
+    return bytes(Web3.keccak(Web3.keccak(text=payload)))
+
+
+def hash_pair(a: bytes, b: bytes) -> bytes:
+    """Inner node over two children in sorted order, as verifyCohortCredential computes it"""
+    return bytes(Web3.keccak(a + b if a < b else b + a))
+
+
+def build_tree(leaves: List[bytes]) -> List[List[bytes]]:
+    """All tree levels from the leaves up to the root; an unpaired node moves up unchanged"""
+    if not leaves:
+        raise ValueError("A cohort needs at least one credential")
+
+    levels = [list(leaves)]
+    while len(levels[-1]) > 1:
+        level = levels[-1]
+        parents = [hash_pair(level[i], level[i + 1]) for i in range(0, len(level) - 1, 2)]
+        if len(level) % 2:
+            parents.append(level[-1])
+        levels.append(parents)
+    return levels
+
+
+def merkle_proof(levels: List[List[bytes]], index: int) -> List[bytes]:
+    """Sibling hashes from leaf `index` up to the root"""
+    proof = []
+    for level in levels[:-1]:
+        sibling = index ^ 1
+        if sibling < len(level):
+            proof.append(level[sibling])
+        index //= 2
+    return proof
+
+
+def verify_proof(leaf: bytes, proof: List[bytes], root: bytes) -> bool:
+    computed = leaf
+    for sibling in proof:
+        computed = hash_pair(computed, sibling)
+    return computed == root
+
+
+def build_cohort(credentials: List[Dict]) -> Tuple[bytes, List[Dict]]:
+    """Merkle root of a cohort and, per credential, its leaf and proof as hex strings"""
+    leaves = [leaf_hash(credential) for credential in credentials]
+    levels = build_tree(leaves)
+    entries = [
+        {
+            "credential": credential,
+            "leaf": "0x" + leaf.hex(),
+            "proof": ["0x" + sibling.hex() for sibling in merkle_proof(levels, index)]
+        }
+        for index, (credential, leaf) in enumerate(zip(credentials, leaves))
+    ]
+    return levels[-1][0], entries
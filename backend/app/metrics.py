@@ -0,0 +1,215 @@
+from contextlib import contextmanager
+from typing import Dict, List, Tuple
+import threading
+import time
+
+
+# Request and RPC latency buckets, in seconds
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# Transaction submit-to-receipt buckets, in seconds
+CONFIRMATION_BUCKETS = (0.5, 1.0, 2.0, 5.0, 10.0, 15.0, 30.0, 60.0, 120.0, 300.0, 600.0)
+
+REGISTRY: List["Metric"] = []
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Tuple[str, ...], values: Tuple, extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+class Metric:
+    """Base of the Prometheus-style metrics below; each registers itself in REGISTRY"""
+
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Tuple[str, ...] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Tuple, object] = {}
+        self._lock = threading.Lock()
+        REGISTRY.append(self)
+
+    def _key(self, labels: Dict) -> Tuple:
+        return tuple(str(labels.get(name, "")) for name in self.labelnames)
+
+    def samples(self) -> List[str]:
+        raise NotImplementedError
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        lines.extend(self.samples())
+        return "\n".join(lines)
+
+
+class Counter(Metric):
+    kind = "counter"
+
+    def inc(self, amount: float = 1.0, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels) -> float:
+        with self._lock:
+            return self._values.get(self._key(labels), 0.0)
+
+    def label_values(self) -> List[Tuple]:
+        with self._lock:
+            return list(self._values)
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return [f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}" for key, value in items]
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def set(self, value: float, **labels):
+        with self._lock:
+            self._values[self._key(labels)] = value
+
+    def dec(self, amount: float = 1.0, **labels):
+        self.inc(-amount, **labels)
+
+
+class Histogram(Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Tuple[str, ...] = (), buckets=LATENCY_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = {"counts": [0] * len(self.buckets), "sum": 0.0, "count": 0}
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state["counts"][i] += 1
+                    break
+            state["sum"] += value
+            state["count"] += 1
+
+    @contextmanager
+    def time(self, **labels):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            items = sorted((key, dict(state, counts=list(state["counts"]))) for key, state in self._values.items())
+
+        lines = []
+        for key, state in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets, state["counts"]):
+                cumulative += count
+                labels = _format_labels(self.labelnames, key, f'le="{_format_value(bound)}"')
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _format_labels(self.labelnames, key, 'le="+Inf"')
+            lines.append(f"{self.name}_bucket{labels} {state['count']}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labelnames, key)} {_format_value(state['sum'])}")
+            lines.append(f"{self.name}_count{_format_labels(self.labelnames, key)} {state['count']}")
+        return lines
+
+
+def render_metrics() -> str:
+    """All registered metrics in the Prometheus text exposition format"""
+    return "\n".join(metric.render() for metric in REGISTRY) + "\n"
+
+
+_tracer = None
+
+
+def enable_tracing(service_name: str = "credential-api"):
+    """Open an OpenTelemetry span for every stage (requires the `opentelemetry-api` package)"""
+    global _tracer
+    try:
+        from opentelemetry import trace
+    except ImportError:
+        raise Exception("Tracing requires the 'opentelemetry-api' package")
+    _tracer = trace.get_tracer(service_name)
+
+
+@contextmanager
+def span(name: str, **attributes):
+    """An OpenTelemetry span when tracing is enabled, otherwise nothing"""
+    if _tracer is None:
+        yield
+        return
+    with _tracer.start_as_current_span(name, attributes=attributes):
+        yield
+
+
+@contextmanager
+def stage(name: str, **attributes):
+    """Time one stage of request handling into STAGE_SECONDS, inside its own span"""
+    with span(name, **attributes), STAGE_SECONDS.time(stage=name):
+        yield
+
+
+HTTP_REQUESTS = Counter(
+    "http_requests_total", "HTTP requests by route and status", ("method", "route", "status")
+)
+HTTP_REQUEST_SECONDS = Histogram(
+    "http_request_duration_seconds", "Time until the response headers were sent", ("method", "route")
+)
+HTTP_IN_FLIGHT = Gauge("http_requests_in_flight", "HTTP requests being handled")
+ADMISSION_REJECTED = Counter(
+    "admission_rejected_total", "Requests turned away by admission control", ("route_class", "reason")
+)
+
+RPC_CALL_SECONDS = Histogram(
+    "rpc_call_duration_seconds", "JSON-RPC round trips by method and contract function", ("method", "function")
+)
+RPC_ENDPOINT_FAILURES = Counter(
+    "rpc_endpoint_failures_total", "Transport failures per RPC endpoint", ("endpoint",)
+)
+
+TX_CONFIRMATION_SECONDS = Histogram(
+    "transaction_confirmation_seconds",
+    "Time from broadcast until the receipt was seen",
+    ("kind", "status"),
+    buckets=CONFIRMATION_BUCKETS
+)
+
+STAGE_SECONDS = Histogram("stage_duration_seconds", "Time spent per request handling stage", ("stage",))
+PDF_RENDER_SECONDS = Histogram("pdf_render_seconds", "WeasyPrint render time inside a worker process")
+PDF_QUEUE_WAIT_SECONDS = Histogram("pdf_queue_wait_seconds", "Time a render waited for a free worker")
+QR_RENDER_SECONDS = Histogram("qr_render_seconds", "QR code encoding time for cache misses", ("format",))
+
+SINGLEFLIGHT_CALLS = Counter(
+    "singleflight_calls_total", "Chain reads that started a call or joined one already in flight", ("kind", "result")
+)
+
+CACHE_REQUESTS = Counter("cache_requests_total", "Cache lookups by cache and result", ("cache", "result"))
+CACHE_HIT_RATIO = Gauge("cache_hit_ratio", "Share of cache lookups that were hits", ("cache",))
+IN_FLIGHT = Gauge("work_in_flight", "Work currently queued or running", ("kind",))
+
+
+def update_cache_ratios():
+    """Refresh CACHE_HIT_RATIO from CACHE_REQUESTS"""
+    caches = {key[0] for key in CACHE_REQUESTS.label_values()}
+    for cache in caches:
+        hits = CACHE_REQUESTS.value(cache=cache, result="hit")
+        total = hits + CACHE_REQUESTS.value(cache=cache, result="miss")
+        CACHE_HIT_RATIO.set(hits / total if total else 0.0, cache=cache)
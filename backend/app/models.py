@@ -1,5 +1,5 @@
 from pydantic import BaseModel, EmailStr, Field
-from typing import Optional
+from typing import Dict, List, Optional
 from datetime import datetime
 
 
@@ -29,11 +29,45 @@ class CredentialCreate(BaseModel):
 class CredentialResponse(BaseModel):
     credential_id: str
     transaction_hash: str
+    job_id: Optional[str] = None
     status: str
     message: str
     issue_date: str
 
 
+class CredentialBatchCreate(BaseModel):
+    credentials: List[CredentialCreate] = Field(..., description="Credentials to issue, one per recipient")
+
+
+class BatchIssueResult(BaseModel):
+    credential_id: str
+    recipient_email: str
+    transaction_hash: Optional[str] = None
+    job_id: Optional[str] = None  # shared by the credentials of one issueCredentialsBatch transaction
+    status: str  # pending (broadcast; poll the job) or failed (not broadcast)
+    error: Optional[str] = None
+
+
+class BatchIssueResponse(BaseModel):
+    total: int
+    failed: int
+    pending: int
+    results: List[BatchIssueResult]
+
+
+class JobStatusResponse(BaseModel):
+    job_id: str
+    kind: str  # issue_credential, issue_credentials_batch, revoke_credential, authorize_issuer, anchor_cohort or revoke_cohort_credential
+    status: str  # pending, mined, failed or replaced
+    transaction_hash: str
+    previous_hashes: List[str] = []  # earlier broadcasts replaced with higher fees
+    block_number: Optional[int] = None
+    error: Optional[str] = None
+    details: Dict = {}
+    created_at: str
+    updated_at: str
+
+
 class VerifyCredentialResponse(BaseModel):
     exists: bool
     is_valid: bool
@@ -44,6 +78,22 @@ class VerifyCredentialResponse(BaseModel):
     message: str
 
 
+class VerifyBatchRequest(BaseModel):
+    credential_ids: List[str] = Field(..., description="Credential IDs to verify")
+
+
+class VerifyBatchResult(VerifyCredentialResponse):
+    credential_id: str
+    error: Optional[str] = None
+
+
+class VerifyBatchResponse(BaseModel):
+    total: int
+    from_cache: int
+    from_chain: int
+    results: List[VerifyBatchResult]
+
+
 class CredentialDetails(BaseModel):
     credential_id: str
     recipient_name: str
@@ -70,6 +120,72 @@ class IssuerAuthorization(BaseModel):
         }
 
 
+class PdfExportRequest(BaseModel):
+    issuer_address: Optional[str] = Field(None, description="Export every valid credential of this issuer")
+    credential_ids: Optional[List[str]] = Field(None, description="Export these credentials")
+
+
+class CohortCreate(BaseModel):
+    credentials: List[CredentialCreate] = Field(..., description="Credentials of the cohort, all from one issuer")
+    metadata_uri: Optional[str] = Field(None, description="URI to metadata describing the cohort")
+
+
+class CohortCredential(BaseModel):
+    credential_id: str
+    recipient_email: str
+    leaf: str
+    proof: List[str]
+
+
+class CohortIssueResponse(BaseModel):
+    root: str
+    size: int
+    transaction_hash: str
+    job_id: str
+    status: str
+    credentials: List[CohortCredential]
+
+
+class CohortCredentialDocument(BaseModel):
+    credential: Dict = Field(..., description="Credential fields committed to by the leaf")
+    root: str = Field(..., description="Anchored Merkle root of the cohort")
+    leaf: Optional[str] = None
+    proof: List[str] = Field(..., description="Sibling hashes from the leaf up to the root")
+
+
+class CohortVerifyResponse(VerifyCredentialResponse):
+    credential_id: str
+    root: str
+    included: bool
+    revoked: bool
+
+
+class SignedCredentialDocument(BaseModel):
+    credential: Dict = Field(..., description="Credential fields covered by the signature")
+    domain: Dict = Field(..., description="EIP-712 domain: name, version, chainId and verifyingContract")
+    signature: str = Field(..., description="EIP-712 signature by the credential issuer")
+    credential_status: Optional[Dict] = Field(
+        None, description="Status list index and URL of the credential; not covered by the signature"
+    )
+
+
+class SignedDocumentVerifyResponse(VerifyCredentialResponse):
+    credential_id: str
+    signature_valid: bool
+    issuer_authorized: bool
+    revoked: bool
+    signer: Optional[str] = None
+    revocations_synced_block: Optional[int] = None
+
+
+class CredentialStatusResponse(BaseModel):
+    credential_id: str
+    issuer: str
+    status_list_index: int
+    status_list_url: str
+    revoked: bool
+
+
 class QRCodeResponse(BaseModel):
     credential_id: str
     qr_code: str  # Base64 encoded image
@@ -0,0 +1,123 @@
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import Dict, Optional
+import asyncio
+
+
+class NonceManager:
+    """
+    Hands out transaction nonces per sender from a local counter.
+
+    The counter is seeded from the node's pending transaction count once,
+    then advanced locally, so many transactions can be broadcast back to
+    back without waiting for receipts and concurrent senders never reuse a
+    nonce. A nonce is only consumed when the broadcast succeeds; any
+    failure drops the counter so it is re-read from the node next time.
+    """
+
+    def __init__(self, w3):
+        self.w3 = w3
+        self._next: Dict[str, int] = {}
+        self._locks: Dict[str, asyncio.Lock] = {}
+
+    @asynccontextmanager
+    async def reserve(self, address: str):
+        """Yield the next nonce for `address`, committing it only if the block exits cleanly"""
+        lock = self._locks.setdefault(address, asyncio.Lock())
+        async with lock:
+            if address not in self._next:
+                self._next[address] = await self.w3.eth.get_transaction_count(address, "pending")
+
+            try:
+                yield self._next[address]
+            except BaseException:
+                self._next.pop(address, None)
+                raise
+
+            self._next[address] += 1
+
+    def reset(self, address: str):
+        """Forget the local counter for `address` so it is re-read from the node"""
+        self._next.pop(address, None)
+
+
+class SharedNonceManager(NonceManager):
+    """
+    NonceManager for several worker processes on one host.
+
+    The next nonce per sender lives in a file under `state_dir`, which is
+    locked with flock for the whole reservation, so workers take turns per
+    sender and never hand out the same nonce. Within a process the
+    per-sender asyncio lock still orders callers, so at most one thread per
+    sender waits on the file lock. Requires a Unix host.
+
+    The file outlives the processes, so every reservation also reads the
+    node's pending count: a higher count (the key was used elsewhere) wins,
+    and a count more than `max_drift` below the file (transactions the node
+    dropped, or a chain that was reset) replaces it, so a stale file can
+    neither reuse a nonce nor leave a gap that stalls the sender. A smaller
+    shortfall is kept, as a load-balanced endpoint may lag behind.
+    """
+
+    def __init__(self, w3, state_dir: str, max_drift: int = 8):
+        super().__init__(w3)
+        self.max_drift = max_drift
+        try:
+            import fcntl
+        except ImportError:
+            raise Exception("Shared nonce management requires fcntl (a Unix host)")
+        self._fcntl = fcntl
+        self.state_dir = Path(state_dir) / "nonces"
+        self.state_dir.mkdir(parents=True, exist_ok=True)
+
+    def _open_locked(self, address: str):
+        handle = open(self.state_dir / f"{address.lower()}.nonce", "a+")
+        self._fcntl.flock(handle, self._fcntl.LOCK_EX)
+        handle.seek(0)
+        return handle
+
+    @staticmethod
+    def _write(handle, text: str):
+        handle.seek(0)
+        handle.truncate()
+        handle.write(text)
+        handle.flush()
+
+    @asynccontextmanager
+    async def reserve(self, address: str):
+        """Yield the next nonce for `address`, committing it only if the block exits cleanly"""
+        lock = self._locks.setdefault(address, asyncio.Lock())
+        async with lock:
+            handle = await asyncio.to_thread(self._open_locked, address)
+            try:
+                stored = handle.read().strip()
+                pending = await self.w3.eth.get_transaction_count(address, "pending")
+                nonce = self.reconcile(int(stored) if stored else None, pending)
+
+                try:
+                    yield nonce
+                except BaseException:
+                    self._write(handle, "")
+                    raise
+
+                self._write(handle, str(nonce + 1))
+            finally:
+                # Closing the file releases the lock
+                handle.close()
+
+    def reconcile(self, stored: Optional[int], pending: int) -> int:
+        """Next nonce from the stored counter and the node's pending transaction count"""
+        if stored is None or pending >= stored:
+            return pending
+        if stored - pending > self.max_drift:
+            print(f"Stored nonce {stored} is {stored - pending} ahead of the node; resetting to {pending}")
+            return pending
+        return stored
+
+    def reset(self, address: str):
+        """Forget the shared counter for `address` so it is re-read from the node"""
+        handle = self._open_locked(address)
+        try:
+            self._write(handle, "")
+        finally:
+            handle.close()
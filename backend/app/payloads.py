@@ -0,0 +1,89 @@
+from pathlib import Path
+from typing import Dict, Optional
+import json
+import os
+import threading
+
+from web3 import Web3
+
+
+# Credential fields kept off chain by the slim contract and committed to by its content hash
+PAYLOAD_FIELDS = (
+    "credentialId",
+    "recipientName",
+    "recipientEmail",
+    "issuerName",
+    "credentialType",
+    "description",
+    "metadataURI",
+)
+
+
+class PayloadIntegrityError(Exception):
+    """A stored payload does not hash to the content hash recorded on chain"""
+
+
+def credential_payload(cred: Dict) -> bytes:
+    """Canonical JSON payload of a credential from issue_credential keyword arguments"""
+    payload = {
+        "credentialId": cred["credential_id"],
+        "recipientName": cred["recipient_name"],
+        "recipientEmail": cred["recipient_email"],
+        "issuerName": cred["issuer_name"],
+        "credentialType": cred["credential_type"],
+        "description": cred["description"],
+        "metadataURI": cred["metadata_uri"],
+    }
+    return json.dumps(payload, sort_keys=True, separators=(",", ":"), ensure_ascii=False).encode()
+
+
+def content_hash(payload: bytes) -> bytes:
+    return bytes(Web3.keccak(payload))
+
+
+def credential_id_hash(credential_id: str) -> bytes:
+    """Slim contract key of a credential; equal to the indexed credentialId topic of the full contract"""
+    return bytes(Web3.keccak(text=credential_id))
+
+
+def recipient_hash(email: str) -> bytes:
+    """Slim contract key of a recipient: keccak256 of the salted, normalized email"""
+    from .config import settings
+    return bytes(Web3.keccak(text=settings.recipient_hash_salt + email.strip().lower()))
+
+
+class PayloadStore:
+    """
+    Content-addressed store of credential payloads on local disk.
+
+    Each payload is saved as `<keccak256 hex>.json` and checked against its
+    name when read, so a payload returned by get() is exactly the one whose
+    hash the slim contract recorded.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, digest: bytes) -> Path:
+        return self.directory / f"{digest.hex()}.json"
+
+    def put(self, payload: bytes) -> bytes:
+        """Store a payload and return its content hash"""
+        digest = content_hash(payload)
+        path = self._path(digest)
+        if not path.exists():
+            tmp_path = self.directory / f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp"
+            tmp_path.write_bytes(payload)
+            os.replace(tmp_path, path)
+        return digest
+
+    def get(self, digest: bytes) -> Optional[Dict]:
+        """Payload fields for a content hash, or None when it is not stored here"""
+        try:
+            payload = self._path(digest).read_bytes()
+        except FileNotFoundError:
+            return None
+        if content_hash(payload) != digest:
+            raise PayloadIntegrityError(f"Payload does not match content hash 0x{digest.hex()}")
+        return json.loads(payload)
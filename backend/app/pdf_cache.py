@@ -0,0 +1,138 @@
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Optional
+import hashlib
+import json
+import os
+import threading
+import time
+
+from .cache import credential_key
+from .metrics import CACHE_REQUESTS
+from .pdf_utils import TEMPLATE_VERSION
+
+
+# getCredential fields that appear on the certificate
+PDF_FIELDS = (
+    "credentialId",
+    "recipientName",
+    "recipientEmail",
+    "credentialType",
+    "description",
+    "issuerName",
+    "issuer",
+    "issueDate",
+)
+
+
+def pdf_digest(credential: Dict, verification_url: str) -> str:
+    """Content address of a certificate: its rendered fields, the verification URL and the template version"""
+    material = {field: credential[field] for field in PDF_FIELDS}
+    material["verificationUrl"] = verification_url
+    material["templateVersion"] = TEMPLATE_VERSION
+    return hashlib.sha256(json.dumps(material, sort_keys=True).encode()).hexdigest()
+
+
+class PdfCache:
+    """
+    Size-bounded LRU cache of rendered certificate PDFs on local disk.
+
+    Files are named `<id hash>.<digest>.pdf`, where the id hash matches the
+    indexed credentialId topic of contract events (so revocations can evict
+    without knowing the plain ID) and the digest is pdf_digest. Least
+    recently served files are deleted once the total exceeds `max_bytes`.
+
+    Several worker processes may share one directory: each keeps its own
+    index, adopts files another worker rendered on first request and evicts
+    only the files it knows of.
+    """
+
+    # Temporary files older than this are left over from a crashed writer
+    STALE_TMP_SECONDS = 300
+
+    def __init__(self, directory: str, max_bytes: int):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._sizes: "OrderedDict[str, int]" = OrderedDict()
+        self._total = 0
+
+        # Rebuild recency from modification times; get() touches files it serves
+        for path in sorted(self.directory.glob("*.pdf"), key=lambda p: p.stat().st_mtime):
+            self._sizes[path.name] = path.stat().st_size
+            self._total += self._sizes[path.name]
+        for path in self.directory.glob("*.tmp"):
+            try:
+                if time.time() - path.stat().st_mtime > self.STALE_TMP_SECONDS:
+                    path.unlink(missing_ok=True)
+            except FileNotFoundError:
+                pass
+
+    @staticmethod
+    def _name(credential_id: str, digest: str) -> str:
+        return f"{credential_key(credential_id)[2:]}.{digest}.pdf"
+
+    def get(self, credential_id: str, digest: str) -> Optional[bytes]:
+        """Cached PDF bytes, or None"""
+        name = self._name(credential_id, digest)
+        path = self.directory / name
+        try:
+            data = path.read_bytes()
+            os.utime(path)
+        except FileNotFoundError:
+            with self._lock:
+                self._total -= self._sizes.pop(name, 0)
+                self.misses += 1
+            CACHE_REQUESTS.inc(cache="pdf", result="miss")
+            return None
+
+        with self._lock:
+            if name in self._sizes:
+                self._sizes.move_to_end(name)
+            else:
+                # Rendered by another worker sharing the directory
+                self._sizes[name] = len(data)
+                self._total += len(data)
+            self.hits += 1
+        CACHE_REQUESTS.inc(cache="pdf", result="hit")
+        return data
+
+    def put(self, credential_id: str, digest: str, data: bytes):
+        """Store a rendered PDF and evict least recently used files over the size bound"""
+        name = self._name(credential_id, digest)
+        tmp_path = self.directory / f"{name}.{threading.get_ident()}.tmp"
+        tmp_path.write_bytes(data)
+        os.replace(tmp_path, self.directory / name)
+
+        with self._lock:
+            self._total += len(data) - self._sizes.pop(name, 0)
+            self._sizes[name] = len(data)
+            while self._total > self.max_bytes and len(self._sizes) > 1:
+                evicted, size = self._sizes.popitem(last=False)
+                self._total -= size
+                (self.directory / evicted).unlink(missing_ok=True)
+
+    def invalidate(self, credential_id: str):
+        self.invalidate_hash(credential_key(credential_id))
+
+    def invalidate_hash(self, id_hash: str):
+        """Delete every cached PDF of a credential, by its keccak id hash"""
+        prefix = id_hash[2:] if id_hash.startswith("0x") else id_hash
+        with self._lock:
+            for name in [name for name in self._sizes if name.startswith(prefix + ".")]:
+                self._total -= self._sizes.pop(name)
+            # Also files other workers rendered that this one has not served
+            for path in self.directory.glob(f"{prefix}.*.pdf"):
+                path.unlink(missing_ok=True)
+
+    def stats(self) -> Dict:
+        return {
+            "files": len(self._sizes),
+            "bytes": self._total,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses
+        }
@@ -0,0 +1,89 @@
+from typing import AsyncIterator, Awaitable, Callable, Dict, Optional, Tuple
+import asyncio
+import zipfile
+
+
+class _StreamBuffer:
+    """Write-only sink for ZipFile whose contents are drained after every entry"""
+
+    def __init__(self):
+        self._chunks = []
+        self._offset = 0
+
+    def write(self, data: bytes) -> int:
+        self._chunks.append(bytes(data))
+        self._offset += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._offset
+
+    def flush(self):
+        pass
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks = []
+        return data
+
+
+async def zip_certificates(
+    credentials: AsyncIterator[Tuple[str, Optional[Dict]]],
+    render: Callable[[str, Optional[Dict]], Awaitable[bytes]],
+    concurrency: int = 4
+) -> AsyncIterator[bytes]:
+    """
+    Stream a ZIP of certificate PDFs.
+
+    `credentials` yields (credential_id, credential) pairs and `render`
+    turns one into PDF bytes, raising for credentials that cannot be
+    exported. Up to `concurrency` renders run at once and entries are
+    written in completion order, so only those PDFs are held in memory.
+    Failures are listed in an errors.txt entry at the end.
+    """
+    buffer = _StreamBuffer()
+    archive = zipfile.ZipFile(buffer, mode="w", compression=zipfile.ZIP_STORED)
+    source = credentials.__aiter__()
+    exhausted = False
+    pending = set()
+    errors = []
+
+    async def render_entry(credential_id: str, credential: Optional[Dict]):
+        try:
+            return credential_id, await render(credential_id, credential), None
+        except Exception as e:
+            return credential_id, None, str(e)
+
+    try:
+        while True:
+            while not exhausted and len(pending) < concurrency:
+                try:
+                    credential_id, credential = await source.__anext__()
+                except StopAsyncIteration:
+                    exhausted = True
+                    break
+                pending.add(asyncio.ensure_future(render_entry(credential_id, credential)))
+
+            if not pending:
+                break
+
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                credential_id, pdf, error = task.result()
+                if error is not None:
+                    errors.append(f"{credential_id}: {error}")
+                else:
+                    archive.writestr(f"credential-{credential_id}.pdf", pdf)
+
+            data = buffer.drain()
+            if data:
+                yield data
+
+        if errors:
+            archive.writestr("errors.txt", "\n".join(errors) + "\n")
+        archive.close()
+        yield buffer.drain()
+
+    finally:
+        for task in pending:
+            task.cancel()
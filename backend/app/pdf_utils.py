@@ -1,214 +1,371 @@
-from weasyprint import HTML, CSS
-from weasyprint.text.fonts import FontConfiguration # <--- MUST ADD THIS
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
-import io
+from html import escape
+from typing import Dict, Optional, Tuple
+import asyncio
 import base64
-import os
+import io
+import multiprocessing
+import time
 from pathlib import Path
 
-def create_certificate_pdf(credential_data, verification_url, qr_code_path):
-    # 1. Initialize Font Config
-    font_config = FontConfiguration()
-    
-    # 2. Setup Paths
-    BASE_DIR = Path(__file__).resolve().parent.parent
-    # Replace 'Inter-Regular.ttf' with your actual filename in assets/fonts/
-    font_path = BASE_DIR / "app" / "assets" / "fonts" / "Inter-Regular.ttf"
-    font_uri = font_path.as_uri()
-    
-    # 3. Handle Images
-    with open(qr_code_path, 'rb') as f:
-        qr_base64 = base64.b64encode(f.read()).decode()
-    
-    shield_path = BASE_DIR / "app" / "public" / "shield.png"
-    shield_base64 = ""
-    if shield_path.exists():
-        with open(shield_path, 'rb') as f:
-            shield_base64 = base64.b64encode(f.read()).decode()
-
-    # 4. Data Processing
-    dt = datetime.fromtimestamp(credential_data["issueDate"])
-    date_str = dt.strftime('%B %d, %Y')
-    time_str = dt.strftime('%I:%M %p')
-    
-    issuer_addr = credential_data["issuer"]
-    if len(issuer_addr) > 35:
-        issuer_addr = f"{issuer_addr[:16]}...{issuer_addr[-16:]}"
-    
-    description = credential_data["description"]
-    if len(description) > 80:
-        description = description[:77] + "..."
-
-    # 5. HTML with Modern Font Logic
-    html_content = f"""
-    <!DOCTYPE html>
-    <html>
-    <head>
-        <meta charset="UTF-8">
-        <style>
-            @font-face {{
-                font-family: 'ModernFont';
-                src: url('{font_uri}');
-            }}
-
-            @page {{
-                size: letter;
-                margin: 0; /* Removing page margin to control border via container */
-            }}
-            
-            body {{
-                font-family: 'ModernFont', sans-serif;
-                margin: 0;
-                padding: 0.2in; /* This creates the outer "white" space */
-                background-color: white;
-            }}
-            
-            .container {{
-                border: 1px solid #e2e8f0;
-                position: relative;
-                height: 10.6in; /* 11in total - (0.2in padding * 2) */
-                box-sizing: border-box;
-            }}
-            
-            .header {{
-                background-color: #18181b;
-                padding: 30px 40px;
-                color: white;
-                border-bottom: 3px solid #52525b;
-            }}
-            
-            .logo {{
-                display: flex;
-                align-items: center;
-                font-size: 18px;
-                font-weight: bold;
-            }}
-
-            .logo-img {{
-                width: 20px;
-                height: 20px;
-                margin-right: 8px;
-            }}
-            
-            .main-content {{
-                padding: 40px 60px;
-                text-align: center;
-            }}
-            
-            .certificate-title {{
-                font-size: 32px;
-                font-weight: bold;
-                margin: 20px 0 10px 0;
-                color: #18181b;
-            }}
-            
-            .recipient-name {{
-                font-size: 42px;
-                font-weight: bold;
-                margin: 15px 0;
-            }}
-            
-            .credential-card {{
-                background-color: #f1f5f9;
-                border: 1px solid #cbd5e1;
-                border-radius: 8px;
-                padding: 20px 30px;
-                margin: 20px auto;
-                width: 80%;
-            }}
-            
-            .info-section {{
-                margin-top: 40px;
-                display: flex;
-                justify-content: space-between;
-                padding: 0 20px;
-            }}
-            
-            .info-card {{
-                flex: 1;
-                background-color: white;
-                border: 1px solid #e2e8f0;
-                border-radius: 6px;
-                padding: 15px;
-                text-align: left;
-                margin: 0 10px;
-            }}
-            
-            .qr-container {{
-                position: absolute;
-                bottom: 10px;
-                right: 40px;
-                text-align: center;
-            }}
-            
-            .qr-code {{
-                width: 60px;
-                height: 60px;
-            }}
-            
-            .footer {{
-                position: absolute;
-                bottom: 20px;
-                width: 100%;
-                text-align: center;
-                font-size: 8px;
-                color: #94a3b8;
-            }}
-        </style>
-    </head>
-    <body>
-        <div class="container">
-            <div class="header">
-                <div class="logo">
-                    <img src="data:image/png;base64,{shield_base64}" class="logo-img">
-                    <span>CredentialChain</span>
-                </div>
+from .metrics import PDF_QUEUE_WAIT_SECONDS, PDF_RENDER_SECONDS
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+FONT_PATH = BASE_DIR / "app" / "assets" / "fonts" / "Inter-Regular.ttf"
+SHIELD_PATH = BASE_DIR / "app" / "public" / "shield.png"
+
+# Bump whenever a change to the template or stylesheet changes the rendered PDF
+TEMPLATE_VERSION = "2"
+
+STYLESHEET = """
+@font-face {
+    font-family: 'ModernFont';
+    src: url('{font_uri}');
+}
+
+@page {
+    size: letter;
+    margin: 0; /* Removing page margin to control border via container */
+}
+
+body {
+    font-family: 'ModernFont', sans-serif;
+    margin: 0;
+    padding: 0.2in; /* This creates the outer "white" space */
+    background-color: white;
+}
+
+.container {
+    border: 1px solid #e2e8f0;
+    position: relative;
+    height: 10.6in; /* 11in total - (0.2in padding * 2) */
+    box-sizing: border-box;
+}
+
+.header {
+    background-color: #18181b;
+    padding: 30px 40px;
+    color: white;
+    border-bottom: 3px solid #52525b;
+}
+
+.logo {
+    display: flex;
+    align-items: center;
+    font-size: 18px;
+    font-weight: bold;
+}
+
+.logo-img {
+    width: 20px;
+    height: 20px;
+    margin-right: 8px;
+}
+
+.main-content {
+    padding: 40px 60px;
+    text-align: center;
+}
+
+.certificate-title {
+    font-size: 32px;
+    font-weight: bold;
+    margin: 20px 0 10px 0;
+    color: #18181b;
+}
+
+.recipient-name {
+    font-size: 42px;
+    font-weight: bold;
+    margin: 15px 0;
+}
+
+.credential-card {
+    background-color: #f1f5f9;
+    border: 1px solid #cbd5e1;
+    border-radius: 8px;
+    padding: 20px 30px;
+    margin: 20px auto;
+    width: 80%;
+}
+
+.info-section {
+    margin-top: 40px;
+    display: flex;
+    justify-content: space-between;
+    padding: 0 20px;
+}
+
+.info-card {
+    flex: 1;
+    background-color: white;
+    border: 1px solid #e2e8f0;
+    border-radius: 6px;
+    padding: 15px;
+    text-align: left;
+    margin: 0 10px;
+}
+
+.qr-container {
+    position: absolute;
+    bottom: 10px;
+    right: 40px;
+    text-align: center;
+}
+
+.qr-code {
+    width: 60px;
+    height: 60px;
+}
+
+.footer {
+    position: absolute;
+    bottom: 20px;
+    width: 100%;
+    text-align: center;
+    font-size: 8px;
+    color: #94a3b8;
+}
+
+"""
+
+CERTIFICATE_TEMPLATE = """
+<!DOCTYPE html>
+<html>
+<head>
+    <meta charset="UTF-8">
+</head>
+<body>
+    <div class="container">
+        <div class="header">
+            <div class="logo">
+                <img src="data:image/png;base64,{shield_base64}" class="logo-img">
+                <span>CredentialChain</span>
+            </div>
+        </div>
+        <div class="main-content">
+            <h1 class="certificate-title">Certificate of Completion</h1>
+            <div style="font-size: 11px; color: #64748b; letter-spacing: 2px; font-weight: bold;">BLOCKCHAIN-VERIFIED CREDENTIAL</div>
+            <div style="width: 250px; height: 1px; background-color: #cbd5e1; margin: 20px auto;"></div>
+
+            <p>This is to certify that</p>
+            <h2 class="recipient-name">{recipient_name}</h2>
+            <p style="color: #94a3b8;">{recipient_email}</p>
+
+            <p>has successfully completed</p>
+            <div class="credential-card">
+                <div style="font-size: 24px; font-weight: bold;">{credential_type}</div>
             </div>
-            <div class="main-content">
-                <h1 class="certificate-title">Certificate of Completion</h1>
-                <div style="font-size: 11px; color: #64748b; letter-spacing: 2px; font-weight: bold;">BLOCKCHAIN-VERIFIED CREDENTIAL</div>
-                <div style="width: 250px; height: 1px; background-color: #cbd5e1; margin: 20px auto;"></div>
-                
-                <p>This is to certify that</p>
-                <h2 class="recipient-name">{credential_data["recipientName"]}</h2>
-                <p style="color: #94a3b8;">{credential_data["recipientEmail"]}</p>
-                
-                <p>has successfully completed</p>
-                <div class="credential-card">
-                    <div style="font-size: 24px; font-weight: bold;">{credential_data["credentialType"]}</div>
+            <p style="font-size: 11px; color: #64748b;">{description}</p>
+
+            <div class="info-section">
+                <div class="info-card">
+                    <div style="font-size: 10px; font-weight: bold; color: #64748b;">ISSUED BY</div>
+                    <div style="font-size: 14px; font-weight: bold;">{issuer_name}</div>
+                    <div style="font-size: 8px; color: #94a3b8;">{issuer_address}</div>
                 </div>
-                <p style="font-size: 11px; color: #64748b;">{description}</p>
-                
-                <div class="info-section">
-                    <div class="info-card">
-                        <div style="font-size: 10px; font-weight: bold; color: #64748b;">ISSUED BY</div>
-                        <div style="font-size: 14px; font-weight: bold;">{credential_data["issuerName"]}</div>
-                        <div style="font-size: 8px; color: #94a3b8;">{issuer_addr}</div>
-                    </div>
-                    <div class="info-card">
-                        <div style="font-size: 10px; font-weight: bold; color: #64748b;">DATE ISSUED</div>
-                        <div style="font-size: 14px; font-weight: bold;">{date_str}</div>
-                        <div style="font-size: 8px; color: #94a3b8;">{time_str}</div>
-                    </div>
+                <div class="info-card">
+                    <div style="font-size: 10px; font-weight: bold; color: #64748b;">DATE ISSUED</div>
+                    <div style="font-size: 14px; font-weight: bold;">{date_str}</div>
+                    <div style="font-size: 8px; color: #94a3b8;">{time_str}</div>
                 </div>
             </div>
-            <div class="qr-container">
-                <img src="data:image/png;base64,{qr_base64}" class="qr-code">
-                <div style="font-size: 7px; font-weight: bold;">SCAN TO VERIFY</div>
-            </div>
-            <div class="footer">
-                <div>Credential ID: {credential_data["credentialId"]}</div>
-                <div>{verification_url}</div>
-            </div>
         </div>
-    </body>
-    </html>
+        <div class="qr-container">
+            <img src="data:image/svg+xml;base64,{qr_base64}" class="qr-code">
+            <div style="font-size: 7px; font-weight: bold;">SCAN TO VERIFY</div>
+        </div>
+        <div class="footer">
+            <div>Credential ID: {credential_id}</div>
+            <div>{verification_url}</div>
+        </div>
+    </div>
+</body>
+</html>
+"""
+
+
+class CertificateRenderer:
     """
-    
-    # 6. Generate PDF
-    buffer = io.BytesIO()
-    # Pass font_config here
-    HTML(string=html_content).write_pdf(buffer, font_config=font_config)
-    
-    buffer.seek(0)
-    return buffer
\ No newline at end of file
+    Renders certificate PDFs from preloaded assets.
+    Fonts, the parsed stylesheet and the shield image are loaded once
+    per renderer instead of on every certificate. WeasyPrint is imported
+    here rather than at module load, so only processes that render pay for it.
+    """
+
+    def __init__(self):
+        from weasyprint import CSS
+        from weasyprint.text.fonts import FontConfiguration
+
+        self.font_config = FontConfiguration()
+        self.stylesheet = CSS(
+            string=STYLESHEET.replace("{font_uri}", FONT_PATH.as_uri()),
+            font_config=self.font_config
+        )
+        self.shield_base64 = ""
+        if SHIELD_PATH.exists():
+            self.shield_base64 = base64.b64encode(SHIELD_PATH.read_bytes()).decode()
+
+    def render(self, credential_data: Dict, verification_url: str, qr_svg: bytes) -> bytes:
+        """Render one certificate with its QR code (SVG bytes) and return the PDF bytes"""
+        from weasyprint import HTML
+
+        qr_base64 = base64.b64encode(qr_svg).decode()
+
+        dt = datetime.fromtimestamp(credential_data["issueDate"])
+
+        issuer_address = credential_data["issuer"]
+        if len(issuer_address) > 35:
+            issuer_address = f"{issuer_address[:16]}...{issuer_address[-16:]}"
+
+        description = credential_data["description"]
+        if len(description) > 80:
+            description = description[:77] + "..."
+
+        html_content = CERTIFICATE_TEMPLATE.format(
+            shield_base64=self.shield_base64,
+            qr_base64=qr_base64,
+            recipient_name=escape(credential_data["recipientName"]),
+            recipient_email=escape(credential_data["recipientEmail"]),
+            credential_type=escape(credential_data["credentialType"]),
+            description=escape(description),
+            issuer_name=escape(credential_data["issuerName"]),
+            issuer_address=escape(issuer_address),
+            date_str=dt.strftime('%B %d, %Y'),
+            time_str=dt.strftime('%I:%M %p'),
+            credential_id=escape(credential_data["credentialId"]),
+            verification_url=escape(verification_url)
+        )
+
+        return HTML(string=html_content).write_pdf(
+            stylesheets=[self.stylesheet],
+            font_config=self.font_config
+        )
+
+
+_renderer: Optional[CertificateRenderer] = None
+
+
+def get_renderer() -> CertificateRenderer:
+    """Process-wide renderer, created on first use"""
+    global _renderer
+    if _renderer is None:
+        _renderer = CertificateRenderer()
+    return _renderer
+
+
+def create_certificate_pdf(credential_data, verification_url, qr_svg):
+    """Render a certificate in the current process and return it as a buffer"""
+    return io.BytesIO(get_renderer().render(credential_data, verification_url, qr_svg))
+
+
+def _warm_worker():
+    get_renderer()
+
+
+def _render_in_worker(credential_data: Dict, verification_url: str, qr_svg: bytes) -> Tuple[bytes, float]:
+    started = time.perf_counter()
+    pdf = get_renderer().render(credential_data, verification_url, qr_svg)
+    return pdf, time.perf_counter() - started
+
+
+class RenderQueueFull(Exception):
+    """Raised when the PDF render pool already holds its maximum of pending jobs"""
+
+
+class PdfRenderPool:
+    """
+    Renders certificates in a bounded pool of worker processes.
+
+    Each worker builds its CertificateRenderer once, so fonts and the
+    stylesheet are parsed per process rather than per request, and WeasyPrint
+    never runs on the event loop. At most `max_pending` renders may be queued
+    or running; further requests fail fast with RenderQueueFull.
+    """
+
+    def __init__(self, workers: int = 2, max_pending: int = 32):
+        self.workers = workers
+        self.max_pending = max_pending
+        self.pending = 0
+        self.rendered = 0
+        self.failed = 0
+        self.rejected = 0
+        self.render_seconds = 0.0
+        self.wait_seconds = 0.0
+        self._executor = None
+
+    def start(self):
+        """Spawn the worker processes and have each preload its renderer"""
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+            for _ in range(self.workers):
+                self._executor.submit(_warm_worker)
+
+    def stop(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+
+    async def render(self, credential_data: Dict, verification_url: str, qr_svg: bytes) -> bytes:
+        """Render a certificate in a worker process and return the PDF bytes"""
+        if self._executor is None:
+            raise Exception("PDF render pool not started")
+        if self.pending >= self.max_pending:
+            self.rejected += 1
+            raise RenderQueueFull("PDF render queue is full")
+
+        loop = asyncio.get_running_loop()
+        self.pending += 1
+        submitted = time.perf_counter()
+        try:
+            future = self._executor.submit(_render_in_worker, credential_data, verification_url, qr_svg)
+        except BaseException:
+            self.pending -= 1
+            self.failed += 1
+            raise
+        # A render already running in a worker cannot be cancelled, so its slot
+        # is released when the worker finishes, not when the request gives up
+        future.add_done_callback(lambda _: self._release(loop))
+
+        try:
+            pdf, render_seconds = await asyncio.wrap_future(future)
+        except BaseException:
+            self.failed += 1
+            raise
+
+        wait_seconds = time.perf_counter() - submitted - render_seconds
+        self.rendered += 1
+        self.render_seconds += render_seconds
+        self.wait_seconds += wait_seconds
+        PDF_RENDER_SECONDS.observe(render_seconds)
+        PDF_QUEUE_WAIT_SECONDS.observe(wait_seconds)
+        return pdf
+
+    def _release(self, loop):
+        """Free a render slot on the event loop; called from the executor's thread"""
+        try:
+            loop.call_soon_threadsafe(self._decrement)
+        except RuntimeError:
+            # The loop has closed during shutdown
+            pass
+
+    def _decrement(self):
+        self.pending -= 1
+
+    def stats(self) -> Dict:
+        """Queue depth and render timings"""
+        return {
+            "workers": self.workers,
+            "max_pending": self.max_pending,
+            "in_flight": self.pending,
+            "queue_depth": max(self.pending - self.workers, 0),
+            "rendered": self.rendered,
+            "failed": self.failed,
+            "rejected": self.rejected,
+            "avg_render_ms": round(1000 * self.render_seconds / self.rendered, 2) if self.rendered else None,
+            "avg_wait_ms": round(1000 * self.wait_seconds / self.rendered, 2) if self.rendered else None
+        }
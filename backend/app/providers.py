@@ -0,0 +1,386 @@
+from typing import Any, Dict, List, Optional, Tuple
+import asyncio
+import json
+import random
+import threading
+import time
+
+import aiohttp
+import requests
+from requests.adapters import HTTPAdapter
+from web3.providers import JSONBaseProvider
+from web3.providers.async_base import AsyncJSONBaseProvider
+from web3.types import RPCEndpoint, RPCResponse
+
+from .metrics import RPC_CALL_SECONDS, RPC_ENDPOINT_FAILURES
+
+
+# Reads that may be repeated, on any endpoint, without side effects
+IDEMPOTENT_METHODS = frozenset({
+    "eth_blockNumber",
+    "eth_call",
+    "eth_chainId",
+    "eth_estimateGas",
+    "eth_feeHistory",
+    "eth_gasPrice",
+    "eth_getBalance",
+    "eth_getBlockByHash",
+    "eth_getBlockByNumber",
+    "eth_getCode",
+    "eth_getLogs",
+    "eth_getTransactionByHash",
+    "eth_getTransactionCount",
+    "eth_getTransactionReceipt",
+    "eth_maxPriorityFeePerGas",
+    "eth_syncing",
+    "net_version",
+    "web3_clientVersion",
+})
+
+# Weight of the newest sample in an endpoint's smoothed latency
+LATENCY_SMOOTHING = 0.2
+
+# HTTP statuses worth retrying on another endpoint
+RETRY_STATUSES = frozenset({429, 502, 503, 504})
+
+
+class RPCUnavailable(Exception):
+    """No RPC endpoint answered the request"""
+
+
+def rpc_endpoints(primary_url: str, fallback_urls: str) -> List[str]:
+    """The primary RPC URL followed by the comma-separated fallbacks, without duplicates"""
+    urls = [primary_url] + [url.strip() for url in fallback_urls.split(",") if url.strip()]
+    return list(dict.fromkeys(urls))
+
+
+def is_idempotent(payload) -> bool:
+    """Whether a JSON-RPC request or batch only contains idempotent reads"""
+    calls = payload if isinstance(payload, list) else [payload]
+    return all(call.get("method") in IDEMPOTENT_METHODS for call in calls)
+
+
+def call_labels(payload, function_names: Dict[str, str]) -> Tuple[str, str]:
+    """Metric labels of a JSON-RPC request or batch: its method and, for contract calls, the function name"""
+    calls = payload if isinstance(payload, list) else [payload]
+    method = calls[0].get("method", "") if calls else ""
+    function = ""
+    if method in ("eth_call", "eth_estimateGas"):
+        params = calls[0].get("params") or [{}]
+        data = str(params[0].get("data") or params[0].get("input") or "")
+        function = function_names.get(data[:10], "")
+    return (f"batch:{method}" if isinstance(payload, list) else method), function
+
+
+class Endpoint:
+    def __init__(self, url: str):
+        self.url = url
+        self.latency: Optional[float] = None
+        self.down_until = 0.0
+        self.block_number: Optional[int] = None
+        self.requests = 0
+        self.failures = 0
+        self.last_error: Optional[str] = None
+
+    def stats(self) -> Dict:
+        return {
+            "url": self.url,
+            "healthy": self.down_until <= time.monotonic(),
+            "latency_ms": round(self.latency * 1000, 2) if self.latency is not None else None,
+            "block_number": self.block_number,
+            "requests": self.requests,
+            "failures": self.failures,
+            "last_error": self.last_error
+        }
+
+
+class EndpointPool:
+    """
+    RPC endpoints ranked for routing.
+
+    Requests go to the healthy endpoint with the lowest smoothed latency;
+    endpoints not measured yet come first so every one gets sampled. A
+    transport failure, or falling more than `max_block_lag` blocks behind
+    the best head seen by health checks, takes an endpoint out of rotation
+    for `cooldown` seconds. When every endpoint is down they are still
+    tried, soonest-recovering first.
+    """
+
+    def __init__(self, urls: List[str], cooldown: float = 10.0, max_block_lag: int = 5):
+        if not urls:
+            raise ValueError("At least one RPC URL is required")
+        self.endpoints = [Endpoint(url) for url in urls]
+        self.cooldown = cooldown
+        self.max_block_lag = max_block_lag
+        self._lock = threading.Lock()
+
+    def ranked(self) -> List[Endpoint]:
+        now = time.monotonic()
+        with self._lock:
+            healthy = [e for e in self.endpoints if e.down_until <= now]
+            down = [e for e in self.endpoints if e.down_until > now]
+            healthy.sort(key=lambda e: -1.0 if e.latency is None else e.latency)
+            down.sort(key=lambda e: e.down_until)
+        return healthy + down
+
+    def record_success(self, endpoint: Endpoint, elapsed: float):
+        with self._lock:
+            endpoint.requests += 1
+            endpoint.down_until = 0.0
+            if endpoint.latency is None:
+                endpoint.latency = elapsed
+            else:
+                endpoint.latency += LATENCY_SMOOTHING * (elapsed - endpoint.latency)
+
+    def record_failure(self, endpoint: Endpoint, error: str):
+        with self._lock:
+            endpoint.requests += 1
+            endpoint.failures += 1
+            endpoint.last_error = error
+            endpoint.down_until = time.monotonic() + self.cooldown
+        RPC_ENDPOINT_FAILURES.inc(endpoint=endpoint.url)
+
+    def record_head(self, endpoint: Endpoint, block_number: int):
+        """Note an endpoint's head block and take endpoints that lag too far behind out of rotation"""
+        with self._lock:
+            endpoint.block_number = block_number
+            best = max(e.block_number for e in self.endpoints if e.block_number is not None)
+            for e in self.endpoints:
+                if e.block_number is not None and best - e.block_number > self.max_block_lag:
+                    e.last_error = f"{best - e.block_number} blocks behind"
+                    e.down_until = time.monotonic() + self.cooldown
+
+    def stats(self) -> List[Dict]:
+        with self._lock:
+            return [endpoint.stats() for endpoint in self.endpoints]
+
+
+class RetryPolicy:
+    """Exponential backoff with jitter for idempotent reads"""
+
+    def __init__(self, max_retries: int = 3, backoff_base: float = 0.1, backoff_max: float = 2.0):
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+
+    def attempts(self, idempotent: bool) -> int:
+        return self.max_retries + 1 if idempotent else 1
+
+    def delay(self, attempt: int) -> float:
+        return min(self.backoff_base * 2 ** attempt, self.backoff_max) * random.uniform(0.5, 1.0)
+
+
+def create_endpoint_pool(primary_url: str, settings) -> EndpointPool:
+    return EndpointPool(
+        rpc_endpoints(primary_url, settings.rpc_fallback_urls),
+        cooldown=settings.rpc_unhealthy_cooldown,
+        max_block_lag=settings.rpc_max_block_lag
+    )
+
+
+def create_retry_policy(settings) -> RetryPolicy:
+    return RetryPolicy(settings.rpc_max_retries, settings.rpc_backoff_base, settings.rpc_backoff_max)
+
+
+class AsyncFailoverProvider(AsyncJSONBaseProvider):
+    """
+    AsyncWeb3 provider over an EndpointPool and one pooled aiohttp session.
+
+    Each call has its own timeout: `read_timeout` for idempotent reads and
+    `write_timeout` for everything else. Reads that fail at the transport
+    level are retried with backoff on the next best endpoint. Other calls
+    only move to another endpoint when the connection could not be opened,
+    since then the request never reached a node.
+    """
+
+    def __init__(
+        self,
+        pool: EndpointPool,
+        session: aiohttp.ClientSession,
+        retry: RetryPolicy,
+        read_timeout: float = 10.0,
+        write_timeout: float = 30.0,
+        health_interval: float = 5.0
+    ):
+        super().__init__()
+        self.pool = pool
+        self.session = session
+        self.retry = retry
+        self.read_timeout = read_timeout
+        self.write_timeout = write_timeout
+        self.health_interval = health_interval
+        self.function_names: Dict[str, str] = {}
+        self._health_task = None
+
+    async def make_request(self, method: RPCEndpoint, params: Any) -> RPCResponse:
+        method_label, function = call_labels({"method": method, "params": params}, self.function_names)
+        with RPC_CALL_SECONDS.time(method=method_label, function=function):
+            return await self.post(self.encode_rpc_request(method, params), method in IDEMPOTENT_METHODS)
+
+    async def post_json(self, payload) -> Any:
+        """Post a JSON-RPC request or batch; retried when it only contains idempotent reads"""
+        method_label, function = call_labels(payload, self.function_names)
+        with RPC_CALL_SECONDS.time(method=method_label, function=function):
+            return await self.post(json.dumps(payload).encode(), is_idempotent(payload))
+
+    async def post(self, data: bytes, idempotent: bool) -> Any:
+        timeout = aiohttp.ClientTimeout(total=self.read_timeout if idempotent else self.write_timeout)
+        attempts = self.retry.attempts(idempotent)
+        tried = set()
+        error = None
+
+        attempt = 0
+        while attempt < attempts:
+            endpoint = next((e for e in self.pool.ranked() if e.url not in tried), None)
+            if endpoint is None:
+                tried.clear()
+                endpoint = self.pool.ranked()[0]
+            tried.add(endpoint.url)
+
+            started = time.perf_counter()
+            try:
+                async with self.session.post(
+                    endpoint.url, data=data, headers={"Content-Type": "application/json"}, timeout=timeout
+                ) as response:
+                    if response.status in RETRY_STATUSES:
+                        raise aiohttp.ClientResponseError(
+                            response.request_info, response.history, status=response.status, message=response.reason
+                        )
+                    response.raise_for_status()
+                    body = await response.read()
+                self.pool.record_success(endpoint, time.perf_counter() - started)
+                return json.loads(body)
+
+            except aiohttp.ClientConnectorError as e:
+                # Never reached the node: safe to send anywhere else, even for writes
+                error = e
+                self.pool.record_failure(endpoint, str(e))
+                if not idempotent and len(tried) < len(self.pool.endpoints):
+                    continue
+
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                error = e
+                self.pool.record_failure(endpoint, str(e) or type(e).__name__)
+
+            attempt += 1
+            if attempt < attempts:
+                await asyncio.sleep(self.retry.delay(attempt - 1))
+
+        raise RPCUnavailable(f"RPC request failed on every endpoint: {str(error) or type(error).__name__}")
+
+    async def check_health(self):
+        """Probe every endpoint with eth_blockNumber, refreshing latency and head block"""
+        data = self.encode_rpc_request(RPCEndpoint("eth_blockNumber"), [])
+        timeout = aiohttp.ClientTimeout(total=self.read_timeout)
+
+        async def probe(endpoint: Endpoint):
+            started = time.perf_counter()
+            try:
+                async with self.session.post(
+                    endpoint.url, data=data, headers={"Content-Type": "application/json"}, timeout=timeout
+                ) as response:
+                    response.raise_for_status()
+                    reply = json.loads(await response.read())
+                self.pool.record_success(endpoint, time.perf_counter() - started)
+                self.pool.record_head(endpoint, int(reply["result"], 16))
+            except Exception as e:
+                self.pool.record_failure(endpoint, str(e) or type(e).__name__)
+
+        await asyncio.gather(*(probe(endpoint) for endpoint in self.pool.endpoints))
+
+    def start(self):
+        if self._health_task is None and self.health_interval > 0:
+            self._health_task = asyncio.create_task(self._run_health_checks())
+
+    async def stop(self):
+        if self._health_task is not None:
+            self._health_task.cancel()
+            try:
+                await self._health_task
+            except asyncio.CancelledError:
+                pass
+            self._health_task = None
+
+    async def _run_health_checks(self):
+        while True:
+            await self.check_health()
+            await asyncio.sleep(self.health_interval)
+
+
+class FailoverHTTPProvider(JSONBaseProvider):
+    """
+    Blocking counterpart of AsyncFailoverProvider for BlockchainService,
+    over a keep-alive requests session sized to `pool_size` connections per
+    endpoint. Endpoints recover passively once their cooldown expires.
+    """
+
+    def __init__(
+        self,
+        pool: EndpointPool,
+        retry: RetryPolicy,
+        pool_size: int = 10,
+        read_timeout: float = 10.0,
+        write_timeout: float = 30.0
+    ):
+        super().__init__()
+        self.pool = pool
+        self.retry = retry
+        self.read_timeout = read_timeout
+        self.write_timeout = write_timeout
+        self.function_names: Dict[str, str] = {}
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=len(pool.endpoints), pool_maxsize=pool_size, max_retries=0)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def make_request(self, method: RPCEndpoint, params: Any) -> RPCResponse:
+        method_label, function = call_labels({"method": method, "params": params}, self.function_names)
+        with RPC_CALL_SECONDS.time(method=method_label, function=function):
+            return self.post(self.encode_rpc_request(method, params), method in IDEMPOTENT_METHODS)
+
+    def post_json(self, payload) -> Any:
+        """Post a JSON-RPC request or batch; retried when it only contains idempotent reads"""
+        method_label, function = call_labels(payload, self.function_names)
+        with RPC_CALL_SECONDS.time(method=method_label, function=function):
+            return self.post(json.dumps(payload).encode(), is_idempotent(payload))
+
+    def post(self, data: bytes, idempotent: bool) -> Any:
+        timeout = self.read_timeout if idempotent else self.write_timeout
+        attempts = self.retry.attempts(idempotent)
+        tried = set()
+        error = None
+
+        attempt = 0
+        while attempt < attempts:
+            endpoint = next((e for e in self.pool.ranked() if e.url not in tried), None)
+            if endpoint is None:
+                tried.clear()
+                endpoint = self.pool.ranked()[0]
+            tried.add(endpoint.url)
+
+            started = time.perf_counter()
+            try:
+                response = self.session.post(
+                    endpoint.url, data=data, headers={"Content-Type": "application/json"}, timeout=timeout
+                )
+                if response.status_code in RETRY_STATUSES:
+                    raise requests.HTTPError(f"{response.status_code} {response.reason}", response=response)
+                response.raise_for_status()
+                self.pool.record_success(endpoint, time.perf_counter() - started)
+                return response.json()
+
+            except requests.ConnectionError as e:
+                error = e
+                self.pool.record_failure(endpoint, str(e))
+                if not idempotent and len(tried) < len(self.pool.endpoints):
+                    continue
+
+            except requests.RequestException as e:
+                error = e
+                self.pool.record_failure(endpoint, str(e))
+
+            attempt += 1
+            if attempt < attempts:
+                time.sleep(self.retry.delay(attempt - 1))
+
+        raise RPCUnavailable(f"RPC request failed on every endpoint: {error}")
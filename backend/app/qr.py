@@ -0,0 +1,73 @@
+from collections import OrderedDict
+from typing import Dict, Tuple
+import io
+import threading
+import time
+
+from .metrics import CACHE_REQUESTS, QR_RENDER_SECONDS
+
+
+FORMATS = ("png", "svg")
+
+
+class QRCodeService:
+    """
+    Verification QR codes rendered straight to memory as PNG or SVG.
+
+    Output is memoized per (credential ID, format) in an LRU of
+    `max_entries`, so /qr and /pdf encode each credential's code once.
+    The SVG form lets WeasyPrint embed vectors without PNG encoding.
+    qrcode (and Pillow behind it) is imported on the first render.
+    """
+
+    def __init__(self, frontend_url: str, max_entries: int = 10000):
+        self.frontend_url = frontend_url
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple[str, str], bytes]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def verification_url(self, credential_id: str) -> str:
+        return f"{self.frontend_url}/verify/{credential_id}"
+
+    def render(self, credential_id: str, fmt: str = "png") -> bytes:
+        """QR code image bytes for a credential's verification URL"""
+        if fmt not in FORMATS:
+            raise ValueError(f"Unsupported QR format: {fmt}")
+
+        key = (credential_id, fmt)
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                CACHE_REQUESTS.inc(cache="qr", result="hit")
+                return self._entries[key]
+        CACHE_REQUESTS.inc(cache="qr", result="miss")
+
+        import qrcode
+        import qrcode.image.svg
+
+        started = time.perf_counter()
+        qr = qrcode.QRCode(
+            version=1,
+            error_correction=qrcode.constants.ERROR_CORRECT_L,
+            box_size=10,
+            border=4,
+        )
+        qr.add_data(self.verification_url(credential_id))
+        qr.make(fit=True)
+
+        if fmt == "svg":
+            data = qr.make_image(image_factory=qrcode.image.svg.SvgPathImage).to_string()
+        else:
+            buffer = io.BytesIO()
+            qr.make_image(fill_color="black", back_color="white").save(buffer, format="PNG")
+            data = buffer.getvalue()
+        QR_RENDER_SECONDS.observe(time.perf_counter() - started, format=fmt)
+
+        with self._lock:
+            self._entries[key] = data
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return data
+
+    def stats(self) -> Dict:
+        return {"entries": len(self._entries), "max_entries": self.max_entries}
@@ -0,0 +1,381 @@
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+import asyncio
+import gzip
+import sqlite3
+import threading
+
+from web3 import Web3
+
+from .events import EVENT_TOPICS, topics_for
+
+
+# Smallest status list, in bits (16 KB uncompressed, as StatusList2021 recommends),
+# so the list size says little about how many credentials an issuer has
+STATUS_LIST_MIN_BITS = 131072
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS status_entries (
+    id_hash TEXT PRIMARY KEY,
+    issuer TEXT NOT NULL,
+    status_index INTEGER NOT NULL,
+    block_number INTEGER NOT NULL,
+    UNIQUE (issuer, status_index)
+);
+
+CREATE TABLE IF NOT EXISTS status_lists (
+    issuer TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    version INTEGER NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS revocations (
+    id_hash TEXT PRIMARY KEY,
+    block_number INTEGER NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS issuers (
+    address TEXT PRIMARY KEY,
+    is_authorized INTEGER NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS cursors (
+    name TEXT PRIMARY KEY,
+    block_number INTEGER NOT NULL
+);
+"""
+
+
+def status_list_capacity(size: int, min_bits: int = STATUS_LIST_MIN_BITS) -> int:
+    """Bits in a status list holding `size` entries; lists grow in steps of `min_bits`"""
+    return max(1, -(-size // min_bits)) * min_bits
+
+
+class StatusList:
+    """
+    Revocation bitstring of one issuer in the StatusList2021 layout.
+
+    Bit `index`, counting from the most significant bit of the first byte,
+    is set once the credential with that status index is revoked. Built
+    from a RevocationStore snapshot; `version` changes whenever the list
+    does, so it identifies the bits across processes.
+    """
+
+    def __init__(self, size: int, version: int, revoked: Iterable[int] = (), min_bits: int = STATUS_LIST_MIN_BITS):
+        self.size = size
+        self.version = version
+        self.bits = bytearray(status_list_capacity(size, min_bits) // 8)
+        for index in revoked:
+            self.bits[index // 8] |= 0x80 >> (index % 8)
+        self._compressed: Optional[bytes] = None
+
+    def is_revoked(self, index: int) -> bool:
+        return bool(self.bits[index // 8] & (0x80 >> (index % 8)))
+
+    def compressed(self) -> bytes:
+        """The bitstring, gzip-compressed; identical for identical bits"""
+        if self._compressed is None:
+            self._compressed = gzip.compress(bytes(self.bits), mtime=0)
+        return self._compressed
+
+
+def status_list_bit(compressed: bytes, index: int) -> bool:
+    """Whether bit `index` is set in a gzip-compressed status list, for verifiers holding a downloaded copy"""
+    bits = gzip.decompress(compressed)
+    return bool(bits[index // 8] & (0x80 >> (index % 8)))
+
+
+class RevocationStore:
+    """
+    SQLite record of the revocation state: status list indices, revoked ID
+    hashes and issuer authorizations, with the block they are current to.
+
+    Status indices are assigned once and never change, so credentials keep
+    their bit across restarts and every process reading the file sees the
+    same lists. Each range is applied in one write transaction that first
+    checks the cursor, so a range is applied once even with several writers.
+    """
+
+    CURSOR = "revocations"
+
+    def __init__(self, db_path: str, min_bits: int = STATUS_LIST_MIN_BITS):
+        Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        self.min_bits = min_bits
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(SCHEMA)
+
+    def get_cursor(self) -> Optional[int]:
+        """Last block whose logs are fully applied"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT block_number FROM cursors WHERE name = ?", (self.CURSOR,)
+            ).fetchone()
+        return row["block_number"] if row else None
+
+    def apply(self, from_block: int, to_block: int, events: Iterable[Tuple], authorized: Iterable[str] = ()) -> bool:
+        """
+        Apply the logs of blocks from_block..to_block and advance the cursor.
+
+        `events` are (event_name, key, issuer, block_number) in log order, with
+        `key` the credential ID hash or, for issuer events, the issuer address.
+        `authorized` seeds issuers authorized without an event (the deployer).
+        Returns False when the range was already applied.
+        """
+        with self._lock, self._conn:
+            self._conn.execute("BEGIN IMMEDIATE")
+            row = self._conn.execute(
+                "SELECT block_number FROM cursors WHERE name = ?", (self.CURSOR,)
+            ).fetchone()
+            if row is not None and row["block_number"] >= from_block:
+                return False
+
+            for address in authorized:
+                self._conn.execute(
+                    "INSERT OR IGNORE INTO issuers (address, is_authorized) VALUES (?, 1)", (address,)
+                )
+            for event_name, key, issuer, block_number in events:
+                if event_name == "CredentialIssued":
+                    self._issue(key, issuer, block_number)
+                elif event_name == "CredentialRevoked":
+                    self._revoke(key, block_number)
+                elif event_name in ("IssuerAuthorized", "IssuerRevoked"):
+                    self._conn.execute(
+                        """
+                        INSERT INTO issuers (address, is_authorized) VALUES (?, ?)
+                        ON CONFLICT (address) DO UPDATE SET is_authorized = excluded.is_authorized
+                        """,
+                        (key, int(event_name == "IssuerAuthorized"))
+                    )
+            self._conn.execute(
+                """
+                INSERT INTO cursors (name, block_number) VALUES (?, ?)
+                ON CONFLICT (name) DO UPDATE SET block_number = excluded.block_number
+                """,
+                (self.CURSOR, to_block)
+            )
+        return True
+
+    def _issue(self, id_hash: str, issuer: str, block_number: int):
+        """Give a credential the next index of its issuer's list; a list growing past its capacity changes version"""
+        if self._conn.execute("SELECT 1 FROM status_entries WHERE id_hash = ?", (id_hash,)).fetchone():
+            return
+        row = self._conn.execute("SELECT size, version FROM status_lists WHERE issuer = ?", (issuer,)).fetchone()
+        size, version = (row["size"], row["version"]) if row else (0, 0)
+        if status_list_capacity(size + 1, self.min_bits) > status_list_capacity(size, self.min_bits):
+            version += 1
+        self._conn.execute(
+            "INSERT INTO status_entries (id_hash, issuer, status_index, block_number) VALUES (?, ?, ?, ?)",
+            (id_hash, issuer, size, block_number)
+        )
+        self._conn.execute(
+            """
+            INSERT INTO status_lists (issuer, size, version) VALUES (?, ?, ?)
+            ON CONFLICT (issuer) DO UPDATE SET size = excluded.size, version = excluded.version
+            """,
+            (issuer, size + 1, version)
+        )
+
+    def _revoke(self, id_hash: str, block_number: int):
+        cursor = self._conn.execute(
+            "INSERT OR IGNORE INTO revocations (id_hash, block_number) VALUES (?, ?)", (id_hash, block_number)
+        )
+        if cursor.rowcount:
+            self._conn.execute(
+                """
+                UPDATE status_lists SET version = version + 1
+                WHERE issuer = (SELECT issuer FROM status_entries WHERE id_hash = ?)
+                """,
+                (id_hash,)
+            )
+
+    def is_revoked(self, id_hash: str) -> bool:
+        with self._lock:
+            return self._conn.execute("SELECT 1 FROM revocations WHERE id_hash = ?", (id_hash,)).fetchone() is not None
+
+    def is_authorized(self, address: str) -> bool:
+        with self._lock:
+            row = self._conn.execute("SELECT is_authorized FROM issuers WHERE address = ?", (address,)).fetchone()
+        return bool(row and row["is_authorized"])
+
+    def status_entry(self, id_hash: str) -> Optional[Tuple[str, int]]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT issuer, status_index FROM status_entries WHERE id_hash = ?", (id_hash,)
+            ).fetchone()
+        return (row["issuer"], row["status_index"]) if row else None
+
+    def status_list_version(self, issuer: str) -> Optional[Tuple[int, int]]:
+        """(size, version) of an issuer's list, or None if it has none"""
+        with self._lock:
+            row = self._conn.execute("SELECT size, version FROM status_lists WHERE issuer = ?", (issuer,)).fetchone()
+        return (row["size"], row["version"]) if row else None
+
+    def load_status_list(self, issuer: str) -> Optional[StatusList]:
+        with self._lock:
+            row = self._conn.execute("SELECT size, version FROM status_lists WHERE issuer = ?", (issuer,)).fetchone()
+            if row is None:
+                return None
+            revoked = [
+                r["status_index"] for r in self._conn.execute(
+                    """
+                    SELECT e.status_index FROM status_entries e
+                    JOIN revocations r ON r.id_hash = e.id_hash
+                    WHERE e.issuer = ?
+                    """,
+                    (issuer,)
+                )
+            ]
+        return StatusList(row["size"], row["version"], revoked, self.min_bits)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            counts = self._conn.execute(
+                """
+                SELECT
+                    (SELECT COUNT(*) FROM revocations) AS revoked,
+                    (SELECT COUNT(*) FROM issuers WHERE is_authorized = 1) AS issuers,
+                    (SELECT COUNT(*) FROM status_lists) AS status_lists,
+                    (SELECT COUNT(*) FROM status_entries) AS credentials
+                """
+            ).fetchone()
+        return dict(counts)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class RevocationRegistry:
+    """
+    Revocation state of the contract, kept in a RevocationStore: revoked
+    credential ID hashes, authorized issuers and a StatusList per issuer.
+
+    Polls replay CredentialIssued, CredentialRevoked, IssuerAuthorized and
+    IssuerRevoked logs in `max_block_range` chunks, from `start_block` for a
+    new store and from its cursor afterwards, and only for blocks at least
+    `confirmations` deep, so a reorg cannot hand out a status index twice.
+    Lookups are as current as `synced_block`. Status lists are rebuilt from
+    the store when their version changes. With a `leader` HostLock, only the
+    process holding it polls; the others read the store it writes.
+    """
+
+    def __init__(
+        self,
+        blockchain_service,
+        store: RevocationStore,
+        poll_interval: float = 2.0,
+        start_block: int = 0,
+        max_block_range: int = 2000,
+        confirmations: int = 0
+    ):
+        self.blockchain_service = blockchain_service
+        self.store = store
+        self.poll_interval = poll_interval
+        self.start_block = start_block
+        self.max_block_range = max_block_range
+        self.confirmations = confirmations
+        self._status_lists: Dict[str, StatusList] = {}
+        self._task = None
+        self.leader = None
+
+    @property
+    def synced_block(self) -> Optional[int]:
+        return self.store.get_cursor()
+
+    def start(self):
+        if self._task is None and self.blockchain_service.contract is not None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self):
+        while True:
+            if self.leader is None or self.leader.acquire():
+                try:
+                    await self.poll()
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    print(f"Error polling revocations: {e}")
+            await asyncio.sleep(self.poll_interval)
+
+    async def poll(self):
+        """Apply credential and issuer logs up to the confirmed head"""
+        service = self.blockchain_service
+        synced_block = await asyncio.to_thread(self.store.get_cursor)
+        authorized = []
+        if synced_block is None:
+            # The deployer is authorized in the constructor, which emits no event
+            owner = await service.contract.functions.owner().call()
+            authorized.append(owner.lower())
+
+        safe_block = await service.w3.eth.block_number - self.confirmations
+        from_block = self.start_block if synced_block is None else synced_block + 1
+        while from_block <= safe_block:
+            to_block = min(safe_block, from_block + self.max_block_range - 1)
+            logs = await service.w3.eth.get_logs({
+                "address": service.contract.address,
+                "fromBlock": from_block,
+                "toBlock": to_block,
+                "topics": [topics_for("CredentialIssued", "CredentialRevoked", "IssuerAuthorized", "IssuerRevoked")]
+            })
+            events = self.events_from(logs)
+            await asyncio.to_thread(self.store.apply, from_block, to_block, events, authorized)
+            authorized = []
+            from_block = to_block + 1
+
+    @staticmethod
+    def events_from(logs: List) -> List[Tuple]:
+        """Store events for logs, in log order; logs removed by a reorg are dropped"""
+        events = []
+        for log in sorted(logs, key=lambda log: (log["blockNumber"], log["logIndex"])):
+            if log.get("removed"):
+                continue
+            event_name = EVENT_TOPICS.get(log["topics"][0].hex())
+            if event_name in ("CredentialIssued", "CredentialRevoked"):
+                issuer = Web3.to_checksum_address(log["topics"][2][-20:]).lower()
+                events.append((event_name, log["topics"][1].hex(), issuer, log["blockNumber"]))
+            elif event_name in ("IssuerAuthorized", "IssuerRevoked"):
+                address = Web3.to_checksum_address(log["topics"][1][-20:]).lower()
+                events.append((event_name, address, None, log["blockNumber"]))
+        return events
+
+    def is_ready(self) -> bool:
+        return self.synced_block is not None
+
+    def is_revoked(self, id_hash: str) -> bool:
+        """Whether the credential with this keccak ID hash has been revoked"""
+        return self.store.is_revoked(id_hash)
+
+    def is_authorized(self, address: str) -> bool:
+        return self.store.is_authorized(address.lower())
+
+    def status_entry(self, id_hash: str) -> Optional[Tuple[str, int]]:
+        """(issuer, index) of a credential in its issuer's status list, or None if not seen issued"""
+        return self.store.status_entry(id_hash)
+
+    def status_list(self, issuer: str) -> Optional[StatusList]:
+        """Current status list of an issuer, rebuilt from the store when its version has changed"""
+        issuer = issuer.lower()
+        current = self.store.status_list_version(issuer)
+        if current is None:
+            return None
+        cached = self._status_lists.get(issuer)
+        if cached is None or cached.version != current[1]:
+            cached = self._status_lists[issuer] = self.store.load_status_list(issuer)
+        return cached
+
+    def stats(self) -> Dict:
+        return dict(self.store.stats(), synced_block=self.synced_block)
@@ -0,0 +1,226 @@
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Optional
+import json
+import sqlite3
+import threading
+
+from eth_account import Account
+from eth_account.messages import SignableMessage, encode_typed_data
+from web3 import Web3
+
+
+# EIP-712 domain of signed credential documents, bound to one chain and contract
+DOMAIN_NAME = "CredentialVerification"
+DOMAIN_VERSION = "1"
+
+# Typed fields of a signed document; the contract's Credential struct without isValid,
+# which verifiers take from the revocation state instead
+CREDENTIAL_TYPE = [
+    {"name": "credentialId", "type": "string"},
+    {"name": "recipientName", "type": "string"},
+    {"name": "recipientEmail", "type": "string"},
+    {"name": "issuerName", "type": "string"},
+    {"name": "credentialType", "type": "string"},
+    {"name": "description", "type": "string"},
+    {"name": "issueDate", "type": "uint256"},
+    {"name": "issuer", "type": "address"},
+    {"name": "metadataURI", "type": "string"},
+]
+
+DOMAIN_TYPE = [
+    {"name": "name", "type": "string"},
+    {"name": "version", "type": "string"},
+    {"name": "chainId", "type": "uint256"},
+    {"name": "verifyingContract", "type": "address"},
+]
+
+DOCUMENT_FIELDS = tuple(field["name"] for field in CREDENTIAL_TYPE)
+
+
+def document_domain(chain_id: int, contract_address: str) -> Dict:
+    return {
+        "name": DOMAIN_NAME,
+        "version": DOMAIN_VERSION,
+        "chainId": chain_id,
+        "verifyingContract": Web3.to_checksum_address(contract_address)
+    }
+
+
+def document_message(credential: Dict, domain: Dict) -> SignableMessage:
+    """EIP-712 typed-data message over a document's credential fields"""
+    return encode_typed_data(full_message={
+        "types": {"EIP712Domain": DOMAIN_TYPE, "Credential": CREDENTIAL_TYPE},
+        "primaryType": "Credential",
+        "domain": domain,
+        "message": {field: credential[field] for field in DOCUMENT_FIELDS}
+    })
+
+
+def sign_credential(credential: Dict, private_key: str, chain_id: int, contract_address: str) -> Dict:
+    """
+    Signed document for an on-chain credential (as returned by getCredential).
+    The key must belong to the credential's issuer.
+    """
+    account = Account.from_key(private_key)
+    if account.address.lower() != credential["issuer"].lower():
+        raise Exception("Signing key does not belong to the credential's issuer")
+
+    fields = {field: credential[field] for field in DOCUMENT_FIELDS}
+    domain = document_domain(chain_id, contract_address)
+    signature = Account.sign_message(document_message(fields, domain), private_key).signature
+    return {"credential": fields, "domain": domain, "signature": signature.hex()}
+
+
+def document_mismatch(document: Dict, credential: Dict, chain_id: int, contract_address: str) -> Optional[str]:
+    """
+    Why a document submitted for an on-chain credential does not belong to it:
+    its fields differ from the chain, it was signed for another domain or not
+    by the credential's issuer. None when it does belong.
+    """
+    fields = document["credential"]
+    for field in DOCUMENT_FIELDS:
+        value, expected = fields.get(field), credential[field]
+        if field == "issuer":
+            value, expected = str(value).lower(), expected.lower()
+        if value != expected:
+            return f"Document field {field} does not match the credential on chain"
+
+    domain = document_domain(chain_id, contract_address)
+    if document["domain"] != domain:
+        return "Document was signed for another chain or contract"
+    try:
+        signer = Account.recover_message(
+            document_message(fields, domain),
+            signature=bytes.fromhex(document["signature"].removeprefix("0x"))
+        )
+    except Exception:
+        return "Malformed signature"
+    if signer.lower() != credential["issuer"].lower():
+        return "Signature does not match the credential issuer"
+    return None
+
+
+class SignedDocumentStore:
+    """
+    SQLite store of signed documents by credential ID: signed by the backend
+    when it issues a credential, or uploaded by issuers who hold their own key.
+    """
+
+    def __init__(self, db_path: str):
+        Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS documents (credential_id TEXT PRIMARY KEY, document TEXT NOT NULL)"
+            )
+
+    def get(self, credential_id: str) -> Optional[Dict]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT document FROM documents WHERE credential_id = ?", (credential_id,)
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def put(self, credential_id: str, document: Dict):
+        with self._lock, self._conn:
+            self._conn.execute(
+                """
+                INSERT INTO documents (credential_id, document) VALUES (?, ?)
+                ON CONFLICT (credential_id) DO UPDATE SET document = excluded.document
+                """,
+                (credential_id, json.dumps(document))
+            )
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class DocumentVerifier:
+    """
+    Checks signed credential documents without touching the chain.
+
+    A document is valid when its signature recovers to the credential's
+    issuer, that issuer is authorized and the credential is not revoked,
+    as far as `registry` (a RevocationRegistry, or any object with
+    `is_revoked(id_hash)` and `is_authorized(address)`) knows. Recovered
+    signers are kept in an LRU keyed by the fields and signature, so a
+    document seen before skips both EIP-712 hashing and key recovery.
+    """
+
+    def __init__(self, registry, chain_id: int, contract_address: str, max_entries: int = 10000):
+        self.registry = registry
+        self.domain = document_domain(chain_id, contract_address)
+        self.max_entries = max_entries
+        self._signers: "OrderedDict[str, str]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def recover_signer(self, document: Dict) -> str:
+        """Address that signed the document's credential fields under this verifier's domain"""
+        credential = document["credential"]
+        key = json.dumps([[credential[field] for field in DOCUMENT_FIELDS], document["signature"].lower()])
+        with self._lock:
+            signer = self._signers.get(key)
+            if signer is not None:
+                self._signers.move_to_end(key)
+                return signer
+
+        # Recovery runs outside the lock; verify() is called from the threadpool
+        signer = Account.recover_message(
+            document_message(credential, self.domain),
+            signature=bytes.fromhex(document["signature"].removeprefix("0x"))
+        )
+        with self._lock:
+            self._signers[key] = signer
+            while len(self._signers) > self.max_entries:
+                self._signers.popitem(last=False)
+        return signer
+
+    def verify(self, document: Dict) -> Dict:
+        """Verification dict: signature_valid, issuer_authorized, revoked, is_valid and a reason when invalid"""
+        credential = document["credential"]
+        result = {
+            "signature_valid": False,
+            "issuer_authorized": False,
+            "revoked": False,
+            "is_valid": False,
+            "signer": None,
+            "reason": None
+        }
+
+        domain = document["domain"]
+        if (
+            domain.get("name") != self.domain["name"]
+            or domain.get("version") != self.domain["version"]
+            or domain.get("chainId") != self.domain["chainId"]
+            or str(domain.get("verifyingContract", "")).lower() != self.domain["verifyingContract"].lower()
+        ):
+            result["reason"] = "Document was signed for another chain or contract"
+            return result
+        try:
+            result["signer"] = self.recover_signer(document)
+        except Exception:
+            result["reason"] = "Malformed document or signature"
+            return result
+
+        result["signature_valid"] = result["signer"].lower() == credential["issuer"].lower()
+        result["issuer_authorized"] = self.registry.is_authorized(credential["issuer"])
+        result["revoked"] = self.registry.is_revoked(Web3.keccak(text=credential["credentialId"]).hex())
+
+        if not result["signature_valid"]:
+            result["reason"] = "Signature does not match the credential issuer"
+        elif not result["issuer_authorized"]:
+            result["reason"] = "Issuer is not authorized"
+        elif result["revoked"]:
+            result["reason"] = "Credential has been revoked"
+        else:
+            result["is_valid"] = True
+        return result
+
+
+def verify_document(document: Dict, registry, chain_id: int, contract_address: str) -> Dict:
+    """Check one signed document locally; see DocumentVerifier"""
+    return DocumentVerifier(registry, chain_id, contract_address, max_entries=0).verify(document)
@@ -0,0 +1,44 @@
+from typing import Any, Awaitable, Callable, Dict, Hashable
+import asyncio
+
+from .metrics import SINGLEFLIGHT_CALLS
+
+
+class SingleFlight:
+    """
+    Joins concurrent identical reads into one call.
+
+    The first caller for a key starts the load as a task; callers arriving
+    while it is in flight await that same task and get its result or
+    exception. The entry is dropped as soon as the load finishes, so this
+    only merges simultaneous requests and never serves stale data. A
+    caller that is cancelled leaves the load running for the others.
+    """
+
+    def __init__(self):
+        self._flights: Dict[Hashable, asyncio.Task] = {}
+        self.started = 0
+        self.joined = 0
+
+    async def do(self, key: Hashable, loader: Callable[[], Awaitable[Any]], kind: str = "read") -> Any:
+        task = self._flights.get(key)
+        if task is None or task.done():
+            task = asyncio.ensure_future(loader())
+            self._flights[key] = task
+            task.add_done_callback(lambda finished: self._land(key, finished))
+            self.started += 1
+            SINGLEFLIGHT_CALLS.inc(kind=kind, result="started")
+        else:
+            self.joined += 1
+            SINGLEFLIGHT_CALLS.inc(kind=kind, result="joined")
+        return await asyncio.shield(task)
+
+    def _land(self, key: Hashable, task: asyncio.Task):
+        if self._flights.get(key) is task:
+            del self._flights[key]
+        if not task.cancelled():
+            # Mark the exception retrieved in case every caller was cancelled
+            task.exception()
+
+    def stats(self) -> Dict:
+        return {"in_flight": len(self._flights), "started": self.started, "joined": self.joined}
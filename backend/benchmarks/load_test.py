@@ -0,0 +1,333 @@
+"""
+End-to-end load test against a local Hardhat chain.
+
+Boots `npx hardhat node`, deploys the contract with scripts/deploy.js,
+starts the API with uvicorn, seeds `--seed` credentials through the batch
+endpoint and then drives each scenario at every `--concurrency` level:
+
+  verify       GET  /api/credentials/verify/{id}
+  get          GET  /api/credentials/{id}
+  issuer       GET  /api/issuers/{address}/credentials?limit=N
+  recipient    GET  /api/recipients/{email}/credentials
+  qr           GET  /api/credentials/{id}/qr
+  pdf          GET  /api/credentials/{id}/pdf
+  issue        POST /api/credentials/issue (time until the 202)
+
+Latency percentiles (p50/p95/p99), throughput and error counts are printed
+and written as JSON, tagged with the current git commit, so runs on two
+commits can be compared with --baseline.
+
+Usage (from backend/, with smart-contracts/ npm-installed):
+    python benchmarks/load_test.py [--seed 2000] [--concurrency 1,10,50] \
+        [--duration 10] [--scenarios verify,get,pdf] \
+        [--output benchmarks/results/run.json] [--baseline old.json]
+
+Pass --no-node / --no-api to reuse a chain or API that is already running
+(with --no-node the contract is still deployed unless --no-deploy is given).
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import shlex
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+import aiohttp
+from eth_account import Account
+
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+CONTRACTS_DIR = os.path.join(BACKEND_DIR, "..", "smart-contracts")
+
+# Hardhat's first default account; it deploys the contract and is therefore an authorized issuer
+HARDHAT_KEY = "0xac0974bec39a17e36ba4a6b4d238ff944bacb478cbed5efcae784d7bf4f2ff80"
+HARDHAT_ACCOUNT = Account.from_key(HARDHAT_KEY).address
+
+SCENARIOS = ("verify", "get", "issuer", "recipient", "qr", "pdf", "issue")
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=BACKEND_DIR, text=True, stderr=subprocess.DEVNULL
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def percentile(ordered, fraction: float) -> float:
+    if not ordered:
+        return 0.0
+    return ordered[min(max(int(round(len(ordered) * fraction)) - 1, 0), len(ordered) - 1)]
+
+
+async def wait_for(session, method: str, url: str, timeout: float, **kwargs):
+    """Poll until `url` answers with a 2xx status"""
+    deadline = time.perf_counter() + timeout
+    while time.perf_counter() < deadline:
+        try:
+            async with session.request(method, url, **kwargs) as response:
+                if response.status < 300:
+                    return
+        except aiohttp.ClientError:
+            pass
+        await asyncio.sleep(0.5)
+    raise RuntimeError(f"{url} did not come up within {timeout:.0f}s")
+
+
+def credential_payload(index: int, recipients: int) -> dict:
+    return {
+        "recipient_name": f"Load Test Recipient {index % recipients}",
+        "recipient_email": f"load{index % recipients}@example.com",
+        "issuer_name": "Load Test University",
+        "issuer_address": HARDHAT_ACCOUNT,
+        "credential_type": "Load Test Certificate",
+        "description": f"Seeded credential {index}",
+    }
+
+
+async def wait_for_jobs(session, api: str, job_ids, timeout: float = 300.0, interval: float = 0.5) -> dict:
+    """Poll /api/jobs until every job has settled or `timeout` passes; returns each job's last status"""
+    statuses = {job_id: "pending" for job_id in job_ids}
+    deadline = time.perf_counter() + timeout
+    while time.perf_counter() < deadline:
+        pending = [job_id for job_id, status in statuses.items() if status == "pending"]
+        if not pending:
+            break
+        for job_id in pending:
+            async with session.get(f"{api}/api/jobs/{job_id}") as response:
+                if response.status == 200:
+                    statuses[job_id] = (await response.json())["status"]
+        await asyncio.sleep(interval)
+    return statuses
+
+
+async def seed(session, api: str, count: int, recipients: int, chunk: int):
+    """Issue `count` credentials with contract-level batches; returns the IDs mined and the time taken"""
+    results = []
+    start = time.perf_counter()
+    for offset in range(0, count, chunk):
+        batch = [credential_payload(i, recipients) for i in range(offset, min(offset + chunk, count))]
+        async with session.post(f"{api}/api/credentials/issue/batch?mode=contract", json={"credentials": batch}) as response:
+            body = await response.json()
+            if response.status != 202:
+                raise RuntimeError(f"Seeding failed: {body}")
+        results += body["results"]
+        if body["failed"]:
+            print(f"  {body['failed']} of {len(batch)} credentials failed to broadcast", file=sys.stderr)
+        print(f"  broadcast {len(results)}/{count}", end="\r", file=sys.stderr)
+    print(file=sys.stderr)
+
+    statuses = await wait_for_jobs(session, api, {result["job_id"] for result in results if result["job_id"]})
+    credential_ids = [result["credential_id"] for result in results if statuses.get(result["job_id"]) == "mined"]
+    if len(credential_ids) < count:
+        print(f"  {count - len(credential_ids)} of {count} credentials were not mined", file=sys.stderr)
+    return credential_ids, time.perf_counter() - start
+
+
+def scenario_request(name: str, args, credential_ids, counter):
+    """(method, path, json body) for the next request of a scenario"""
+    credential_id = random.choice(credential_ids)
+    if name == "verify":
+        return "GET", f"/api/credentials/verify/{credential_id}", None
+    if name == "get":
+        return "GET", f"/api/credentials/{credential_id}", None
+    if name == "issuer":
+        return "GET", f"/api/issuers/{HARDHAT_ACCOUNT}/credentials?limit={args.page_size}", None
+    if name == "recipient":
+        return "GET", f"/api/recipients/load{random.randrange(args.recipients)}@example.com/credentials", None
+    if name == "qr":
+        return "GET", f"/api/credentials/{credential_id}/qr", None
+    if name == "pdf":
+        return "GET", f"/api/credentials/{credential_id}/pdf", None
+    counter[0] += 1
+    return "POST", "/api/credentials/issue", credential_payload(args.seed + counter[0], args.recipients)
+
+
+async def run_level(session, args, name: str, concurrency: int, credential_ids):
+    """Drive one scenario for `--duration` seconds from `concurrency` clients"""
+    latencies, statuses, errors = [], {}, [0]
+    counter = [0]
+    deadline = time.perf_counter() + args.duration
+
+    async def client():
+        while time.perf_counter() < deadline:
+            method, path, body = scenario_request(name, args, credential_ids, counter)
+            start = time.perf_counter()
+            try:
+                async with session.request(method, args.api + path, json=body) as response:
+                    await response.read()
+                    status = response.status
+            except (aiohttp.ClientError, asyncio.TimeoutError):
+                errors[0] += 1
+                continue
+            latencies.append(time.perf_counter() - start)
+            statuses[status] = statuses.get(status, 0) + 1
+            if status >= 400:
+                errors[0] += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        "scenario": name,
+        "concurrency": concurrency,
+        "requests": len(latencies),
+        "errors": errors[0],
+        "statuses": {str(status): count for status, count in sorted(statuses.items())},
+        "throughput": round(len(latencies) / elapsed, 2),
+        "p50_ms": round(percentile(latencies, 0.50) * 1000, 2),
+        "p95_ms": round(percentile(latencies, 0.95) * 1000, 2),
+        "p99_ms": round(percentile(latencies, 0.99) * 1000, 2),
+        "max_ms": round(latencies[-1] * 1000, 2) if latencies else 0.0,
+    }
+
+
+def compare(results, baseline_path: str):
+    """Print throughput and p95 changes against an earlier results file"""
+    with open(baseline_path) as f:
+        baseline = json.load(f)
+    previous = {(r["scenario"], r["concurrency"]): r for r in baseline["results"]}
+    print(f"\nAgainst {baseline_path} (commit {baseline.get('commit', '?')}):")
+    for result in results:
+        old = previous.get((result["scenario"], result["concurrency"]))
+        if old is None or not old["throughput"] or not old["p95_ms"]:
+            continue
+        throughput = (result["throughput"] / old["throughput"] - 1) * 100
+        p95 = (result["p95_ms"] / old["p95_ms"] - 1) * 100
+        print(f"  {result['scenario']:<9} c={result['concurrency']:<4} throughput {throughput:+6.1f}%  p95 {p95:+6.1f}%")
+
+
+def start_process(command: str, cwd: str, log_path: str, env=None) -> subprocess.Popen:
+    log = open(log_path, "w")
+    return subprocess.Popen(shlex.split(command), cwd=cwd, stdout=log, stderr=subprocess.STDOUT, env=env)
+
+
+def stop_process(process: subprocess.Popen):
+    process.terminate()
+    try:
+        process.wait(timeout=10)
+    except subprocess.TimeoutExpired:
+        process.kill()
+        process.wait()
+
+
+async def main(args):
+    workdir = tempfile.mkdtemp(prefix="credential-load-")
+    processes = []
+    try:
+        async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=args.timeout)) as session:
+            if not args.no_node:
+                print(f"Starting Hardhat node (logs in {workdir})", file=sys.stderr)
+                processes.append(start_process(args.node_cmd, CONTRACTS_DIR, os.path.join(workdir, "node.log")))
+                await wait_for(
+                    session, "POST", args.rpc_url, 120,
+                    json={"jsonrpc": "2.0", "id": 1, "method": "eth_blockNumber", "params": []}
+                )
+            if not args.no_deploy:
+                print("Deploying contract", file=sys.stderr)
+                subprocess.run(shlex.split(args.deploy_cmd), cwd=CONTRACTS_DIR, check=True, stdout=subprocess.DEVNULL)
+
+            if not args.no_api:
+                # Every load test client shares one IP and issuer, so per-client rate limits are
+                # off unless set in the environment; concurrency limits still apply
+                env = {"RATE_LIMIT_IP_RATE": "0", "RATE_LIMIT_ISSUER_RATE": "0"}
+                env.update(os.environ)
+                env.update(
+                    BLOCKCHAIN_RPC_URL=args.rpc_url,
+                    CHAIN_ID="1337",
+                    PRIVATE_KEY=HARDHAT_KEY,
+                    FRONTEND_URL=os.environ.get("FRONTEND_URL", "http://localhost:5173"),
+                    INDEXER_DB_PATH=os.path.join(workdir, "index.sqlite3"),
+                    COHORT_DB_PATH=os.path.join(workdir, "cohorts.sqlite3"),
+                    REVOCATION_DB_PATH=os.path.join(workdir, "revocations.sqlite3"),
+                    DOCUMENT_DB_PATH=os.path.join(workdir, "documents.sqlite3"),
+                    PDF_CACHE_DIR=os.path.join(workdir, "pdf-cache"),
+                    PAYLOAD_STORE_DIR=os.path.join(workdir, "payloads"),
+                )
+                processes.append(start_process(args.api_cmd, BACKEND_DIR, os.path.join(workdir, "api.log"), env))
+                await wait_for(session, "GET", f"{args.api}/health", 120)
+
+            print(f"Seeding {args.seed} credentials", file=sys.stderr)
+            credential_ids, seed_seconds = await seed(session, args.api, args.seed, args.recipients, args.seed_chunk)
+            if not credential_ids:
+                raise RuntimeError("No credentials were seeded")
+
+            results = []
+            connector_limit = max(args.concurrency)
+            async with aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=connector_limit),
+                timeout=aiohttp.ClientTimeout(total=args.timeout)
+            ) as load_session:
+                for name in args.scenarios:
+                    for concurrency in args.concurrency:
+                        result = await run_level(load_session, args, name, concurrency, credential_ids)
+                        results.append(result)
+                        print(
+                            f"{name:<9} c={concurrency:<4} {result['throughput']:8.1f} req/s  "
+                            f"p50 {result['p50_ms']:8.1f} ms  p95 {result['p95_ms']:8.1f} ms  "
+                            f"p99 {result['p99_ms']:8.1f} ms  errors {result['errors']}"
+                        )
+    finally:
+        for process in reversed(processes):
+            stop_process(process)
+
+    report = {
+        "commit": git_commit(),
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "config": {
+            "seed": args.seed,
+            "recipients": args.recipients,
+            "duration": args.duration,
+            "concurrency": args.concurrency,
+            "scenarios": args.scenarios,
+            "page_size": args.page_size,
+        },
+        "seed": {"credentials": len(credential_ids), "seconds": round(seed_seconds, 2)},
+        "results": results,
+    }
+    output = args.output or os.path.join(BACKEND_DIR, "benchmarks", "results", f"load-{report['commit']}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"\nResults written to {output}")
+
+    if args.baseline:
+        compare(results, args.baseline)
+
+
+def csv_list(value: str):
+    return [item.strip() for item in value.split(",") if item.strip()]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--api", default="http://127.0.0.1:8000")
+    parser.add_argument("--rpc-url", default="http://127.0.0.1:8545", help="Must match hardhat.config.js 'localhost'")
+    parser.add_argument("--node-cmd", default="npx hardhat node")
+    parser.add_argument("--deploy-cmd", default="npx hardhat run scripts/deploy.js --network localhost")
+    parser.add_argument("--api-cmd", default=f"{sys.executable} -m uvicorn app.main:app --host 127.0.0.1 --port 8000")
+    parser.add_argument("--no-node", action="store_true", help="Use a chain that is already running")
+    parser.add_argument("--no-deploy", action="store_true", help="Use the contract already deployed")
+    parser.add_argument("--no-api", action="store_true", help="Use an API that is already running at --api")
+    parser.add_argument("--seed", type=int, default=2000, help="Credentials issued before the run")
+    parser.add_argument("--seed-chunk", type=int, default=500, help="Credentials per seeding request")
+    parser.add_argument("--recipients", type=int, default=200, help="Distinct recipients the seed is spread over")
+    parser.add_argument("--page-size", type=int, default=50, help="limit for the issuer listing")
+    parser.add_argument("--concurrency", type=lambda v: [int(c) for c in csv_list(v)], default=[1, 10, 50])
+    parser.add_argument("--scenarios", type=csv_list, default=list(SCENARIOS))
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds per scenario and concurrency level")
+    parser.add_argument("--timeout", type=float, default=60.0, help="Per-request timeout in seconds")
+    parser.add_argument("--output", help="Results file (default benchmarks/results/load-<commit>.json)")
+    parser.add_argument("--baseline", help="Earlier results file to compare against")
+    args = parser.parse_args()
+    unknown = set(args.scenarios) - set(SCENARIOS)
+    if unknown:
+        parser.error(f"Unknown scenarios: {', '.join(sorted(unknown))}")
+    asyncio.run(main(args))
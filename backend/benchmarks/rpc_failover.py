@@ -0,0 +1,187 @@
+"""
+Exercise the RPC provider layer against local stand-in nodes.
+
+Starts `--nodes` local nodes (Anvil by default, or Hardhat via --node-cmd)
+and puts a small HTTP proxy in front of each so latency and outages can be
+injected. The first node gets `--delay-ms` of extra latency. Then it runs
+three phases of concurrent eth_blockNumber / eth_chainId reads:
+  1. routing  - AsyncFailoverProvider over all proxies; the fast node
+                should take most requests
+  2. failover - the same, with the fast node's proxy stopped halfway
+                through; reads should keep succeeding on the slow one
+  3. baseline - a plain AsyncHTTPProvider pointed at the slow node, which
+                is what a single-URL client gets
+
+Usage (from backend/):
+    python benchmarks/rpc_failover.py [--nodes 2] [--requests 2000] \
+        [--concurrency 20] [--delay-ms 50] \
+        [--node-cmd "npx hardhat node --port {port}"]
+"""
+import argparse
+import asyncio
+import os
+import shlex
+import statistics
+import subprocess
+import sys
+import time
+
+import aiohttp
+from aiohttp import web
+from web3 import AsyncWeb3
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from app.providers import AsyncFailoverProvider, EndpointPool, RetryPolicy  # noqa: E402
+
+
+class FaultProxy:
+    """Forwards JSON-RPC posts to a node after `delay` seconds, until stopped"""
+
+    def __init__(self, target: str, port: int, delay: float):
+        self.target = target
+        self.port = port
+        self.delay = delay
+        self.url = f"http://127.0.0.1:{port}"
+        self._runner = None
+        self._session = None
+
+    async def forward(self, request):
+        body = await request.read()
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        async with self._session.post(self.target, data=body, headers={"Content-Type": "application/json"}) as response:
+            return web.Response(body=await response.read(), status=response.status, content_type="application/json")
+
+    async def start(self):
+        self._session = aiohttp.ClientSession()
+        app = web.Application()
+        app.router.add_post("/", self.forward)
+        self._runner = web.AppRunner(app)
+        await self._runner.setup()
+        await web.TCPSite(self._runner, "127.0.0.1", self.port).start()
+
+    async def stop(self):
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+
+async def wait_for_node(url: str, timeout: float = 60.0):
+    deadline = time.perf_counter() + timeout
+    payload = {"jsonrpc": "2.0", "id": 1, "method": "eth_blockNumber", "params": []}
+    async with aiohttp.ClientSession() as session:
+        while time.perf_counter() < deadline:
+            try:
+                async with session.post(url, json=payload) as response:
+                    if response.status == 200:
+                        return
+            except aiohttp.ClientError:
+                pass
+            await asyncio.sleep(0.5)
+    raise RuntimeError(f"Node at {url} did not start")
+
+
+async def drive(w3, requests: int, concurrency: int, halfway=None):
+    """Run `requests` reads from `concurrency` workers; returns latencies and failures"""
+    latencies, failures = [], [0]
+    counter = [0]
+
+    async def worker():
+        while counter[0] < requests:
+            counter[0] += 1
+            if halfway is not None and counter[0] == requests // 2:
+                await halfway()
+            start = time.perf_counter()
+            try:
+                if counter[0] % 2:
+                    await w3.eth.block_number
+                else:
+                    await w3.eth.chain_id
+                latencies.append(time.perf_counter() - start)
+            except Exception:
+                failures[0] += 1
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return latencies, failures[0]
+
+
+def report(name, latencies, failures, extra=""):
+    latencies = sorted(latencies)
+    if not latencies:
+        print(f"{name:<9} all {failures} requests failed")
+        return
+    p95 = latencies[max(int(len(latencies) * 0.95) - 1, 0)]
+    p99 = latencies[max(int(len(latencies) * 0.99) - 1, 0)]
+    print(
+        f"{name:<9} ok {len(latencies):6d}  failed {failures:5d}  "
+        f"p50 {statistics.median(latencies) * 1000:7.1f} ms  p95 {p95 * 1000:7.1f} ms  "
+        f"p99 {p99 * 1000:7.1f} ms  max {latencies[-1] * 1000:7.1f} ms  {extra}"
+    )
+
+
+def routed(pool: EndpointPool) -> str:
+    return "  ".join(f"{e['url'].rsplit(':', 1)[1]}={e['requests']}" for e in pool.stats())
+
+
+async def main(args):
+    nodes, proxies = [], []
+    try:
+        for i in range(args.nodes):
+            port = args.base_port + i
+            nodes.append(subprocess.Popen(
+                shlex.split(args.node_cmd.format(port=port)),
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL
+            ))
+            await wait_for_node(f"http://127.0.0.1:{port}")
+            proxy = FaultProxy(
+                f"http://127.0.0.1:{port}",
+                args.base_port + 100 + i,
+                args.delay_ms / 1000 if i == 0 else 0.0
+            )
+            await proxy.start()
+            proxies.append(proxy)
+
+        urls = [proxy.url for proxy in proxies]
+        print(f"{args.nodes} nodes, {args.delay_ms} ms extra latency on {urls[0]}, "
+              f"{args.requests} reads at concurrency {args.concurrency}")
+
+        async with aiohttp.ClientSession(connector=aiohttp.TCPConnector(limit=args.concurrency)) as session:
+            for name, halfway in (("routing", None), ("failover", proxies[-1].stop)):
+                pool = EndpointPool(urls, cooldown=args.cooldown)
+                provider = AsyncFailoverProvider(
+                    pool, session, RetryPolicy(max_retries=3), read_timeout=args.timeout, health_interval=0.5
+                )
+                provider.start()
+                latencies, failures = await drive(AsyncWeb3(provider), args.requests, args.concurrency, halfway)
+                await provider.stop()
+                report(name, latencies, failures, routed(pool))
+
+            baseline = AsyncWeb3.AsyncHTTPProvider(urls[0])
+            await baseline.cache_async_session(session)
+            latencies, failures = await drive(AsyncWeb3(baseline), args.requests, args.concurrency)
+            report("baseline", latencies, failures, "(single URL, no failover)")
+
+    finally:
+        for proxy in proxies:
+            await proxy.stop()
+        for node in nodes:
+            node.terminate()
+            node.wait()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--nodes", type=int, default=2)
+    parser.add_argument("--node-cmd", default="anvil --port {port} --silent", help="Command starting one node on {port}")
+    parser.add_argument("--base-port", type=int, default=8600)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--delay-ms", type=float, default=50.0, help="Extra latency on the first node")
+    parser.add_argument("--timeout", type=float, default=2.0, help="Per-call read timeout in seconds")
+    parser.add_argument("--cooldown", type=float, default=10.0, help="Seconds a failed endpoint stays out of rotation")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,111 @@
+"""
+Measure how quickly a fresh API process can take traffic.
+
+For each of `--runs` cold starts it records:
+  import  - seconds to `import app.main` in a new interpreter
+  health  - seconds from spawning uvicorn until GET /health answers
+  ready   - seconds from spawning uvicorn until GET /ready returns 200
+
+Point --rpc-url at a port nothing listens on to check that startup and
+/health do not depend on the RPC node (ready is then reported as null).
+
+Usage (from backend/, with the usual environment or .env):
+    python benchmarks/startup_time.py [--runs 5] [--port 8001] \
+        [--rpc-url http://127.0.0.1:8545] [--output startup.json]
+"""
+import argparse
+import json
+import os
+import shlex
+import statistics
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+IMPORT_SNIPPET = "import time; t = time.perf_counter(); import app.main; print(time.perf_counter() - t)"
+
+
+def status_of(url: str) -> int:
+    try:
+        with urllib.request.urlopen(url, timeout=1) as response:
+            return response.status
+    except urllib.error.HTTPError as e:
+        return e.code
+    except (urllib.error.URLError, OSError):
+        return 0
+
+
+def import_seconds(env) -> float:
+    output = subprocess.check_output([sys.executable, "-c", IMPORT_SNIPPET], cwd=BACKEND_DIR, env=env, text=True)
+    return float(output.strip().splitlines()[-1])
+
+
+def cold_start(args, env):
+    """Spawn the API once; returns seconds until /health answers and until /ready is 200 (or None)"""
+    base = f"http://127.0.0.1:{args.port}"
+    command = f"{sys.executable} -m uvicorn app.main:app --host 127.0.0.1 --port {args.port} --log-level warning"
+    started = time.perf_counter()
+    process = subprocess.Popen(shlex.split(command), cwd=BACKEND_DIR, env=env,
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    health = ready = None
+    try:
+        deadline = started + args.timeout
+        while time.perf_counter() < deadline and process.poll() is None:
+            if health is None and status_of(f"{base}/health") == 200:
+                health = time.perf_counter() - started
+            if health is not None and status_of(f"{base}/ready") == 200:
+                ready = time.perf_counter() - started
+                break
+            time.sleep(args.interval)
+    finally:
+        process.terminate()
+        process.wait()
+    return health, ready
+
+
+def summary(values):
+    values = [v for v in values if v is not None]
+    if not values:
+        return None
+    return {"min": round(min(values), 3), "median": round(statistics.median(values), 3), "max": round(max(values), 3)}
+
+
+def main(args):
+    env = dict(os.environ)
+    if args.rpc_url:
+        env["BLOCKCHAIN_RPC_URL"] = args.rpc_url
+
+    runs = []
+    for run in range(args.runs):
+        imported = import_seconds(env)
+        health, ready = cold_start(args, env)
+        runs.append({"import": round(imported, 3), "health": health and round(health, 3), "ready": ready and round(ready, 3)})
+        print(f"run {run + 1}: import {imported:.3f}s  health {health if health is None else f'{health:.3f}s'}  "
+              f"ready {ready if ready is None else f'{ready:.3f}s'}")
+
+    report = {
+        "rpc_url": env.get("BLOCKCHAIN_RPC_URL"),
+        "runs": runs,
+        "import": summary([r["import"] for r in runs]),
+        "health": summary([r["health"] for r in runs]),
+        "ready": summary([r["ready"] for r in runs]),
+    }
+    print(json.dumps({key: report[key] for key in ("import", "health", "ready")}, indent=2))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--port", type=int, default=8001)
+    parser.add_argument("--rpc-url", help="Overrides BLOCKCHAIN_RPC_URL for the spawned API")
+    parser.add_argument("--timeout", type=float, default=30.0, help="Seconds to wait for each start")
+    parser.add_argument("--interval", type=float, default=0.02, help="Polling interval in seconds")
+    parser.add_argument("--output", help="Write the results as JSON")
+    main(parser.parse_args())
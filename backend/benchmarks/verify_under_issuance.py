@@ -0,0 +1,119 @@
+"""
+Measure verification throughput while issuance transactions are pending.
+
+Runs two phases against a running API:
+  1. baseline  - concurrent GET /api/credentials/verify/{id} only
+  2. contended - the same verify load overlapping queued issue transactions:
+                 each issuer POSTs /api/credentials/issue, gets a 202 job
+                 and polls it until the transaction is mined
+
+Issue requests return before mining, so this measures how much broadcasting,
+job tracking and receipt polling in the same process slow verification; the
+two numbers should stay close.
+
+Usage:
+    python benchmarks/verify_under_issuance.py --issuer 0xf39F... \
+        [--api http://localhost:8000] [--concurrency 50] [--duration 10]
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+import aiohttp
+
+
+async def wait_for_job(session, api, job_id, poll_interval=0.5):
+    while True:
+        async with session.get(f"{api}/api/jobs/{job_id}") as response:
+            job = await response.json()
+        if job["status"] != "pending":
+            if job["status"] != "mined":
+                raise RuntimeError(f"Issue job {job['status']}: {job['error']}")
+            return
+        await asyncio.sleep(poll_interval)
+
+
+async def issue_one(session, api, issuer, index, wait=False):
+    payload = {
+        "recipient_name": f"Benchmark Recipient {index}",
+        "recipient_email": f"bench{index}@example.com",
+        "issuer_name": "Benchmark University",
+        "issuer_address": issuer,
+        "credential_type": "Benchmark Certificate",
+        "description": "Issued by verify_under_issuance.py",
+    }
+    async with session.post(f"{api}/api/credentials/issue", json=payload) as response:
+        body = await response.json()
+        if response.status != 202:
+            raise RuntimeError(f"Issue failed: {body}")
+    if wait:
+        await wait_for_job(session, api, body["job_id"])
+    return body["credential_id"]
+
+
+async def verify_worker(session, api, credential_id, deadline, latencies):
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        async with session.get(f"{api}/api/credentials/verify/{credential_id}") as response:
+            await response.read()
+        latencies.append(time.perf_counter() - start)
+
+
+async def issue_worker(session, api, issuer, deadline, counter):
+    while time.perf_counter() < deadline:
+        await issue_one(session, api, issuer, counter[0])
+        counter[0] += 1
+
+
+async def run_phase(session, args, credential_id, with_issuance):
+    deadline = time.perf_counter() + args.duration
+    latencies = []
+    issued = [0]
+
+    tasks = [
+        verify_worker(session, args.api, credential_id, deadline, latencies)
+        for _ in range(args.concurrency)
+    ]
+    if with_issuance:
+        tasks += [
+            issue_worker(session, args.api, args.issuer, deadline, issued)
+            for _ in range(args.issuers)
+        ]
+
+    start = time.perf_counter()
+    await asyncio.gather(*tasks)
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "throughput": len(latencies) / elapsed,
+        "p50_ms": statistics.median(latencies) * 1000 if latencies else 0,
+        "p95_ms": latencies[int(len(latencies) * 0.95) - 1] * 1000 if latencies else 0,
+        "issued": issued[0],
+    }
+
+
+async def main(args):
+    connector = aiohttp.TCPConnector(limit=args.concurrency + args.issuers)
+    async with aiohttp.ClientSession(connector=connector) as session:
+        credential_id = await issue_one(session, args.api, args.issuer, "seed", wait=True)
+
+        for name, with_issuance in (("baseline", False), ("contended", True)):
+            result = await run_phase(session, args, credential_id, with_issuance)
+            print(
+                f"{name:<10} verify {result['throughput']:8.1f} req/s  "
+                f"p50 {result['p50_ms']:7.1f} ms  p95 {result['p95_ms']:7.1f} ms  "
+                f"({result['requests']} verifies, {result['issued']} issued)"
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--api", default="http://localhost:8000")
+    parser.add_argument("--issuer", required=True, help="Authorized issuer address")
+    parser.add_argument("--concurrency", type=int, default=50, help="Concurrent verify clients")
+    parser.add_argument("--issuers", type=int, default=1, help="Concurrent issue clients (one per issuer key)")
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds per phase")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,182 @@
+"""
+Throughput of the API as the number of worker processes grows.
+
+Boots a Hardhat node and deploys the contract (as load_test.py does), then
+for every `--workers` count starts the API in multi-worker mode (the
+SQLite shared cache and a shared state directory, both fresh per run so
+every run starts cold), and drives each scenario at `--concurrency`.
+Credentials are seeded once, through the first run's API, and reused.
+
+Throughput, p95 and the scaling efficiency against the single-worker run
+(throughput / (workers * single-worker throughput)) are printed and
+written as JSON.
+
+Usage (from backend/, with smart-contracts/ npm-installed):
+    python benchmarks/worker_scaling.py [--workers 1,2,4] [--seed 500] \
+        [--concurrency 64] [--duration 10] [--scenarios verify,get,pdf]
+
+The API is started with `uvicorn --workers` by default; pass
+--api-cmd "gunicorn -c gunicorn.conf.py app.main:app" to measure the
+gunicorn setup instead (API_WORKERS is set for it).
+"""
+import argparse
+import asyncio
+import json
+import os
+import shlex
+import subprocess
+import sys
+import tempfile
+from datetime import datetime, timezone
+
+import aiohttp
+
+from load_test import (
+    BACKEND_DIR,
+    CONTRACTS_DIR,
+    HARDHAT_KEY,
+    SCENARIOS,
+    csv_list,
+    git_commit,
+    run_level,
+    seed,
+    start_process,
+    stop_process,
+    wait_for,
+)
+
+
+def api_env(args, run_dir: str, workers: int) -> dict:
+    # One client IP and issuer drive all the load, so per-client rate limits are off
+    env = {"RATE_LIMIT_IP_RATE": "0", "RATE_LIMIT_ISSUER_RATE": "0"}
+    env.update(os.environ)
+    env.update(
+        BLOCKCHAIN_RPC_URL=args.rpc_url,
+        CHAIN_ID="1337",
+        PRIVATE_KEY=HARDHAT_KEY,
+        FRONTEND_URL=os.environ.get("FRONTEND_URL", "http://localhost:5173"),
+        API_WORKERS=str(workers),
+        CACHE_BACKEND="sqlite",
+        CACHE_SQLITE_PATH=os.path.join(run_dir, "cache.sqlite3"),
+        SHARED_STATE_DIR=os.path.join(run_dir, "shared"),
+        INDEXER_DB_PATH=os.path.join(run_dir, "index.sqlite3"),
+        COHORT_DB_PATH=os.path.join(run_dir, "cohorts.sqlite3"),
+        REVOCATION_DB_PATH=os.path.join(run_dir, "revocations.sqlite3"),
+        DOCUMENT_DB_PATH=os.path.join(run_dir, "documents.sqlite3"),
+        PDF_CACHE_DIR=os.path.join(run_dir, "pdf-cache"),
+        PAYLOAD_STORE_DIR=os.path.join(run_dir, "payloads"),
+    )
+    return env
+
+
+async def main(args):
+    workdir = tempfile.mkdtemp(prefix="credential-workers-")
+    processes = []
+    credential_ids = []
+    results = []
+    try:
+        async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=args.timeout)) as session:
+            if not args.no_node:
+                print(f"Starting Hardhat node (logs in {workdir})", file=sys.stderr)
+                processes.append(start_process(args.node_cmd, CONTRACTS_DIR, os.path.join(workdir, "node.log")))
+                await wait_for(
+                    session, "POST", args.rpc_url, 120,
+                    json={"jsonrpc": "2.0", "id": 1, "method": "eth_blockNumber", "params": []}
+                )
+            if not args.no_deploy:
+                print("Deploying contract", file=sys.stderr)
+                subprocess.run(shlex.split(args.deploy_cmd), cwd=CONTRACTS_DIR, check=True, stdout=subprocess.DEVNULL)
+
+            for workers in args.workers:
+                run_dir = os.path.join(workdir, f"workers-{workers}")
+                os.makedirs(run_dir)
+                api = start_process(
+                    args.api_cmd.format(python=sys.executable, workers=workers),
+                    BACKEND_DIR,
+                    os.path.join(run_dir, "api.log"),
+                    api_env(args, run_dir, workers)
+                )
+                try:
+                    await wait_for(session, "GET", f"{args.api}/health", 120)
+                    if not credential_ids:
+                        print(f"Seeding {args.seed} credentials", file=sys.stderr)
+                        credential_ids, _ = await seed(session, args.api, args.seed, args.recipients, args.seed_chunk)
+                        if not credential_ids:
+                            raise RuntimeError("No credentials were seeded")
+
+                    async with aiohttp.ClientSession(
+                        connector=aiohttp.TCPConnector(limit=args.concurrency),
+                        timeout=aiohttp.ClientTimeout(total=args.timeout)
+                    ) as load_session:
+                        for name in args.scenarios:
+                            result = await run_level(load_session, args, name, args.concurrency, credential_ids)
+                            result["workers"] = workers
+                            results.append(result)
+                            print(
+                                f"{name:<9} workers={workers:<3} {result['throughput']:8.1f} req/s  "
+                                f"p95 {result['p95_ms']:8.1f} ms  errors {result['errors']}"
+                            )
+                finally:
+                    stop_process(api)
+    finally:
+        for process in reversed(processes):
+            stop_process(process)
+
+    single = {r["scenario"]: r["throughput"] for r in results if r["workers"] == args.workers[0]}
+    for result in results:
+        base = single.get(result["scenario"])
+        scale = result["workers"] / args.workers[0]
+        result["efficiency"] = round(result["throughput"] / (base * scale), 3) if base else None
+
+    print(f"\nScaling efficiency against {args.workers[0]} worker(s):")
+    for result in results:
+        print(f"  {result['scenario']:<9} workers={result['workers']:<3} {result['efficiency']}")
+
+    report = {
+        "commit": git_commit(),
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "config": {
+            "workers": args.workers,
+            "seed": args.seed,
+            "concurrency": args.concurrency,
+            "duration": args.duration,
+            "scenarios": args.scenarios,
+            "cpu_count": os.cpu_count(),
+        },
+        "results": results,
+    }
+    output = args.output or os.path.join(BACKEND_DIR, "benchmarks", "results", f"workers-{report['commit']}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"\nResults written to {output}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--api", default="http://127.0.0.1:8000")
+    parser.add_argument("--rpc-url", default="http://127.0.0.1:8545", help="Must match hardhat.config.js 'localhost'")
+    parser.add_argument("--node-cmd", default="npx hardhat node")
+    parser.add_argument("--deploy-cmd", default="npx hardhat run scripts/deploy.js --network localhost")
+    parser.add_argument(
+        "--api-cmd",
+        default="{python} -m uvicorn app.main:app --host 127.0.0.1 --port 8000 --workers {workers}",
+        help="Command starting the API; {python} and {workers} are substituted"
+    )
+    parser.add_argument("--no-node", action="store_true", help="Use a chain that is already running")
+    parser.add_argument("--no-deploy", action="store_true", help="Use the contract already deployed")
+    parser.add_argument("--workers", type=lambda v: [int(w) for w in csv_list(v)], default=[1, 2, 4])
+    parser.add_argument("--seed", type=int, default=500, help="Credentials issued before the first run")
+    parser.add_argument("--seed-chunk", type=int, default=250, help="Credentials per seeding request")
+    parser.add_argument("--recipients", type=int, default=100, help="Distinct recipients the seed is spread over")
+    parser.add_argument("--page-size", type=int, default=50, help="limit for the issuer listing")
+    parser.add_argument("--concurrency", type=int, default=64, help="Concurrent clients for every run")
+    parser.add_argument("--scenarios", type=csv_list, default=["verify", "get", "qr", "pdf"])
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds per scenario and worker count")
+    parser.add_argument("--timeout", type=float, default=60.0, help="Per-request timeout in seconds")
+    parser.add_argument("--output", help="Results file (default benchmarks/results/workers-<commit>.json)")
+    args = parser.parse_args()
+    unknown = set(args.scenarios) - set(SCENARIOS)
+    if unknown:
+        parser.error(f"Unknown scenarios: {', '.join(sorted(unknown))}")
+    asyncio.run(main(args))
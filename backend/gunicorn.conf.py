@@ -0,0 +1,29 @@
+"""
+Multi-worker deployment: gunicorn managing uvicorn workers.
+
+    pip install gunicorn
+    CACHE_BACKEND=sqlite SHARED_STATE_DIR=data/shared gunicorn -c gunicorn.conf.py app.main:app
+
+Workers share credential reads and job status through the cache backend
+(sqlite or redis), rendered PDFs through PDF_CACHE_DIR, and coordinate
+nonces, event polling, indexing and pending jobs through SHARED_STATE_DIR. The app is imported once in
+the master and warm_up() runs there before the workers are forked.
+"""
+import multiprocessing
+import os
+
+bind = os.getenv("API_BIND", "0.0.0.0:8000")
+workers = int(os.getenv("API_WORKERS", multiprocessing.cpu_count()))
+worker_class = "uvicorn.workers.UvicornWorker"
+preload_app = True
+
+# A large batch issue request broadcasts thousands of transactions before it returns
+timeout = int(os.getenv("API_WORKER_TIMEOUT", "180"))
+graceful_timeout = 30
+keepalive = 5
+
+
+def on_starting(server):
+    from app.main import warm_up
+
+    warm_up()
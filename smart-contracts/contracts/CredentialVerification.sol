@@ -16,9 +16,34 @@ contract CredentialVerification {
         string metadataURI;
     }
     
+    // Input for batch issuance; mirrors the issueCredential parameters
+    struct CredentialInput {
+        string credentialId;
+        string recipientName;
+        string recipientEmail;
+        string issuerName;
+        string credentialType;
+        string description;
+        string metadataURI;
+    }
+    
+    // Cohort of credentials anchored by the root of a Merkle tree over their hashes
+    struct Cohort {
+        address issuer;
+        uint256 size;
+        uint256 anchoredAt;
+        string metadataURI;
+    }
+    
     // Mapping from credential ID to Credential
     mapping(string => Credential) public credentials;
     
+    // Mapping from Merkle root to Cohort
+    mapping(bytes32 => Cohort) public cohorts;
+    
+    // Revoked leaves per cohort root
+    mapping(bytes32 => mapping(bytes32 => bool)) public revokedLeaves;
+    
     // Mapping from address to list of credential IDs they issued
     mapping(address => string[]) public issuerCredentials;
     
@@ -47,6 +72,19 @@ contract CredentialVerification {
     event IssuerAuthorized(address indexed issuer);
     event IssuerRevoked(address indexed issuer);
     
+    event CohortAnchored(
+        bytes32 indexed root,
+        address indexed issuer,
+        uint256 size,
+        uint256 anchoredAt
+    );
+    
+    event CohortLeafRevoked(
+        bytes32 indexed root,
+        bytes32 indexed leaf,
+        address indexed issuer
+    );
+    
     // Modifiers
     modifier onlyOwner() {
         require(msg.sender == owner, "Only owner can call this function");
@@ -85,6 +123,42 @@ contract CredentialVerification {
         string memory _description,
         string memory _metadataURI
     ) public onlyAuthorizedIssuer {
+        _issueCredential(
+            _credentialId,
+            _recipientName,
+            _recipientEmail,
+            _issuerName,
+            _credentialType,
+            _description,
+            _metadataURI
+        );
+    }
+    
+    // Issue many credentials in one transaction
+    function issueCredentialsBatch(CredentialInput[] calldata _credentials) public onlyAuthorizedIssuer {
+        for (uint256 i = 0; i < _credentials.length; i++) {
+            CredentialInput calldata input = _credentials[i];
+            _issueCredential(
+                input.credentialId,
+                input.recipientName,
+                input.recipientEmail,
+                input.issuerName,
+                input.credentialType,
+                input.description,
+                input.metadataURI
+            );
+        }
+    }
+    
+    function _issueCredential(
+        string memory _credentialId,
+        string memory _recipientName,
+        string memory _recipientEmail,
+        string memory _issuerName,
+        string memory _credentialType,
+        string memory _description,
+        string memory _metadataURI
+    ) internal {
         require(
             bytes(credentials[_credentialId].credentialId).length == 0,
             "Credential ID already exists"
@@ -187,4 +261,69 @@ contract CredentialVerification {
     function isAuthorizedIssuer(address _issuer) public view returns (bool) {
         return authorizedIssuers[_issuer];
     }
+    
+    // Anchor a cohort of credentials by the Merkle root of their leaf hashes
+    function anchorCohort(
+        bytes32 _root,
+        uint256 _size,
+        string memory _metadataURI
+    ) public onlyAuthorizedIssuer {
+        require(_root != bytes32(0), "Root cannot be empty");
+        require(cohorts[_root].anchoredAt == 0, "Cohort already anchored");
+        
+        cohorts[_root] = Cohort({
+            issuer: msg.sender,
+            size: _size,
+            anchoredAt: block.timestamp,
+            metadataURI: _metadataURI
+        });
+        
+        emit CohortAnchored(_root, msg.sender, _size, block.timestamp);
+    }
+    
+    // Revoke a single credential of a cohort by its leaf hash
+    function revokeCohortLeaf(bytes32 _root, bytes32 _leaf) public {
+        require(
+            cohorts[_root].issuer == msg.sender,
+            "Only the issuer can revoke this credential"
+        );
+        require(!revokedLeaves[_root][_leaf], "Credential is already revoked");
+        
+        revokedLeaves[_root][_leaf] = true;
+        emit CohortLeafRevoked(_root, _leaf, msg.sender);
+    }
+    
+    // Verify a cohort credential's inclusion proof against its anchored root
+    // Pairs are hashed in sorted order, so proofs carry no left/right flags
+    function verifyCohortCredential(
+        bytes32 _root,
+        bytes32 _leaf,
+        bytes32[] calldata _proof
+    )
+        public
+        view
+        returns (
+            bool anchored,
+            bool included,
+            bool revoked,
+            address issuer,
+            uint256 anchoredAt
+        )
+    {
+        Cohort memory cohort = cohorts[_root];
+        anchored = cohort.anchoredAt > 0;
+        
+        bytes32 computed = _leaf;
+        for (uint256 i = 0; i < _proof.length; i++) {
+            bytes32 sibling = _proof[i];
+            computed = computed < sibling
+                ? keccak256(abi.encodePacked(computed, sibling))
+                : keccak256(abi.encodePacked(sibling, computed));
+        }
+        
+        included = anchored && computed == _root;
+        revoked = revokedLeaves[_root][_leaf];
+        issuer = cohort.issuer;
+        anchoredAt = cohort.anchoredAt;
+    }
 }
\ No newline at end of file
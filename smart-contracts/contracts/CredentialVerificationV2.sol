@@ -0,0 +1,279 @@
+// SPDX-License-Identifier: MIT
+pragma solidity ^0.8.19;
+
+// Slim variant of CredentialVerification: only a hash of each credential's
+// payload lives on chain. The payload itself (names, email, description...)
+// is kept off chain and checked against contentHash when it is read back.
+contract CredentialVerificationV2 {
+
+    // Packs into two storage slots
+    struct Credential {
+        bytes32 contentHash;
+        address issuer;
+        uint64 issueDate;
+        bool isValid;
+    }
+
+    // Input for batch issuance; mirrors the issueCredential parameters
+    struct CredentialInput {
+        bytes32 credentialId;
+        bytes32 contentHash;
+        bytes32 recipientHash;
+    }
+
+    // Cohort of credentials anchored by the root of a Merkle tree over their hashes
+    struct Cohort {
+        address issuer;
+        uint256 size;
+        uint256 anchoredAt;
+        string metadataURI;
+    }
+
+    // Mapping from keccak256(credential ID) to Credential
+    mapping(bytes32 => Credential) public credentials;
+
+    // Mapping from Merkle root to Cohort
+    mapping(bytes32 => Cohort) public cohorts;
+
+    // Revoked leaves per cohort root
+    mapping(bytes32 => mapping(bytes32 => bool)) public revokedLeaves;
+
+    // Mapping from address to list of credential ID hashes they issued
+    mapping(address => bytes32[]) public issuerCredentials;
+
+    // Mapping from recipient hash to list of credential ID hashes
+    mapping(bytes32 => bytes32[]) public recipientCredentials;
+
+    // Authorized issuers (universities, organizations)
+    mapping(address => bool) public authorizedIssuers;
+
+    // Contract owner
+    address public owner;
+
+    // Events
+    event CredentialIssued(
+        bytes32 indexed credentialId,
+        address indexed issuer,
+        bytes32 contentHash,
+        uint256 issueDate
+    );
+
+    event CredentialRevoked(
+        bytes32 indexed credentialId,
+        address indexed issuer
+    );
+
+    event IssuerAuthorized(address indexed issuer);
+    event IssuerRevoked(address indexed issuer);
+
+    event CohortAnchored(
+        bytes32 indexed root,
+        address indexed issuer,
+        uint256 size,
+        uint256 anchoredAt
+    );
+
+    event CohortLeafRevoked(
+        bytes32 indexed root,
+        bytes32 indexed leaf,
+        address indexed issuer
+    );
+
+    // Modifiers
+    modifier onlyOwner() {
+        require(msg.sender == owner, "Only owner can call this function");
+        _;
+    }
+
+    modifier onlyAuthorizedIssuer() {
+        require(authorizedIssuers[msg.sender], "Not an authorized issuer");
+        _;
+    }
+
+    constructor() {
+        owner = msg.sender;
+        authorizedIssuers[msg.sender] = true;
+    }
+
+    // Authorize a new issuer
+    function authorizeIssuer(address _issuer) public onlyOwner {
+        authorizedIssuers[_issuer] = true;
+        emit IssuerAuthorized(_issuer);
+    }
+
+    // Revoke issuer authorization
+    function revokeIssuerAuthorization(address _issuer) public onlyOwner {
+        authorizedIssuers[_issuer] = false;
+        emit IssuerRevoked(_issuer);
+    }
+
+    // Issue a new credential
+    function issueCredential(
+        bytes32 _credentialId,
+        bytes32 _contentHash,
+        bytes32 _recipientHash
+    ) public onlyAuthorizedIssuer {
+        _issueCredential(_credentialId, _contentHash, _recipientHash);
+    }
+
+    // Issue many credentials in one transaction
+    function issueCredentialsBatch(CredentialInput[] calldata _credentials) public onlyAuthorizedIssuer {
+        for (uint256 i = 0; i < _credentials.length; i++) {
+            CredentialInput calldata input = _credentials[i];
+            _issueCredential(input.credentialId, input.contentHash, input.recipientHash);
+        }
+    }
+
+    function _issueCredential(
+        bytes32 _credentialId,
+        bytes32 _contentHash,
+        bytes32 _recipientHash
+    ) internal {
+        require(_contentHash != bytes32(0), "Content hash cannot be empty");
+        require(
+            credentials[_credentialId].issueDate == 0,
+            "Credential ID already exists"
+        );
+
+        credentials[_credentialId] = Credential({
+            contentHash: _contentHash,
+            issuer: msg.sender,
+            issueDate: uint64(block.timestamp),
+            isValid: true
+        });
+        issuerCredentials[msg.sender].push(_credentialId);
+        recipientCredentials[_recipientHash].push(_credentialId);
+
+        emit CredentialIssued(_credentialId, msg.sender, _contentHash, block.timestamp);
+    }
+
+    // Revoke a credential
+    function revokeCredential(bytes32 _credentialId) public {
+        require(
+            credentials[_credentialId].issuer == msg.sender,
+            "Only the issuer can revoke this credential"
+        );
+        require(
+            credentials[_credentialId].isValid,
+            "Credential is already revoked"
+        );
+
+        credentials[_credentialId].isValid = false;
+        emit CredentialRevoked(_credentialId, msg.sender);
+    }
+
+    // Verify a credential
+    function verifyCredential(bytes32 _credentialId)
+        public
+        view
+        returns (
+            bool exists,
+            bool isValid,
+            bytes32 contentHash,
+            address issuer,
+            uint256 issueDate
+        )
+    {
+        Credential memory cred = credentials[_credentialId];
+
+        exists = cred.issueDate > 0;
+        return (exists, cred.isValid, cred.contentHash, cred.issuer, cred.issueDate);
+    }
+
+    // Get credential details
+    function getCredential(bytes32 _credentialId)
+        public
+        view
+        returns (Credential memory)
+    {
+        return credentials[_credentialId];
+    }
+
+    // Get all credential ID hashes issued by an address
+    function getIssuerCredentials(address _issuer)
+        public
+        view
+        returns (bytes32[] memory)
+    {
+        return issuerCredentials[_issuer];
+    }
+
+    // Get all credential ID hashes for a recipient hash
+    function getRecipientCredentials(bytes32 _recipientHash)
+        public
+        view
+        returns (bytes32[] memory)
+    {
+        return recipientCredentials[_recipientHash];
+    }
+
+    // Check if an address is an authorized issuer
+    function isAuthorizedIssuer(address _issuer) public view returns (bool) {
+        return authorizedIssuers[_issuer];
+    }
+
+    // Anchor a cohort of credentials by the Merkle root of their leaf hashes
+    function anchorCohort(
+        bytes32 _root,
+        uint256 _size,
+        string memory _metadataURI
+    ) public onlyAuthorizedIssuer {
+        require(_root != bytes32(0), "Root cannot be empty");
+        require(cohorts[_root].anchoredAt == 0, "Cohort already anchored");
+
+        cohorts[_root] = Cohort({
+            issuer: msg.sender,
+            size: _size,
+            anchoredAt: block.timestamp,
+            metadataURI: _metadataURI
+        });
+
+        emit CohortAnchored(_root, msg.sender, _size, block.timestamp);
+    }
+
+    // Revoke a single credential of a cohort by its leaf hash
+    function revokeCohortLeaf(bytes32 _root, bytes32 _leaf) public {
+        require(
+            cohorts[_root].issuer == msg.sender,
+            "Only the issuer can revoke this credential"
+        );
+        require(!revokedLeaves[_root][_leaf], "Credential is already revoked");
+
+        revokedLeaves[_root][_leaf] = true;
+        emit CohortLeafRevoked(_root, _leaf, msg.sender);
+    }
+
+    // Verify a cohort credential's inclusion proof against its anchored root
+    // Pairs are hashed in sorted order, so proofs carry no left/right flags
+    function verifyCohortCredential(
+        bytes32 _root,
+        bytes32 _leaf,
+        bytes32[] calldata _proof
+    )
+        public
+        view
+        returns (
+            bool anchored,
+            bool included,
+            bool revoked,
+            address issuer,
+            uint256 anchoredAt
+        )
+    {
+        Cohort memory cohort = cohorts[_root];
+        anchored = cohort.anchoredAt > 0;
+
+        bytes32 computed = _leaf;
+        for (uint256 i = 0; i < _proof.length; i++) {
+            bytes32 sibling = _proof[i];
+            computed = computed < sibling
+                ? keccak256(abi.encodePacked(computed, sibling))
+                : keccak256(abi.encodePacked(sibling, computed));
+        }
+
+        included = anchored && computed == _root;
+        revoked = revokedLeaves[_root][_leaf];
+        issuer = cohort.issuer;
+        anchoredAt = cohort.anchoredAt;
+    }
+}
@@ -0,0 +1,30 @@
+const hre = require("hardhat");
+const { benchmarkSingle, benchmarkBatch } = require("./benchmark-utils");
+
+// Compares gas and wall time of per-credential issueCredential calls against
+// issueCredentialsBatch at several chunk sizes on a fresh deployment.
+//
+//   npx hardhat run scripts/benchmark-batch.js
+//   BENCH_COUNT=500 BENCH_CHUNKS=10,50,100 npx hardhat run scripts/benchmark-batch.js
+
+const COUNT = parseInt(process.env.BENCH_COUNT || "200", 10);
+const CHUNKS = (process.env.BENCH_CHUNKS || "10,50,100")
+  .split(",")
+  .map(size => parseInt(size, 10));
+
+async function main() {
+  const block = await hre.ethers.provider.getBlock("latest");
+  console.log(`Issuing ${COUNT} credentials on ${hre.network.name} (block gas limit ${block.gasLimit})`);
+
+  await benchmarkSingle(COUNT);
+  for (const chunkSize of CHUNKS) {
+    await benchmarkBatch(COUNT, chunkSize);
+  }
+}
+
+main()
+  .then(() => process.exit(0))
+  .catch((error) => {
+    console.error(error);
+    process.exit(1);
+  });
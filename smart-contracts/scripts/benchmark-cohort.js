@@ -0,0 +1,66 @@
+const hre = require("hardhat");
+const { makeCredential, deploy, report, benchmarkSingle, benchmarkBatch } = require("./benchmark-utils");
+const { leafHash, buildTree, merkleProof } = require("./merkle");
+
+// Compares gas and issue latency of storing every credential on chain
+// (issueCredential, issueCredentialsBatch) against anchoring the Merkle
+// root of a cohort with anchorCohort, then checks one inclusion proof and
+// the cost of revoking a single cohort credential.
+//
+//   npx hardhat run scripts/benchmark-cohort.js
+//   BENCH_COUNT=1000 BENCH_CHUNK=100 npx hardhat run scripts/benchmark-cohort.js
+
+const COUNT = parseInt(process.env.BENCH_COUNT || "200", 10);
+const CHUNK = parseInt(process.env.BENCH_CHUNK || "50", 10);
+
+async function benchmarkCohort() {
+  const contract = await deploy();
+  const [issuer] = await hre.ethers.getSigners();
+  const started = Date.now();
+
+  // Leaves carry the issue date and issuer like the backend's cohort documents
+  const issueDate = Math.floor(started / 1000);
+  const credentials = [];
+  for (let i = 0; i < COUNT; i++) {
+    credentials.push({ ...makeCredential("cohort", i), issueDate, issuer: issuer.address });
+  }
+  const levels = buildTree(credentials.map(leafHash));
+  const root = levels[levels.length - 1][0];
+  const treeMs = Date.now() - started;
+
+  const tx = await contract.anchorCohort(root, COUNT, "");
+  const receipt = await tx.wait();
+  report("merkle cohort", COUNT, 1, receipt.gasUsed, Date.now() - started);
+  console.log(`  tree build=${treeMs}ms  depth=${levels.length - 1}`);
+
+  const index = COUNT - 1;
+  const leaf = levels[0][index];
+  const proof = merkleProof(levels, index);
+  const result = await contract.verifyCohortCredential(root, leaf, proof);
+  const verifyGas = await contract.verifyCohortCredential.estimateGas(root, leaf, proof);
+  console.log(
+    `  proof of ${proof.length} hashes: anchored=${result.anchored} included=${result.included}` +
+    `  verify gas (if called in a tx)=${verifyGas}`
+  );
+
+  const revokeTx = await contract.revokeCohortLeaf(root, leaf);
+  const revokeReceipt = await revokeTx.wait();
+  const revoked = await contract.verifyCohortCredential(root, leaf, proof);
+  console.log(`  revokeCohortLeaf gas=${revokeReceipt.gasUsed}  revoked=${revoked.revoked}`);
+}
+
+async function main() {
+  const block = await hre.ethers.provider.getBlock("latest");
+  console.log(`Issuing ${COUNT} credentials on ${hre.network.name} (block gas limit ${block.gasLimit})`);
+
+  await benchmarkSingle(COUNT);
+  await benchmarkBatch(COUNT, CHUNK);
+  await benchmarkCohort();
+}
+
+main()
+  .then(() => process.exit(0))
+  .catch((error) => {
+    console.error(error);
+    process.exit(1);
+  });
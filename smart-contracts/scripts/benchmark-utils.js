@@ -0,0 +1,73 @@
+const hre = require("hardhat");
+
+// Helpers shared by the benchmark scripts
+
+function makeCredential(prefix, i) {
+  return {
+    credentialId: `${prefix}-${i}`,
+    recipientName: `Recipient ${i}`,
+    recipientEmail: `recipient${i}@example.com`,
+    issuerName: "Benchmark University",
+    credentialType: "Certificate",
+    description: "Completed the benchmark course",
+    metadataURI: ""
+  };
+}
+
+async function deploy() {
+  const CredentialVerification = await hre.ethers.getContractFactory("CredentialVerification");
+  const contract = await CredentialVerification.deploy();
+  await contract.waitForDeployment();
+  return contract;
+}
+
+function report(label, count, transactions, gasUsed, elapsedMs) {
+  console.log(
+    `${label.padEnd(16)} txs=${String(transactions).padStart(5)}` +
+    `  gas/credential=${String(gasUsed / BigInt(count)).padStart(8)}` +
+    `  total gas=${String(gasUsed).padStart(11)}` +
+    `  time=${(elapsedMs / 1000).toFixed(2)}s`
+  );
+}
+
+// One issueCredential transaction per credential
+async function benchmarkSingle(count) {
+  const contract = await deploy();
+  const started = Date.now();
+  let gasUsed = 0n;
+
+  for (let i = 0; i < count; i++) {
+    const c = makeCredential("single", i);
+    const tx = await contract.issueCredential(
+      c.credentialId, c.recipientName, c.recipientEmail, c.issuerName,
+      c.credentialType, c.description, c.metadataURI
+    );
+    const receipt = await tx.wait();
+    gasUsed += receipt.gasUsed;
+  }
+
+  report("single", count, count, gasUsed, Date.now() - started);
+}
+
+// One issueCredentialsBatch transaction per chunk of chunkSize credentials
+async function benchmarkBatch(count, chunkSize) {
+  const contract = await deploy();
+  const started = Date.now();
+  let gasUsed = 0n;
+  let transactions = 0;
+
+  for (let start = 0; start < count; start += chunkSize) {
+    const chunk = [];
+    for (let i = start; i < Math.min(start + chunkSize, count); i++) {
+      chunk.push(makeCredential(`batch${chunkSize}`, i));
+    }
+    const tx = await contract.issueCredentialsBatch(chunk);
+    const receipt = await tx.wait();
+    gasUsed += receipt.gasUsed;
+    transactions++;
+  }
+
+  report(`batch x${chunkSize}`, count, transactions, gasUsed, Date.now() - started);
+}
+
+module.exports = { makeCredential, deploy, report, benchmarkSingle, benchmarkBatch };
@@ -2,8 +2,12 @@ const hre = require("hardhat");
 const fs = require("fs");
 const path = require("path");
 
+// CONTRACT_NAME=CredentialVerificationV2 deploys the slim contract, which
+// keeps only payload hashes on chain (the backend detects it from the ABI)
+const CONTRACT_NAME = process.env.CONTRACT_NAME || "CredentialVerification";
+
 async function main() {
-  console.log("Deploying CredentialVerification contract...");
+  console.log(`Deploying ${CONTRACT_NAME} contract...`);
 
   const [deployer] = await hre.ethers.getSigners();
   console.log("Deploying with account:", deployer.address);
@@ -12,17 +16,18 @@ async function main() {
   console.log("Account balance:", hre.ethers.formatEther(balance), "ETH");
 
   // Deploy the contract
-  const CredentialVerification = await hre.ethers.getContractFactory("CredentialVerification");
+  const CredentialVerification = await hre.ethers.getContractFactory(CONTRACT_NAME);
   const credentialVerification = await CredentialVerification.deploy();
 
   await credentialVerification.waitForDeployment();
 
   const contractAddress = await credentialVerification.getAddress();
-  console.log("CredentialVerification deployed to:", contractAddress);
+  console.log(`${CONTRACT_NAME} deployed to:`, contractAddress);
 
   // Save contract address and ABI
   const contractData = {
     address: contractAddress,
+    contract: CONTRACT_NAME,
     network: hre.network.name,
     deployer: deployer.address,
     deploymentTime: new Date().toISOString()
@@ -51,7 +56,7 @@ async function main() {
   );
 
   // Copy ABI
-  const artifactPath = path.join(__dirname, "../artifacts/contracts/CredentialVerification.sol/CredentialVerification.json");
+  const artifactPath = path.join(__dirname, `../artifacts/contracts/${CONTRACT_NAME}.sol/${CONTRACT_NAME}.json`);
   const artifact = JSON.parse(fs.readFileSync(artifactPath, "utf8"));
 
   fs.writeFileSync(
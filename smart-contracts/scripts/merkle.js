@@ -0,0 +1,67 @@
+const { ethers } = require("hardhat");
+
+// Cohort Merkle tree as backend/app/merkle.py builds it: the same leaf
+// fields and canonical JSON, sorted-pair inner nodes, and unpaired nodes
+// moved up unchanged.
+
+const LEAF_FIELDS = [
+  "credentialId",
+  "recipientName",
+  "recipientEmail",
+  "issuerName",
+  "credentialType",
+  "description",
+  "issueDate",
+  "issuer",
+  "metadataURI"
+];
+
+// keccak256 of keccak256 of the credential's canonical JSON; matches
+// json.dumps(sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+function leafHash(credential) {
+  const fields = {};
+  for (const field of LEAF_FIELDS) {
+    if (credential[field] === undefined) {
+      throw new Error(`Cohort credential is missing ${field}`);
+    }
+    fields[field] = credential[field];
+  }
+  const canonical = JSON.stringify(fields, [...LEAF_FIELDS].sort());
+  return ethers.keccak256(ethers.keccak256(ethers.toUtf8Bytes(canonical)));
+}
+
+function hashPair(a, b) {
+  return BigInt(a) < BigInt(b)
+    ? ethers.keccak256(ethers.concat([a, b]))
+    : ethers.keccak256(ethers.concat([b, a]));
+}
+
+function buildTree(leaves) {
+  const levels = [leaves];
+  while (levels[levels.length - 1].length > 1) {
+    const level = levels[levels.length - 1];
+    const parents = [];
+    for (let i = 0; i + 1 < level.length; i += 2) {
+      parents.push(hashPair(level[i], level[i + 1]));
+    }
+    if (level.length % 2) {
+      parents.push(level[level.length - 1]);
+    }
+    levels.push(parents);
+  }
+  return levels;
+}
+
+function merkleProof(levels, index) {
+  const proof = [];
+  for (const level of levels.slice(0, -1)) {
+    const sibling = index ^ 1;
+    if (sibling < level.length) {
+      proof.push(level[sibling]);
+    }
+    index = Math.floor(index / 2);
+  }
+  return proof;
+}
+
+module.exports = { LEAF_FIELDS, leafHash, hashPair, buildTree, merkleProof };
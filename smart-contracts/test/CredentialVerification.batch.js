@@ -0,0 +1,102 @@
+const { expect } = require("chai");
+const { ethers } = require("hardhat");
+const { loadFixture } = require("@nomicfoundation/hardhat-toolbox/network-helpers");
+const { backendEventSignatures, contractLogs, addressTopic } = require("./helpers");
+
+function makeInput(i) {
+  return {
+    credentialId: `batch-${i}`,
+    recipientName: `Recipient ${i}`,
+    recipientEmail: `recipient${i}@example.com`,
+    issuerName: "Test University",
+    credentialType: "Certificate",
+    description: "Completed the test course",
+    metadataURI: `ipfs://batch-${i}`
+  };
+}
+
+describe("CredentialVerification batch issuance", function () {
+  async function deployFixture() {
+    const [owner, issuer, outsider] = await ethers.getSigners();
+    const contract = await ethers.deployContract("CredentialVerification");
+    await contract.authorizeIssuer(issuer.address);
+    return { contract, owner, issuer, outsider };
+  }
+
+  it("takes CredentialInput fields in the order the backend encodes them", async function () {
+    const { contract } = await loadFixture(deployFixture);
+    // backend/app/blockchain.py credential_input()
+    const input = contract.interface.getFunction("issueCredentialsBatch").inputs[0];
+    expect(input.arrayChildren.components.map(c => c.name)).to.deep.equal([
+      "credentialId", "recipientName", "recipientEmail", "issuerName",
+      "credentialType", "description", "metadataURI"
+    ]);
+  });
+
+  it("stores every credential of the batch like issueCredential", async function () {
+    const { contract, issuer } = await loadFixture(deployFixture);
+    const inputs = [0, 1, 2].map(makeInput);
+
+    await contract.connect(issuer).issueCredentialsBatch(inputs);
+
+    for (const input of inputs) {
+      const credential = await contract.getCredential(input.credentialId);
+      expect(credential.credentialId).to.equal(input.credentialId);
+      expect(credential.recipientName).to.equal(input.recipientName);
+      expect(credential.recipientEmail).to.equal(input.recipientEmail);
+      expect(credential.issuerName).to.equal(input.issuerName);
+      expect(credential.credentialType).to.equal(input.credentialType);
+      expect(credential.description).to.equal(input.description);
+      expect(credential.metadataURI).to.equal(input.metadataURI);
+      expect(credential.issuer).to.equal(issuer.address);
+      expect(credential.isValid).to.equal(true);
+      expect(await contract.getRecipientCredentials(input.recipientEmail)).to.deep.equal([input.credentialId]);
+    }
+    expect(await contract.getIssuerCredentials(issuer.address)).to.deep.equal(inputs.map(i => i.credentialId));
+  });
+
+  it("emits one CredentialIssued per credential with the topics the backend decodes", async function () {
+    const { contract, issuer } = await loadFixture(deployFixture);
+    const inputs = [0, 1, 2].map(makeInput);
+    const signatures = backendEventSignatures("EVENT_SIGNATURES");
+
+    const tx = await contract.connect(issuer).issueCredentialsBatch(inputs);
+    const logs = await contractLogs(tx, contract);
+
+    expect(logs).to.have.length(inputs.length);
+    logs.forEach((log, i) => {
+      expect(log.topics[0]).to.equal(ethers.id(signatures.CredentialIssued));
+      expect(log.topics[1]).to.equal(ethers.id(inputs[i].credentialId));
+      expect(log.topics[2]).to.equal(addressTopic(issuer.address));
+    });
+    await expect(tx)
+      .to.emit(contract, "CredentialIssued")
+      .withArgs(inputs[0].credentialId, issuer.address, inputs[0].recipientEmail, (await tx.getBlock()).timestamp);
+  });
+
+  it("accepts an empty batch", async function () {
+    const { contract, issuer } = await loadFixture(deployFixture);
+    await expect(contract.connect(issuer).issueCredentialsBatch([])).not.to.be.reverted;
+    expect(await contract.getIssuerCredentials(issuer.address)).to.deep.equal([]);
+  });
+
+  it("reverts for an unauthorized sender", async function () {
+    const { contract, outsider } = await loadFixture(deployFixture);
+    await expect(contract.connect(outsider).issueCredentialsBatch([makeInput(0)]))
+      .to.be.revertedWith("Not an authorized issuer");
+  });
+
+  it("reverts the whole batch on a duplicate credential ID", async function () {
+    const { contract, issuer } = await loadFixture(deployFixture);
+    await contract.connect(issuer).issueCredentialsBatch([makeInput(1)]);
+
+    await expect(contract.connect(issuer).issueCredentialsBatch([makeInput(0), makeInput(1)]))
+      .to.be.revertedWith("Credential ID already exists");
+    await expect(contract.connect(issuer).issueCredentialsBatch([makeInput(2), makeInput(2)]))
+      .to.be.revertedWith("Credential ID already exists");
+
+    expect((await contract.verifyCredential("batch-0")).exists).to.equal(false);
+    expect((await contract.verifyCredential("batch-2")).exists).to.equal(false);
+    expect(await contract.getIssuerCredentials(issuer.address)).to.deep.equal(["batch-1"]);
+  });
+});
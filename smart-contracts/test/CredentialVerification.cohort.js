@@ -0,0 +1,138 @@
+const { expect } = require("chai");
+const { ethers } = require("hardhat");
+const { loadFixture } = require("@nomicfoundation/hardhat-toolbox/network-helpers");
+const { leafHash, buildTree, merkleProof } = require("../scripts/merkle");
+
+const ISSUE_DATE = 1700000000;
+
+function makeCohort(size, issuer) {
+  const credentials = [];
+  for (let i = 0; i < size; i++) {
+    credentials.push({
+      credentialId: `cohort-${i}`,
+      recipientName: `Recipient ${i}`,
+      recipientEmail: `recipient${i}@example.com`,
+      issuerName: "Test University",
+      credentialType: "Certificate",
+      description: "Completed the test course",
+      issueDate: ISSUE_DATE,
+      issuer,
+      metadataURI: ""
+    });
+  }
+  const levels = buildTree(credentials.map(leafHash));
+  return { credentials, levels, root: levels[levels.length - 1][0] };
+}
+
+describe("CredentialVerification cohorts", function () {
+  async function deployFixture() {
+    const [owner, issuer, outsider] = await ethers.getSigners();
+    const contract = await ethers.deployContract("CredentialVerification");
+    await contract.authorizeIssuer(issuer.address);
+    return { contract, owner, issuer, outsider };
+  }
+
+  async function anchoredFixture() {
+    const fixture = await deployFixture();
+    const cohort = makeCohort(5, fixture.issuer.address);
+    await fixture.contract.connect(fixture.issuer).anchorCohort(cohort.root, 5, "ipfs://cohort");
+    return { ...fixture, cohort };
+  }
+
+  it("builds the same leaves and root as backend/app/merkle.py", async function () {
+    // Computed with app.merkle.leaf_hash / build_tree for the same three credentials
+    const cohort = makeCohort(3, "0xf39Fd6e51aad88F6F4ce6aB8827279cffFb92266");
+    expect(cohort.levels[0][0]).to.equal("0x220e042f923c958854cd358bfc924789c26b78b40b7641a23aae4073cdbd18ce");
+    expect(cohort.root).to.equal("0x864e41f51a3b4ad9f36917733b1f3693f9993443ac65dd693742def798c979cb");
+  });
+
+  it("anchors a root and records the cohort", async function () {
+    const { contract, issuer } = await loadFixture(deployFixture);
+    const cohort = makeCohort(4, issuer.address);
+
+    const tx = await contract.connect(issuer).anchorCohort(cohort.root, 4, "ipfs://cohort");
+    const { timestamp } = await tx.getBlock();
+
+    await expect(tx).to.emit(contract, "CohortAnchored").withArgs(cohort.root, issuer.address, 4, timestamp);
+    const stored = await contract.cohorts(cohort.root);
+    expect(stored.issuer).to.equal(issuer.address);
+    expect(stored.size).to.equal(4);
+    expect(stored.anchoredAt).to.equal(timestamp);
+    expect(stored.metadataURI).to.equal("ipfs://cohort");
+  });
+
+  it("rejects empty, re-anchored and unauthorized roots", async function () {
+    const { contract, issuer, outsider, cohort } = await loadFixture(anchoredFixture);
+
+    await expect(contract.connect(issuer).anchorCohort(ethers.ZeroHash, 1, ""))
+      .to.be.revertedWith("Root cannot be empty");
+    await expect(contract.connect(issuer).anchorCohort(cohort.root, 5, ""))
+      .to.be.revertedWith("Cohort already anchored");
+    await expect(contract.connect(outsider).anchorCohort(ethers.id("other"), 1, ""))
+      .to.be.revertedWith("Not an authorized issuer");
+  });
+
+  it("verifies the proof of every leaf for even and odd cohort sizes", async function () {
+    const { contract, issuer } = await loadFixture(deployFixture);
+
+    for (const size of [1, 2, 3, 5, 8]) {
+      const cohort = makeCohort(size, issuer.address);
+      await contract.connect(issuer).anchorCohort(cohort.root, size, "");
+      for (let index = 0; index < size; index++) {
+        const result = await contract.verifyCohortCredential(
+          cohort.root, cohort.levels[0][index], merkleProof(cohort.levels, index)
+        );
+        expect(result.anchored).to.equal(true);
+        expect(result.included).to.equal(true);
+        expect(result.revoked).to.equal(false);
+        expect(result.issuer).to.equal(issuer.address);
+      }
+    }
+  });
+
+  it("does not include a changed credential or an unanchored root", async function () {
+    const { contract, issuer, cohort } = await loadFixture(anchoredFixture);
+    const proof = merkleProof(cohort.levels, 2);
+
+    const tampered = leafHash({ ...cohort.credentials[2], recipientName: "Mallory" });
+    expect((await contract.verifyCohortCredential(cohort.root, tampered, proof)).included).to.equal(false);
+
+    const otherIssuer = leafHash({ ...cohort.credentials[2], issuer: ethers.ZeroAddress });
+    expect((await contract.verifyCohortCredential(cohort.root, otherIssuer, proof)).included).to.equal(false);
+
+    const unanchored = makeCohort(5, issuer.address);
+    unanchored.credentials[0].description = "Other course";
+    const levels = buildTree(unanchored.credentials.map(leafHash));
+    const result = await contract.verifyCohortCredential(levels[levels.length - 1][0], levels[0][0], merkleProof(levels, 0));
+    expect(result.anchored).to.equal(false);
+    expect(result.included).to.equal(false);
+  });
+
+  it("revokes a single leaf of the cohort", async function () {
+    const { contract, issuer, cohort } = await loadFixture(anchoredFixture);
+    const leaf = cohort.levels[0][1];
+
+    await expect(contract.connect(issuer).revokeCohortLeaf(cohort.root, leaf))
+      .to.emit(contract, "CohortLeafRevoked")
+      .withArgs(cohort.root, leaf, issuer.address);
+
+    const revoked = await contract.verifyCohortCredential(cohort.root, leaf, merkleProof(cohort.levels, 1));
+    expect(revoked.included).to.equal(true);
+    expect(revoked.revoked).to.equal(true);
+    const other = await contract.verifyCohortCredential(cohort.root, cohort.levels[0][0], merkleProof(cohort.levels, 0));
+    expect(other.revoked).to.equal(false);
+
+    await expect(contract.connect(issuer).revokeCohortLeaf(cohort.root, leaf))
+      .to.be.revertedWith("Credential is already revoked");
+  });
+
+  it("only lets the cohort's issuer revoke a leaf", async function () {
+    const { contract, owner, outsider, cohort } = await loadFixture(anchoredFixture);
+    const leaf = cohort.levels[0][0];
+
+    await expect(contract.connect(outsider).revokeCohortLeaf(cohort.root, leaf))
+      .to.be.revertedWith("Only the issuer can revoke this credential");
+    await expect(contract.connect(owner).revokeCohortLeaf(cohort.root, leaf))
+      .to.be.revertedWith("Only the issuer can revoke this credential");
+  });
+});
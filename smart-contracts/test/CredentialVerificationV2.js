@@ -0,0 +1,217 @@
+const { expect } = require("chai");
+const { ethers, artifacts } = require("hardhat");
+const { loadFixture } = require("@nomicfoundation/hardhat-toolbox/network-helpers");
+const { backendEventSignatures, isSlimContract, contractLogs, addressTopic } = require("./helpers");
+const { leafHash, buildTree, merkleProof } = require("../scripts/merkle");
+
+// Canonical payload JSON as backend/app/payloads.py credential_payload() writes it
+function payload(i) {
+  return JSON.stringify({
+    credentialId: `slim-${i}`,
+    credentialType: "Certificate",
+    description: "Completed the test course",
+    issuerName: "Test University",
+    metadataURI: "",
+    recipientEmail: `recipient${i}@example.com`,
+    recipientName: `Recipient ${i}`
+  });
+}
+
+function makeInput(i) {
+  return {
+    credentialId: ethers.id(`slim-${i}`),
+    contentHash: ethers.keccak256(ethers.toUtf8Bytes(payload(i))),
+    recipientHash: ethers.id(`recipient${i}@example.com`)
+  };
+}
+
+describe("CredentialVerificationV2", function () {
+  async function deployFixture() {
+    const [owner, issuer, outsider] = await ethers.getSigners();
+    const contract = await ethers.deployContract("CredentialVerificationV2");
+    await contract.authorizeIssuer(issuer.address);
+    return { contract, owner, issuer, outsider };
+  }
+
+  describe("backend ABI assumptions", function () {
+    it("is detected as the slim contract, and CredentialVerification is not", async function () {
+      expect(isSlimContract((await artifacts.readArtifact("CredentialVerificationV2")).abi)).to.equal(true);
+      expect(isSlimContract((await artifacts.readArtifact("CredentialVerification")).abi)).to.equal(false);
+    });
+
+    it("has the cohort functions with the full contract's signatures", async function () {
+      // async_blockchain.py calls these on either contract
+      const full = await ethers.getContractFactory("CredentialVerification");
+      const slim = await ethers.getContractFactory("CredentialVerificationV2");
+      for (const name of ["anchorCohort", "revokeCohortLeaf", "verifyCohortCredential"]) {
+        expect(slim.interface.getFunction(name).format("full")).to.equal(full.interface.getFunction(name).format("full"));
+      }
+    });
+
+    it("hashes IDs and payloads as backend/app/payloads.py does", async function () {
+      // credential_id_hash("slim-0") and content_hash(credential_payload(...)) from the backend
+      const input = makeInput(0);
+      expect(input.credentialId).to.equal("0x8cc6552b7398c2c8671ee42077dc68bd158f2010a88f0cd9c54d54d986d5df0c");
+      expect(input.contentHash).to.equal("0x874b937dd810782765890699965f71dfb44b4e484f1d797680b1015eacf311aa");
+    });
+
+    it("takes CredentialInput fields in the order ContractCodec.issue_args builds them", async function () {
+      const { contract } = await loadFixture(deployFixture);
+      const input = contract.interface.getFunction("issueCredentialsBatch").inputs[0];
+      expect(input.arrayChildren.components.map(c => c.name)).to.deep.equal([
+        "credentialId", "contentHash", "recipientHash"
+      ]);
+    });
+
+    it("emits credential events with the slim topics and the full contract's ID topic", async function () {
+      const { contract, issuer } = await loadFixture(deployFixture);
+      const slim = backendEventSignatures("SLIM_EVENT_SIGNATURES");
+      const input = makeInput(0);
+
+      const issued = await contractLogs(
+        await contract.connect(issuer).issueCredential(input.credentialId, input.contentHash, input.recipientHash),
+        contract
+      );
+      expect(issued).to.have.length(1);
+      expect(issued[0].topics[0]).to.equal(ethers.id(slim.CredentialIssued));
+      // The full contract's indexed string topic is keccak256(credentialId) too
+      expect(issued[0].topics[1]).to.equal(ethers.id("slim-0"));
+      expect(issued[0].topics[2]).to.equal(addressTopic(issuer.address));
+
+      const revoked = await contractLogs(await contract.connect(issuer).revokeCredential(input.credentialId), contract);
+      expect(revoked[0].topics[0]).to.equal(ethers.id(slim.CredentialRevoked));
+      expect(revoked[0].topics[1]).to.equal(ethers.id("slim-0"));
+      expect(revoked[0].topics[2]).to.equal(addressTopic(issuer.address));
+    });
+
+    it("emits issuer events with the signatures shared with the full contract", async function () {
+      const { contract, outsider } = await loadFixture(deployFixture);
+      const signatures = backendEventSignatures("EVENT_SIGNATURES");
+
+      const authorized = await contractLogs(await contract.authorizeIssuer(outsider.address), contract);
+      expect(authorized[0].topics[0]).to.equal(ethers.id(signatures.IssuerAuthorized));
+      expect(authorized[0].topics[1]).to.equal(addressTopic(outsider.address));
+
+      const revoked = await contractLogs(await contract.revokeIssuerAuthorization(outsider.address), contract);
+      expect(revoked[0].topics[0]).to.equal(ethers.id(signatures.IssuerRevoked));
+    });
+  });
+
+  describe("issuance", function () {
+    it("stores the content hash, issuer and issue date", async function () {
+      const { contract, issuer } = await loadFixture(deployFixture);
+      const input = makeInput(0);
+
+      const tx = await contract.connect(issuer).issueCredential(input.credentialId, input.contentHash, input.recipientHash);
+      const { timestamp } = await tx.getBlock();
+
+      // getCredential as ContractCodec.credential unpacks it
+      const [contentHash, credentialIssuer, issueDate, isValid] = await contract.getCredential(input.credentialId);
+      expect(contentHash).to.equal(input.contentHash);
+      expect(credentialIssuer).to.equal(issuer.address);
+      expect(issueDate).to.equal(timestamp);
+      expect(isValid).to.equal(true);
+
+      // verifyCredential as ContractCodec.verification unpacks it
+      const [exists, valid, verifiedHash, , verifiedDate] = await contract.verifyCredential(input.credentialId);
+      expect(exists).to.equal(true);
+      expect(valid).to.equal(true);
+      expect(verifiedHash).to.equal(input.contentHash);
+      expect(verifiedDate).to.equal(timestamp);
+
+      expect(await contract.getIssuerCredentials(issuer.address)).to.deep.equal([input.credentialId]);
+      expect(await contract.getRecipientCredentials(input.recipientHash)).to.deep.equal([input.credentialId]);
+    });
+
+    it("reports an unknown credential as not existing", async function () {
+      const { contract } = await loadFixture(deployFixture);
+      const [exists, valid, contentHash, , issueDate] = await contract.verifyCredential(ethers.id("missing"));
+      expect(exists).to.equal(false);
+      expect(valid).to.equal(false);
+      expect(contentHash).to.equal(ethers.ZeroHash);
+      expect(issueDate).to.equal(0);
+    });
+
+    it("issues a batch with one CredentialIssued per credential", async function () {
+      const { contract, issuer } = await loadFixture(deployFixture);
+      const inputs = [0, 1, 2].map(makeInput);
+
+      const logs = await contractLogs(await contract.connect(issuer).issueCredentialsBatch(inputs), contract);
+
+      expect(logs.map(log => log.topics[1])).to.deep.equal(inputs.map(input => input.credentialId));
+      for (const input of inputs) {
+        expect((await contract.getCredential(input.credentialId)).contentHash).to.equal(input.contentHash);
+      }
+    });
+
+    it("rejects empty content hashes, duplicate IDs and unauthorized senders", async function () {
+      const { contract, issuer, outsider } = await loadFixture(deployFixture);
+      const input = makeInput(0);
+      await contract.connect(issuer).issueCredential(input.credentialId, input.contentHash, input.recipientHash);
+
+      await expect(contract.connect(issuer).issueCredential(ethers.id("slim-9"), ethers.ZeroHash, input.recipientHash))
+        .to.be.revertedWith("Content hash cannot be empty");
+      await expect(contract.connect(issuer).issueCredentialsBatch([makeInput(1), input]))
+        .to.be.revertedWith("Credential ID already exists");
+      await expect(contract.connect(outsider).issueCredential(ethers.id("slim-9"), input.contentHash, input.recipientHash))
+        .to.be.revertedWith("Not an authorized issuer");
+      expect((await contract.verifyCredential(makeInput(1).credentialId)).exists).to.equal(false);
+    });
+  });
+
+  describe("revocation", function () {
+    it("lets only the issuer revoke, once", async function () {
+      const { contract, owner, issuer } = await loadFixture(deployFixture);
+      const input = makeInput(0);
+      await contract.connect(issuer).issueCredential(input.credentialId, input.contentHash, input.recipientHash);
+
+      await expect(contract.connect(owner).revokeCredential(input.credentialId))
+        .to.be.revertedWith("Only the issuer can revoke this credential");
+      await expect(contract.connect(issuer).revokeCredential(input.credentialId))
+        .to.emit(contract, "CredentialRevoked")
+        .withArgs(input.credentialId, issuer.address);
+      await expect(contract.connect(issuer).revokeCredential(input.credentialId))
+        .to.be.revertedWith("Credential is already revoked");
+
+      const [exists, valid] = await contract.verifyCredential(input.credentialId);
+      expect(exists).to.equal(true);
+      expect(valid).to.equal(false);
+    });
+  });
+
+  describe("cohorts", function () {
+    it("anchors, verifies and revokes cohort leaves like the full contract", async function () {
+      const { contract, issuer, outsider } = await loadFixture(deployFixture);
+      const credentials = [0, 1, 2].map(i => ({
+        credentialId: `cohort-${i}`,
+        recipientName: `Recipient ${i}`,
+        recipientEmail: `recipient${i}@example.com`,
+        issuerName: "Test University",
+        credentialType: "Certificate",
+        description: "Completed the test course",
+        issueDate: 1700000000,
+        issuer: issuer.address,
+        metadataURI: ""
+      }));
+      const levels = buildTree(credentials.map(leafHash));
+      const root = levels[levels.length - 1][0];
+
+      await expect(contract.connect(outsider).anchorCohort(root, 3, ""))
+        .to.be.revertedWith("Not an authorized issuer");
+      await expect(contract.connect(issuer).anchorCohort(root, 3, ""))
+        .to.emit(contract, "CohortAnchored");
+
+      for (let index = 0; index < credentials.length; index++) {
+        const result = await contract.verifyCohortCredential(root, levels[0][index], merkleProof(levels, index));
+        expect(result.anchored).to.equal(true);
+        expect(result.included).to.equal(true);
+        expect(result.issuer).to.equal(issuer.address);
+      }
+
+      await expect(contract.connect(issuer).revokeCohortLeaf(root, levels[0][2]))
+        .to.emit(contract, "CohortLeafRevoked")
+        .withArgs(root, levels[0][2], issuer.address);
+      expect((await contract.verifyCohortCredential(root, levels[0][2], merkleProof(levels, 2))).revoked).to.equal(true);
+    });
+  });
+});
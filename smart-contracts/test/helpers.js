@@ -0,0 +1,46 @@
+const fs = require("fs");
+const path = require("path");
+const { ethers } = require("hardhat");
+
+// The backend decodes contract logs by the event signatures in
+// backend/app/events.py; reading them from there keeps these tests failing
+// when the contracts and the backend drift apart.
+const EVENTS_PY = path.join(__dirname, "..", "..", "backend", "app", "events.py");
+
+function backendEventSignatures(name) {
+  const source = fs.readFileSync(EVENTS_PY, "utf8");
+  const block = source.match(new RegExp(`^${name} = \\{([\\s\\S]*?)^\\}`, "m"));
+  if (!block) {
+    throw new Error(`${name} not found in ${EVENTS_PY}`);
+  }
+  const signatures = {};
+  for (const [, event, signature] of block[1].matchAll(/"(\w+)": "([^"]+)"/g)) {
+    signatures[event] = signature;
+  }
+  return signatures;
+}
+
+// Same check as is_slim_contract() in backend/app/blockchain.py, which picks
+// the ContractCodec for the deployed ABI
+function isSlimContract(abi) {
+  for (const item of abi || []) {
+    if (item.type === "function" && item.name === "verifyCredential") {
+      return item.inputs[0].type === "bytes32";
+    }
+  }
+  return false;
+}
+
+// Logs of `contract` in a transaction receipt
+async function contractLogs(tx, contract) {
+  const receipt = await tx.wait();
+  const address = (await contract.getAddress()).toLowerCase();
+  return receipt.logs.filter(log => log.address.toLowerCase() === address);
+}
+
+// An address as an indexed event topic
+function addressTopic(address) {
+  return ethers.zeroPadValue(address, 32).toLowerCase();
+}
+
+module.exports = { backendEventSignatures, isSlimContract, contractLogs, addressTopic };